@@ -0,0 +1,61 @@
+"""
+Benchmark the slots-based Either against the pymonad-based one.
+
+Times constructing values, a chain of binds on a Right (with `>>`, `|` and `.then`), a chain
+short-circuited by a Left, and reading `.error`, for `altr.monad.extended_pymonad` and
+`altr.monad.fast_either`.
+
+Usage:
+    uv run python benchmarks/bench_either.py
+"""
+
+import timeit
+
+from altr.monad import extended_pymonad, fast_either
+
+IMPLEMENTATIONS = {'extended_pymonad': extended_pymonad, 'fast_either': fast_either}
+
+
+def cases(module):
+    Left, Right = module.Left, module.Right
+
+    def increment(x):
+        return Right(x + 1)
+
+    def fail(x):
+        return Left(f"failed at {x}")
+
+    def right_chain():
+        return (Right(0) >> increment >> increment | increment | increment).then(increment).then(increment)
+
+    def left_chain():
+        return (Right(0) >> fail >> increment | increment | increment).then(increment).then(increment)
+
+    left = Left("error")
+    return {
+        'Right(x)': lambda: Right(1),
+        'Left(x)': lambda: Left("error"),
+        '6 binds, Right': right_chain,
+        '6 binds, Left': left_chain,
+        'left.error': lambda: left.error,
+        'is_left()': left.is_left,
+    }
+
+
+def main():
+    timings = {name: {} for name in IMPLEMENTATIONS}
+    for name, module in IMPLEMENTATIONS.items():
+        for case, func in cases(module).items():
+            number, _ = timeit.Timer(func).autorange()
+            timings[name][case] = min(timeit.repeat(func, number=number, repeat=5)) / number
+
+    baseline, fast = timings['extended_pymonad'], timings['fast_either']
+    print(f"{'case':<16} {'extended_pymonad':>18} {'fast_either':>14} {'speedup':>8}")
+    for case in baseline:
+        print(
+            f"{case:<16} {baseline[case] * 1e9:15.0f} ns {fast[case] * 1e9:11.0f} ns {baseline[case] / fast[case]:7.1f}x"
+        )
+
+
+if __name__ == '__main__':
+    main()
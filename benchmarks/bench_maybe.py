@@ -0,0 +1,66 @@
+"""
+Benchmark MaybePipeline on optional-field extraction from Pantip comment JSON.
+
+Extracts `user.name` from synthetic comments (a quarter of them without a name) with a
+hand-written loop, a `Just(...) >> ... >> ...` chain per comment, and a `MaybePipeline`
+built once and run over the stream of comments.
+
+Usage:
+    uv run python benchmarks/bench_maybe.py [NUMBER_OF_COMMENTS]
+"""
+
+import sys
+import timeit
+from functools import partial
+
+from altr.monad.maybe_monad import Just, MaybePipeline, lookup
+
+
+def make_comments(count):
+    comments = []
+    for no in range(count):
+        user = {'mid': no, 'name': f'user {no}'} if no % 4 else {'mid': no}
+        comments.append({'comment_no': no + 1, 'message': f'comment {no + 1}', 'user': user})
+    return comments
+
+
+def hand_written(comments):
+    names = []
+    for comment in comments:
+        user = comment.get('user')
+        names.append(user.get('name') if isinstance(user, dict) else None)
+    return names
+
+
+def bind_chain(comments):
+    get_user, get_name = lookup('user'), lookup('name')
+    return [(Just(comment) >> get_user >> get_name).value for comment in comments]
+
+
+USER_NAME = MaybePipeline(lookup('user'), lookup('name'))
+
+
+def pipeline(comments):
+    return list(USER_NAME.values(comments))
+
+
+BACKENDS = {'hand-written loop': hand_written, 'bind chain': bind_chain, 'MaybePipeline': pipeline}
+
+
+def main(count):
+    comments = make_comments(count)
+    expected = hand_written(comments)
+    print(f"{count} comments")
+
+    baseline = None
+    for name, backend in BACKENDS.items():
+        assert backend(comments) == expected, name
+        run = partial(backend, comments)
+        number, _ = timeit.Timer(run).autorange()
+        per_call = min(timeit.repeat(run, number=number, repeat=5)) / number
+        baseline = baseline or per_call
+        print(f"  {name:<18} {per_call / count * 1e9:8.0f} ns/comment  {baseline / per_call:5.2f}x")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,73 @@
+"""
+Benchmark `train_phrases`/`apply_phrases` against gensim `Phrases` on a synthetic corpus.
+
+Times training and applying the model to the corpus, and the peak memory traced while
+training. gensim is skipped if it is not installed.
+
+Usage:
+    uv run python benchmarks/bench_phrases.py [NUMBER_OF_TEXTS]
+"""
+
+import random
+import sys
+import time
+import tracemalloc
+
+from altr.nlp import apply_phrases, encode_corpus, train_phrases
+
+PARAMETERS = {'min_count': 5, 'threshold': 0.5, 'scoring': 'npmi', 'delimiter': '_'}
+
+
+def make_texts(count, seed=0):
+    rng = random.Random(seed)
+    words = [f'word{no}' for no in range(20_000)]
+    phrases = [[f'phrase{no}', f'part{no}'] for no in range(500)]
+    texts = []
+    for _ in range(count):
+        tokens = []
+        for _ in range(rng.randint(5, 60)):
+            tokens += rng.choice(phrases) if rng.random() < 0.1 else [rng.choice(words)]
+        texts.append(tokens)
+    return texts
+
+
+def measure(train, apply, corpus):
+    tracemalloc.start()
+    start = time.perf_counter()
+    model = train(corpus)
+    trained = time.perf_counter()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    apply(model, corpus)
+    applied = time.perf_counter()
+    return trained - start, applied - trained, peak
+
+
+def main(count):
+    texts = make_texts(count)
+    backends = {
+        'altr (encoded)': (
+            lambda corpus: train_phrases(corpus, **PARAMETERS),
+            apply_phrases,
+            encode_corpus(texts),
+        )
+    }
+    try:
+        from gensim.models import Phrases
+
+        backends['gensim'] = (
+            lambda corpus: Phrases(corpus, **PARAMETERS),
+            lambda model, corpus: [model[tokens] for tokens in corpus],
+            texts,
+        )
+    except ImportError:
+        print("gensim is not installed, skipping it")
+
+    print(f"{count} texts, {sum(map(len, texts))} tokens")
+    for name, (train, apply, corpus) in backends.items():
+        train_seconds, apply_seconds, peak = measure(train, apply, corpus)
+        print(f"  {name:<16} train {train_seconds:6.2f}s  apply {apply_seconds:6.2f}s  peak {peak / 2**20:7.1f} MiB")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
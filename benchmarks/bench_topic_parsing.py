@@ -0,0 +1,56 @@
+"""
+Benchmark the topic parsing backends on saved topic pages.
+
+Compares the default `response_to_soup` -> `extract_topic_content` -> `extract_topic_text`
+chain ('html.parser'), the same chain with lxml, and `stream_topic_text`.
+
+Usage:
+    uv run python benchmarks/bench_topic_parsing.py [page.html ...]
+
+Without arguments, the fixture pages in `tests/scraper/pantip/fixtures` are used.
+"""
+
+import sys
+import timeit
+from functools import partial
+from pathlib import Path
+
+from altr.monad.extended_pymonad import Right
+from altr.scraper.pantip import extract_topic_content, extract_topic_text, stream_topic_text
+from altr.scraper.pantip.utils import build_response, response_to_soup
+
+FIXTURES = Path(__file__).parent.parent / 'tests' / 'scraper' / 'pantip' / 'fixtures'
+
+
+def soup_backend(parser):
+    to_soup = partial(response_to_soup, parser=parser)
+    return lambda response: Right(response) >> to_soup >> extract_topic_content >> extract_topic_text
+
+
+BACKENDS = {
+    'html.parser': soup_backend('html.parser'),
+    'lxml': soup_backend('lxml'),
+    'stream': stream_topic_text,
+}
+
+
+def main(paths):
+    for path in paths:
+        response = build_response(str(path), 200, path.read_bytes(), headers={'Content-Type': 'text/html'})
+        print(f"{path.name} ({len(response.content) / 1024:.0f} KiB)")
+
+        baseline = None
+        for name, backend in BACKENDS.items():
+            result = backend(response)
+            if result.is_left():
+                print(f"  {name:<12} skipped: {result.error}")
+                continue
+
+            number, total = timeit.Timer(partial(backend, response)).autorange()
+            per_call = total / number
+            baseline = baseline or per_call
+            print(f"  {name:<12} {per_call * 1000:8.2f} ms/page  {baseline / per_call:5.1f}x")
+
+
+if __name__ == '__main__':
+    main([Path(arg) for arg in sys.argv[1:]] or sorted(FIXTURES.glob('*.html')))
@@ -0,0 +1,4 @@
+from .combinators import traverse, sequence, partition_eithers
+from .maybe_monad import MaybePipeline, lookup
+
+__all__ = ['traverse', 'sequence', 'partition_eithers', 'MaybePipeline', 'lookup']
@@ -0,0 +1,122 @@
+from typing import Any, Callable, Iterable, List, Tuple, TypeVar
+
+from .extended_pymonad import Either, Left, Right
+
+
+"""
+Batch combinators for Either values.
+
+These helpers replace the hand-written loops that bind a function over many records and
+collect the values of the `Right`s. They consume their input lazily, one item at a time,
+so they work on generators and stop pulling items as soon as they short-circuit; only the
+bare values (or errors) are kept, never a list of Either objects.
+
+They only use `is_left()`, `.value` and `.error`, so they accept values of both
+`altr.monad.extended_pymonad` and `altr.monad.fast_either`. The Either they return is built
+with `left`/`right`, which default to `extended_pymonad`.
+
+Functions:
+    traverse(func, items): Apply an Either-returning function to every item, collecting the values.
+    sequence(eithers): Collect the values of Either values.
+    partition_eithers(eithers): Split Either values into their values and their errors.
+"""
+
+
+M = TypeVar('M')
+S = TypeVar('S')
+T = TypeVar('T')
+
+
+def traverse(
+    func: Callable[[S], Either[M, T]],
+    items: Iterable[S],
+    short_circuit: bool = True,
+    *,
+    left: Callable[[Any], Either] = Left,
+    right: Callable[[Any], Either] = Right,
+) -> Either[Any, List[T]]:
+    """Apply an Either-returning function to every item, collecting the values.
+
+    Example:
+        >>> traverse(lambda topic: extract_json_key(topic, 'id'), [{'id': 1}, {'id': 2}])
+        Right [1, 2]
+
+    Args:
+        func: Function returning an Either for an item
+        items: Items to apply the function to, consumed lazily
+        short_circuit: If True, return the first Left without consuming the remaining items;
+            if False, apply the function to every item and return all the errors
+        left: Constructor of the returned Left
+        right: Constructor of the returned Right
+
+    Returns:
+        Either[M | List[M], List[T]]: Right containing the values if every item succeeded; otherwise
+                                      the first Left if `short_circuit`, or a Left containing the list of errors
+    """
+    values = []
+    errors = []
+    for item in items:
+        result = func(item)
+        if result.is_left():
+            if short_circuit:
+                return result
+            errors.append(result.error)
+        elif not errors:
+            values.append(result.value)
+
+    if errors:
+        return left(errors)
+    return right(values)
+
+
+def sequence(
+    eithers: Iterable[Either[M, T]],
+    short_circuit: bool = True,
+    *,
+    left: Callable[[Any], Either] = Left,
+    right: Callable[[Any], Either] = Right,
+) -> Either[Any, List[T]]:
+    """Collect the values of Either values, as `traverse` with the identity function.
+
+    Args:
+        eithers: Either values, consumed lazily
+        short_circuit: If True, return the first Left without consuming the remaining values;
+            if False, consume every value and return all the errors
+        left: Constructor of the returned Left
+        right: Constructor of the returned Right
+
+    Returns:
+        Either[M | List[M], List[T]]: Right containing the values if there is no Left; otherwise
+                                      the first Left if `short_circuit`, or a Left containing the list of errors
+    """
+    return traverse(_identity, eithers, short_circuit, left=left, right=right)
+
+
+def partition_eithers(eithers: Iterable[Either[M, T]], short_circuit: bool = False) -> Tuple[List[T], List[M]]:
+    """Split Either values into the values of the Rights and the errors of the Lefts, keeping their order.
+
+    Example:
+        >>> partition_eithers(extract_json_key(topic, 'id') for topic in topics)
+        ([1, 2], ["Cannot find key 'id' in data"])
+
+    Args:
+        eithers: Either values, consumed lazily
+        short_circuit: If True, stop consuming at the first Left
+
+    Returns:
+        A tuple of the list of values and the list of errors
+    """
+    values = []
+    errors = []
+    for either in eithers:
+        if either.is_left():
+            errors.append(either.error)
+            if short_circuit:
+                break
+        else:
+            values.append(either.value)
+    return values, errors
+
+
+def _identity(x):
+    return x
@@ -4,15 +4,19 @@
 # - https://www.adit.io/posts/2013-04-17-functors,_applicatives,_and_monads_in_pictures.html
 # heavily inspired by https://www.youtube.com/watch?v=r6_Sg-SQmng&ab_channel=DataRockie
 
-from typing import TypeVar, Callable, Generic
+from typing import Any, TypeVar, Callable, Generic, Iterable, Iterator
 
 T = TypeVar("T")  # any type T
 S = TypeVar("S")  # any type S
 
 
 class Maybe(Generic[T]):
+    # `value` is None for a `Nothing`, `error` is None for a `Just`
+    __slots__ = ("error", "value")
+
     def __init__(self, value):
         self.value = value
+        self.error = None
 
     def __or__(self, func):
         """
@@ -37,6 +41,10 @@ class Maybe(Generic[T]):
         """
         return self.bind(func)
 
+    def then(self, func):
+        """use `then` as a shorthand for `bind`"""
+        return self.bind(func)
+
     def is_nothing(self):
         raise NotImplementedError
 
@@ -56,13 +64,36 @@ class Maybe(Generic[T]):
         """
         raise NotImplementedError
 
+    def map(self, func):
+        """
+        apply a plain function to the value, `fmap` in Haskell
+        (<$>) :: (a -> b) -> ma -> mb
+
+        example:
+        ```python
+        Just(1).map(lambda x: x + 1)  # Just 2
+        ```
+        """
+        raise NotImplementedError
+
+    def __eq__(self, other):
+        if not isinstance(other, Maybe):
+            return NotImplemented
+        return type(self) is type(other) and self.value == other.value and self.error == other.error
+
+    def __hash__(self):
+        return hash((type(self), self.value, self.error))
+
     def __str__(self):
         raise NotImplementedError
 
 
 class Just(Maybe):
+    __slots__ = ()
+
     def __init__(self, value: T) -> 'Just[T]':
         self.value = value
+        self.error = None
 
     def is_nothing(self):
         return False
@@ -73,6 +104,9 @@ class Just(Maybe):
     def bind(self, func: Callable[[T], Maybe[S]]) -> Maybe[S]:
         return func(self.value)
 
+    def map(self, func: Callable[[T], S]) -> Maybe[S]:
+        return Just(func(self.value))
+
     def __str__(self):
         return f"Just {self.value}"
 
@@ -81,7 +115,10 @@ class Just(Maybe):
 
 
 class Nothing(Maybe):
+    __slots__ = ()
+
     def __init__(self, err_message: str = None) -> 'Nothing[str]':
+        self.value = None
         self.error = err_message
 
     def is_nothing(self):
@@ -103,6 +140,9 @@ class Nothing(Maybe):
         # just simply return self, or Nothing(self.error)
         return self
 
+    def map(self, func: Callable[[T], S]) -> 'Nothing[str]':
+        return self
+
     def __str__(self):
         if self.error is None:
             return "Nothing"
@@ -112,3 +152,127 @@ class Nothing(Maybe):
         if self.error is None:
             return "Nothing"
         return f"Nothing ({self.error})"
+
+
+class _Stopped:
+    """marks the `Nothing` that stopped a value in a `MaybePipeline`, as opposed to a result that is a Maybe"""
+
+    __slots__ = ("nothing",)
+
+    def __init__(self, nothing: "Nothing"):
+        self.nothing = nothing
+
+
+class MaybePipeline:
+    """
+    a chain of binds built once and applied to many values
+
+    each step is a function `a -> Maybe b`, as passed to `bind`;
+    running the pipeline on a value is the same as `Just(value) >> step_1 >> step_2 >> ...`
+    but a value stops at the first step that returns `Nothing`,
+    and only the final result is wrapped in a `Maybe`
+
+    the pipeline is compiled when it is built: steps made by `lookup`
+    read dictionaries directly instead of creating a `Just` per step
+
+    when the `Nothing` that stops a value has no error message,
+    the pipeline gives it one naming the step, so the context is not lost
+
+    example:
+    ```python
+    get_user_name = MaybePipeline(lookup("user"), lookup("name"))
+    get_user_name({"user": {"name": "a"}})  # Just a
+    get_user_name({"user": {}})  # Nothing (Cannot find key 'name')
+    list(get_user_name.map(comments))  # one Maybe per comment, lazily
+    list(get_user_name.values(comments))  # the names, None where a comment has none
+    ```
+    """
+
+    __slots__ = ("_compiled", "steps")
+
+    def __init__(self, *steps: Callable[[Any], Maybe]):
+        self.steps = steps
+        # (dictionary key or _NO_KEY, step) pairs
+        self._compiled = tuple((getattr(step, "key", _NO_KEY), step) for step in steps)
+
+    def then(self, *steps: Callable[[Any], Maybe]) -> "MaybePipeline":
+        """a new pipeline with `steps` appended"""
+        return MaybePipeline(*self.steps, *steps)
+
+    def __rshift__(self, step):
+        return self.then(step)
+
+    def __or__(self, step):
+        return self.then(step)
+
+    def __call__(self, value: Any) -> Maybe:
+        result = self._run(value)
+        if result.__class__ is _Stopped:
+            return result.nothing
+        return Just(result)
+
+    def map(self, values: Iterable[Any]) -> Iterator[Maybe]:
+        """run the pipeline over a stream of values, lazily, yielding one `Maybe` per value"""
+        return map(self, values)
+
+    def values(self, values: Iterable[Any], default: Any = None) -> Iterator[Any]:
+        """
+        run the pipeline over a stream of values, lazily,
+        yielding the bare result of each value, or `default` when it is `Nothing`
+        """
+        run = self._run
+        for value in values:
+            result = run(value)
+            yield default if result.__class__ is _Stopped else result
+
+    def _run(self, value: Any) -> Any:
+        for index, (key, step) in enumerate(self._compiled):
+            if key is not _NO_KEY and value.__class__ is dict:
+                found = value.get(key)
+                if found is not None:
+                    value = found
+                    continue
+            result = step(value)
+            # checking the class first skips a method call for every `Just`
+            if result.__class__ is not Just and result.is_nothing():
+                if result.error is None:
+                    result = Nothing(f"step {index} ({getattr(step, '__name__', step)}) returned Nothing")
+                return _Stopped(result)
+            value = result.value
+        return value
+
+
+# marks the steps of a `MaybePipeline` that are not made by `lookup`
+_NO_KEY = object()
+
+
+def lookup(key: Any) -> Callable[[Any], Maybe]:
+    """
+    a step getting `key` from a dictionary (or an index from a list),
+    `Nothing` when it is missing or the value is None
+
+    example:
+    ```python
+    Just({"paging": {"max_comments": 3}}) >> lookup("paging") >> lookup("max_comments")  # Just 3
+    ```
+    """
+
+    missing = Nothing(f"Cannot find key '{key}'")
+    none = Nothing(f"Key '{key}' is None")
+
+    def get(data):
+        if data.__class__ is dict:
+            value = data.get(key)
+        else:
+            try:
+                value = data[key]
+            except (KeyError, IndexError, TypeError):
+                return missing
+        if value is None:
+            return none if data.__class__ is not dict or key in data else missing
+        return Just(value)
+
+    get.__name__ = f"lookup({key!r})"
+    # lets `MaybePipeline` read the key without calling `get`
+    get.key = key
+    return get
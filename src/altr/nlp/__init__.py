@@ -1,3 +1,8 @@
 from .tokenise import *
 from .ngram import *
+from .ngram_stream import *
+from .vocabulary import *
+from .phrases import *
+from .ngram_levels import *
+from ._types import Text, Token, Word
 from ._utils import compose
@@ -1,21 +1,55 @@
 from ._types import Token
 from ._utils import compose
 
-from copy import deepcopy
-from typing import Callable, TypeAlias
+from types import MappingProxyType
+from typing import Callable, Mapping, NamedTuple, TypeAlias
 
 
-def prepare_data_for_ngram(
-    tokenised_texts: list[list[Token]],
-) -> tuple[dict[int, object | None], dict[int, list[list[Token]]], dict[int, list[list[Token]]]]:
+__all__ = ['NgramState', 'prepare_data_for_ngram', 'process_ngram']
+
+
+class NgramState(NamedTuple):
+    """Immutable state of the n-gram pipeline, one entry per n-gram level in each mapping.
+
+    The mappings are read-only views. Adding a level with `extend` builds new mappings that
+    share the models and token lists of the earlier levels instead of copying them, so the
+    cost of a step does not grow with the size of the corpora already processed. Token lists
+    are shared between states and must not be mutated in place.
+
+    It is a tuple, so it unpacks as `models, ngram_tokens, ngram_tokens_filtered`.
+    """
+
+    models: Mapping[int, object | None]
+    ngram_tokens: Mapping[int, list[list[Token]]]
+    ngram_tokens_filtered: Mapping[int, list[list[Token]]]
+
+    @property
+    def max_ngram(self) -> int:
+        """The highest n-gram level processed so far"""
+        return max(self.models.keys())
+
+    def extend(
+        self, ngram: int, model: object, tokens: list[list[Token]], tokens_filtered: list[list[Token]]
+    ) -> "NgramState":
+        """Return a new state with an n-gram level added, leaving this state unchanged."""
+        return NgramState(
+            MappingProxyType({**self.models, ngram: model}),
+            MappingProxyType({**self.ngram_tokens, ngram: tokens}),
+            MappingProxyType({**self.ngram_tokens_filtered, ngram: tokens_filtered}),
+        )
+
+
+def prepare_data_for_ngram(tokenised_texts: list[list[Token]]) -> NgramState:
     """Initialise ngram processing structures.
 
-    Returns a tuple of three dictionaries:
+    Returns an `NgramState`, a tuple of three read-only dictionaries:
         - models dict (initially `{1: None}`)
         - ngram tokens dict (initially `{1: list of tokenised texts}`)
         - filtered ngram tokens dict, this store only n-gram tokens (initially `{1: list of tokenised texts}`)
     """
-    return ({1: None}, {1: tokenised_texts}, {1: tokenised_texts})
+    return NgramState(
+        MappingProxyType({1: None}), MappingProxyType({1: tokenised_texts}), MappingProxyType({1: tokenised_texts})
+    )
 
 
 def process_ngram(
@@ -24,8 +58,8 @@ def process_ngram(
     filter_ngram_tokens_fn: Callable[[list[list[Token]]], list[list[Token]]],
     concat_ngram_tokens_fn: Callable[[list[list[Token]]], list[list[Token]]],
 ) -> Callable[
-    [tuple[dict[int, object | None], dict[int, list[list[Token]]], dict[int, list[list[Token]]]]],
-    tuple[dict[int, object | None], dict[int, list[list[Token]]], dict[int, list[list[Token]]]],
+    [tuple[Mapping[int, object | None], Mapping[int, list[list[Token]]], Mapping[int, list[list[Token]]]]],
+    NgramState,
 ]:
     """
     Creates a pipeline to process n-gram tokens.
@@ -53,27 +87,29 @@ def process_ngram(
             Signature: `list[list[Token]] -> list[list[Token]]`.
 
     Returns:
-        Callable: A function that takes a tuple containing:
+        Callable: A function that takes a tuple (an `NgramState` or plain dictionaries) containing:
             - A dictionary of models (`dict[int, object | None]`).
             - A dictionary of n-gram tokens (`dict[int, list[list[Token]]]`).
             - A dictionary of filtered n-gram tokens (`dict[int, list[list[Token]]]`).
 
-            The returned function processes the input tuple and returns an updated
-            tuple with the new models, n-gram tokens, and filtered n-gram tokens.
+            The returned function processes the input tuple and returns a new
+            `NgramState` with the new models, n-gram tokens, and filtered n-gram tokens.
+            The input is not mutated, and the new state shares the earlier levels with it.
     """
 
     filter_ngram_pipeline = compose(filter_ngram_tokens_fn, concat_ngram_tokens_fn)
 
     def process(
-        input_tuple: tuple[dict[int, object | None], dict[int, list[list[Token]]], dict[int, list[list[Token]]]],
-    ) -> tuple[dict[int, object | None], dict[int, list[list[Token]]], dict[int, list[list[Token]]]]:
-        # extract data from input tuple
-        models, ngram_tokens, ngram_tokens_filtered = input_tuple
+        input_tuple: tuple[
+            Mapping[int, object | None], Mapping[int, list[list[Token]]], Mapping[int, list[list[Token]]]
+        ],
+    ) -> NgramState:
+        state = NgramState(*input_tuple)
 
         # find the previous number of ngram
-        max_ngram = max(models.keys())
+        max_ngram = state.max_ngram
         next_ngram = max_ngram + 1
-        model_input = ngram_tokens[max_ngram]
+        model_input = state.ngram_tokens[max_ngram]
 
         model = training_model_fn(model_input)
         ngram_result = get_ngram_tokens_fn(model, model_input)
@@ -82,15 +118,7 @@ def process_ngram(
         ngram_result_filtered = filter_ngram_pipeline(ngram_result)
         ngram_result = concat_ngram_tokens_fn(ngram_result)
 
-        # return new dicts, avoid mutation
-        new_models = deepcopy(models)
-        new_tokens = deepcopy(ngram_tokens)
-        new_filtered = deepcopy(ngram_tokens_filtered)
-
-        new_models[next_ngram] = model
-        new_tokens[next_ngram] = ngram_result
-        new_filtered[next_ngram] = ngram_result_filtered
-
-        return new_models, new_tokens, new_filtered
+        # return a new state, avoid mutation; earlier levels are shared, not copied
+        return state.extend(next_ngram, model, ngram_result, ngram_result_filtered)
 
     return process
@@ -0,0 +1,166 @@
+from ._types import Token
+from .ngram import NgramState
+from .vocabulary import ID_DTYPE, EncodedCorpus
+
+import time
+from typing import Any, Callable, Mapping
+
+import numpy as np
+
+
+__all__ = ['NgramLevels']
+
+
+class NgramLevels:
+    """
+    Runs n-gram levels 2 to `max_ngram` in one call, with statistics for each level.
+
+    Each level trains a model on the previous level's tokens and applies it, as `process_ngram`
+    does. The n-gram tokens are then concatenated and filtered in a single traversal: the two
+    per-token functions are evaluated once per distinct token, and each text is read once to
+    build both its concatenated tokens and its filtered n-gram tokens.
+
+    The run stops early when a level adds no new phrases; that level is not added to the state.
+    Corpora can be `list[list[Token]]` or `EncodedCorpus`, for which the pass is vectorised.
+
+    Example:
+        >>> ngram_levels = NgramLevels(
+        ...     4,
+        ...     partial(train_phrases, min_count=5, threshold=0.5, scoring="npmi", delimiter=NGRAM_DELIMITER),
+        ...     apply_phrases,
+        ...     lambda token: NGRAM_DELIMITER in token,
+        ...     lambda token: token.replace(NGRAM_DELIMITER, ""),
+        ... )
+        >>> models, ngrams, ngrams_filtered = compose(prepare_data_for_ngram, ngram_levels)(tokenised_texts)
+        >>> ngram_levels.stats  # one dictionary per level run
+
+    Args:
+        max_ngram (int): The highest n-gram level to run.
+
+        training_model_fn (Callable): A function that trains a model using
+            the tokenized texts of the previous level.
+            Signature: `list[list[Token]] -> object`.
+
+        get_ngram_tokens_fn (Callable): A function that generates n-gram tokens
+            using a trained model and tokenized texts.
+            Signature: `(object, list[list[Token]]) -> list[list[Token]]`.
+
+        is_ngram_token_fn (Callable): Whether a token is an n-gram token, i.e. the token-level
+            `filter_ngram_tokens_fn` of `process_ngram`.
+            Signature: `Token -> bool`.
+
+        concat_ngram_token_fn (Callable): Concatenates an n-gram token by removing delimiters,
+            i.e. the token-level `concat_ngram_tokens_fn` of `process_ngram`.
+            Signature: `Token -> Token`.
+
+    Attributes:
+        stats (list[dict]): Statistics of the last run, one dictionary per level, containing:
+            - ngram: The level
+            - seconds: Time taken by the level
+            - train_seconds: Time taken to train the model
+            - vocabulary_size: Number of distinct tokens in the level's texts
+            - new_phrases: Number of distinct n-gram tokens that were not tokens of the previous level
+    """
+
+    def __init__(
+        self,
+        max_ngram: int,
+        training_model_fn: Callable[[Any], object],
+        get_ngram_tokens_fn: Callable[[object, Any], Any],
+        is_ngram_token_fn: Callable[[Token], bool],
+        concat_ngram_token_fn: Callable[[Token], Token],
+    ):
+        self.max_ngram = max_ngram
+        self.training_model_fn = training_model_fn
+        self.get_ngram_tokens_fn = get_ngram_tokens_fn
+        self.is_ngram_token_fn = is_ngram_token_fn
+        self.concat_ngram_token_fn = concat_ngram_token_fn
+        self.stats: list[dict[str, Any]] = []
+
+    def __call__(self, input_tuple: tuple[Mapping, Mapping, Mapping]) -> NgramState:
+        state = NgramState(*input_tuple)
+        self.stats = []
+
+        previous_tokens = _distinct_tokens(state.ngram_tokens[state.max_ngram])
+        for ngram in range(state.max_ngram + 1, self.max_ngram + 1):
+            start = time.perf_counter()
+            model_input = state.ngram_tokens[ngram - 1]
+
+            model = self.training_model_fn(model_input)
+            trained = time.perf_counter()
+            ngram_result = self.get_ngram_tokens_fn(model, model_input)
+
+            if isinstance(ngram_result, EncodedCorpus):
+                tokens, filtered, level_tokens, phrases = self._concat_and_filter_encoded(ngram_result)
+            else:
+                tokens, filtered, level_tokens, phrases = self._concat_and_filter(ngram_result)
+
+            new_phrases = len(phrases - previous_tokens)
+            self.stats.append(
+                {
+                    "ngram": ngram,
+                    "seconds": time.perf_counter() - start,
+                    "train_seconds": trained - start,
+                    "vocabulary_size": len(level_tokens),
+                    "new_phrases": new_phrases,
+                }
+            )
+            if new_phrases == 0:
+                break
+
+            state = state.extend(ngram, model, tokens, filtered)
+            previous_tokens = level_tokens
+
+        return state
+
+    def _concat_and_filter(
+        self, ngram_result: list[list[Token]]
+    ) -> tuple[list[list[Token]], list[list[Token]], set, set]:
+        concat, is_ngram = self.concat_ngram_token_fn, self.is_ngram_token_fn
+        # (concatenated token, whether it is an n-gram token) for each distinct token
+        seen: dict[Token, tuple[Token, bool]] = {}
+
+        tokens, filtered = [], []
+        for text in ngram_result:
+            text_tokens, text_filtered = [], []
+            for token in text:
+                result = seen.get(token)
+                if result is None:
+                    result = seen[token] = (concat(token), bool(is_ngram(token)))
+                text_tokens.append(result[0])
+                if result[1]:
+                    text_filtered.append(result[0])
+            tokens.append(text_tokens)
+            filtered.append(text_filtered)
+
+        level_tokens = {token for token, _ in seen.values()}
+        phrases = {token for token, is_ngram_token in seen.values() if is_ngram_token}
+        return tokens, filtered, level_tokens, phrases
+
+    def _concat_and_filter_encoded(self, ngram_result: EncodedCorpus) -> tuple[EncodedCorpus, EncodedCorpus, set, set]:
+        vocabulary = ngram_result.vocabulary
+        present = np.flatnonzero(np.bincount(ngram_result.ids, minlength=len(vocabulary)))
+
+        # only the tokens of this corpus are concatenated and tested, once each
+        table = np.zeros(len(vocabulary), dtype=ID_DTYPE)
+        is_ngram = np.zeros(len(vocabulary), dtype=bool)
+        for token_id in present.tolist():
+            token = vocabulary.tokens[token_id]
+            table[token_id] = vocabulary.add(self.concat_ngram_token_fn(token))
+            is_ngram[token_id] = self.is_ngram_token_fn(token)
+
+        ids = table[ngram_result.ids]
+        keep = is_ngram[ngram_result.ids]
+        kept_before = np.concatenate(([0], np.cumsum(keep, dtype=np.int64)))
+        tokens = EncodedCorpus(ids, ngram_result.offsets, vocabulary)
+        filtered = EncodedCorpus(ids[keep], kept_before[ngram_result.offsets], vocabulary)
+
+        level_tokens = set(vocabulary.decode(np.unique(table[present])))
+        phrases = set(vocabulary.decode(np.unique(table[present[is_ngram[present]]])))
+        return tokens, filtered, level_tokens, phrases
+
+
+def _distinct_tokens(corpus) -> set:
+    if isinstance(corpus, EncodedCorpus):
+        return set(corpus.vocabulary.decode(np.unique(corpus.ids)))
+    return {token for tokens in corpus for token in tokens}
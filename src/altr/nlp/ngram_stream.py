@@ -0,0 +1,197 @@
+from ._types import Token
+from ._utils import compose
+from .ngram import NgramState
+
+import json
+from itertools import islice
+from pathlib import Path
+from types import MappingProxyType
+from typing import Callable, Iterable, Iterator, Mapping, Self
+
+
+__all__ = [
+    'TokenShards',
+    'TokenShardWriter',
+    'write_token_shards',
+    'prepare_data_for_ngram_stream',
+    'process_ngram_stream',
+]
+
+# number of texts per shard written to disk
+SHARD_SIZE = 100_000
+# number of texts passed at once to the n-gram, filter and concat functions
+BATCH_SIZE = 10_000
+
+
+class TokenShards:
+    """A restartable, file-backed corpus of tokenised texts.
+
+    The texts are stored as JSON lines (one list of tokens per line) in the numbered shards
+    `part-00000.jsonl`, `part-00001.jsonl`, ... of a directory, and are read back one at a
+    time every time the corpus is iterated, so it can be passed to training functions that
+    make several passes, such as gensim `Phrases`.
+    """
+
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+
+    @property
+    def shards(self) -> list[Path]:
+        return sorted(self.directory.glob('part-*.jsonl'))
+
+    def __iter__(self) -> Iterator[list[Token]]:
+        for shard in self.shards:
+            with shard.open(encoding='utf-8') as file:
+                for line in file:
+                    yield json.loads(line)
+
+    def __repr__(self) -> str:
+        return f"TokenShards('{self.directory}')"
+
+
+class TokenShardWriter:
+    """Write tokenised texts to the JSON lines shards of a `TokenShards` directory, one text at a time.
+
+    The shards already in the directory are removed, so that a level that is processed again
+    does not keep the texts of an earlier run.
+    """
+
+    def __init__(self, directory: str | Path, shard_size: int = SHARD_SIZE):
+        self.directory = Path(directory)
+        self.shard_size = shard_size
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for shard in self.directory.glob('part-*.jsonl'):
+            shard.unlink()
+
+        self._file = None
+        self._shard_number = 0
+        self._texts_in_shard = 0
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def write(self, tokens: list[Token]) -> None:
+        if self._file is None or self._texts_in_shard >= self.shard_size:
+            self.close()
+            self._file = (self.directory / f'part-{self._shard_number:05d}.jsonl').open('w', encoding='utf-8')
+            self._shard_number += 1
+            self._texts_in_shard = 0
+        self._file.write(json.dumps(tokens, ensure_ascii=False) + '\n')
+        self._texts_in_shard += 1
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    @property
+    def corpus(self) -> TokenShards:
+        """The written texts, as a restartable corpus"""
+        return TokenShards(self.directory)
+
+
+def write_token_shards(
+    tokenised_texts: Iterable[list[Token]], directory: str | Path, shard_size: int = SHARD_SIZE
+) -> TokenShards:
+    """Write tokenised texts to JSON lines shards, replacing the shards already in the directory.
+
+    The texts are consumed lazily, so this also turns a one-shot generator into a restartable corpus.
+    """
+    with TokenShardWriter(directory, shard_size) as writer:
+        for tokens in tokenised_texts:
+            writer.write(tokens)
+    return writer.corpus
+
+
+def prepare_data_for_ngram_stream(corpus: Iterable[list[Token]]) -> NgramState:
+    """Initialise streaming ngram processing structures.
+
+    Same as `prepare_data_for_ngram`, but `corpus` is a restartable iterable of tokenised
+    texts (a `TokenShards`, for example) instead of a list; it is not loaded into memory.
+
+    Raises:
+        TypeError: if `corpus` is an iterator, which can only be read once
+    """
+    if iter(corpus) is corpus:
+        raise TypeError("corpus must be restartable; write a generator to disk with `write_token_shards` first")
+    return NgramState(MappingProxyType({1: None}), MappingProxyType({1: corpus}), MappingProxyType({1: corpus}))
+
+
+def process_ngram_stream(
+    training_model_fn: Callable[[Iterable[list[Token]]], object],
+    get_ngram_tokens_fn: Callable[[object, list[list[Token]]], list[list[Token]]],
+    filter_ngram_tokens_fn: Callable[[list[list[Token]]], list[list[Token]]],
+    concat_ngram_tokens_fn: Callable[[list[list[Token]]], list[list[Token]]],
+    directory: str | Path,
+    batch_size: int = BATCH_SIZE,
+    shard_size: int = SHARD_SIZE,
+) -> Callable[[tuple[Mapping, Mapping, Mapping]], NgramState]:
+    """
+    Creates a pipeline to process n-gram tokens of corpora larger than memory.
+
+    This is the streaming variant of `process_ngram`: the model is trained on the previous
+    level's corpus as a restartable iterable, then applied lazily in batches of `batch_size`
+    texts, and each level's n-gram tokens and filtered n-gram tokens are written to shards
+    under `directory` (`{n}/tokens` and `{n}/filtered`) instead of being held in memory.
+    The returned state maps each level to a `TokenShards`.
+
+    Args:
+        training_model_fn (Callable): A function that trains a model on a restartable iterable
+            of tokenized texts, such as `gensim.models.Phrases`.
+            Signature: `Iterable[list[Token]] -> object`.
+
+        get_ngram_tokens_fn (Callable): A function that generates n-gram tokens
+            using a trained model, applied to one batch of tokenized texts at a time.
+            Signature: `(object, list[list[Token]]) -> list[list[Token]]`.
+
+        filter_ngram_tokens_fn (Callable): A function that filters n-gram tokens
+            from a batch of tokenized texts.
+            Signature: `list[list[Token]] -> list[list[Token]]`.
+
+        concat_ngram_tokens_fn (Callable): A function that concatenates n-gram
+            tokens of a batch by removing delimiters.
+            Signature: `list[list[Token]] -> list[list[Token]]`.
+
+        directory (str | Path): Directory the shards of every level are written to.
+
+        batch_size (int): Number of texts passed at once to the functions above.
+
+        shard_size (int): Number of texts per shard.
+
+    Returns:
+        Callable: A function that takes a state from `prepare_data_for_ngram_stream` (or from
+            a previous streaming step) and returns a new `NgramState` with the next level added.
+    """
+    directory = Path(directory)
+    filter_pipeline = compose(filter_ngram_tokens_fn, concat_ngram_tokens_fn)
+
+    def process(input_tuple: tuple[Mapping, Mapping, Mapping]) -> NgramState:
+        state = NgramState(*input_tuple)
+
+        # find the previous number of ngram
+        max_ngram = state.max_ngram
+        next_ngram = max_ngram + 1
+        model_input = state.ngram_tokens[max_ngram]
+
+        model = training_model_fn(model_input)
+
+        # apply the model batch by batch, so only one batch is held in memory
+        level = directory / str(next_ngram)
+        with (
+            TokenShardWriter(level / 'tokens', shard_size) as tokens,
+            TokenShardWriter(level / 'filtered', shard_size) as filtered,
+        ):
+            texts = iter(model_input)
+            while batch := list(islice(texts, batch_size)):
+                ngram_result = get_ngram_tokens_fn(model, batch)
+                for ngram_tokens in filter_pipeline(ngram_result):
+                    filtered.write(ngram_tokens)
+                for ngram_tokens in concat_ngram_tokens_fn(ngram_result):
+                    tokens.write(ngram_tokens)
+
+        return state.extend(next_ngram, model, tokens.corpus, filtered.corpus)
+
+    return process
@@ -0,0 +1,251 @@
+from ._types import Token
+from .vocabulary import ID_DTYPE, OFFSET_DTYPE, EncodedCorpus, Vocabulary, encode_corpus
+
+from typing import Iterable
+
+import numpy as np
+
+
+__all__ = ['PhraseModel', 'train_phrases', 'apply_phrases', 'SCORERS']
+
+
+def original_scorer(
+    worda_count: np.ndarray,
+    wordb_count: np.ndarray,
+    bigram_count: np.ndarray,
+    len_vocab: int,
+    min_count: int,
+    corpus_word_count: int,
+) -> np.ndarray:
+    """The scorer of Mikolov et al. (2013), as gensim's `original_scorer`, on arrays of counts"""
+    return (bigram_count - min_count) / worda_count / wordb_count * len_vocab
+
+
+def npmi_scorer(
+    worda_count: np.ndarray,
+    wordb_count: np.ndarray,
+    bigram_count: np.ndarray,
+    len_vocab: int,
+    min_count: int,
+    corpus_word_count: int,
+) -> np.ndarray:
+    """Normalized pointwise mutual information (Bouma, 2009), as gensim's `npmi_scorer`, on arrays of counts
+
+    Scores range from -1 to 1; bigrams seen fewer than `min_count` times score -inf.
+    """
+    pa = worda_count / corpus_word_count
+    pb = wordb_count / corpus_word_count
+    pab = bigram_count / corpus_word_count
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scores = np.log(pab / (pa * pb)) / -np.log(pab)
+    return np.where(bigram_count >= min_count, scores, -np.inf)
+
+
+# scorers by name, with gensim's names
+SCORERS = {'default': original_scorer, 'original': original_scorer, 'npmi': npmi_scorer}
+
+
+def _pair_keys(first: np.ndarray, second: np.ndarray) -> np.ndarray:
+    # one int64 per pair of int32 IDs, whatever the vocabulary size
+    keys = first.astype(np.int64)
+    keys <<= 32
+    keys |= second
+    return keys
+
+
+def _within_texts(corpus: EncodedCorpus) -> np.ndarray:
+    """Mask of the positions `i` such that tokens `i` and `i + 1` are in the same text"""
+    within = np.ones(max(len(corpus.ids) - 1, 0), dtype=bool)
+    # a pair crosses a text boundary when its second token starts a text
+    starts = corpus.offsets[1:-1]
+    within[starts[(starts > 0) & (starts < len(corpus.ids))] - 1] = False
+    return within
+
+
+class PhraseModel:
+    """Bigram phrases detected in a corpus, as a gensim `Phrases` model without connector words.
+
+    A pair of adjacent tokens `a b` is a phrase when its score is above the threshold.
+    Applying the model joins phrases into single tokens `a{delimiter}b`, greedily from the
+    left, as gensim does.
+
+    It can be applied to a whole corpus with `apply_phrases`, or to one text as `model[tokens]`.
+
+    Attributes:
+        vocabulary (Vocabulary): The vocabulary of the training corpus, holding the phrase tokens too
+        delimiter (str): Glue between the two tokens of a phrase
+        threshold (float): Score above which a bigram is a phrase
+        phrase_keys (np.ndarray): Sorted keys of the phrases, one int64 per pair of token IDs
+        phrase_ids (np.ndarray): ID of the joined token of each phrase
+        scores (np.ndarray): Score of each phrase
+    """
+
+    __slots__ = ('_phrases', 'delimiter', 'phrase_ids', 'phrase_keys', 'scores', 'threshold', 'vocabulary')
+
+    def __init__(
+        self,
+        vocabulary: Vocabulary,
+        phrase_keys: np.ndarray,
+        scores: np.ndarray,
+        delimiter: str = '_',
+        threshold: float = 10.0,
+    ):
+        order = np.argsort(phrase_keys)
+        self.vocabulary = vocabulary
+        self.delimiter = delimiter
+        self.threshold = threshold
+        self.phrase_keys = phrase_keys[order]
+        self.scores = scores[order]
+
+        tokens = vocabulary.tokens
+        firsts = (self.phrase_keys >> 32).tolist()
+        seconds = (self.phrase_keys & 0xFFFFFFFF).tolist()
+        self._phrases = {(tokens[a], tokens[b]): f'{tokens[a]}{delimiter}{tokens[b]}' for a, b in zip(firsts, seconds)}
+        self.phrase_ids = np.fromiter(
+            (vocabulary.add(phrase) for phrase in self._phrases.values()), dtype=ID_DTYPE, count=len(self._phrases)
+        )
+
+    def __len__(self) -> int:
+        return len(self.phrase_keys)
+
+    def export_phrases(self) -> dict[str, float]:
+        """The phrases and their scores, as gensim's `Phrases.export_phrases`"""
+        return dict(zip(self._phrases.values(), self.scores.tolist()))
+
+    def __getitem__(self, tokens: list[Token]) -> list[Token]:
+        """Join the phrases of one tokenised text"""
+        phrases = self._phrases
+        result = []
+        index = 0
+        while index < len(tokens):
+            if index + 1 < len(tokens) and (phrase := phrases.get((tokens[index], tokens[index + 1]))) is not None:
+                result.append(phrase)
+                index += 2
+            else:
+                result.append(tokens[index])
+                index += 1
+        return result
+
+    def transform(self, corpus: EncodedCorpus) -> EncodedCorpus:
+        """Join the phrases of every text of a corpus encoded with the model's vocabulary, in one vectorised pass"""
+        if corpus.vocabulary is not self.vocabulary:
+            raise ValueError("corpus must be encoded with the vocabulary of the model")
+
+        ids = corpus.ids
+        keys = _pair_keys(ids[:-1], ids[1:])
+        slots = np.searchsorted(self.phrase_keys, keys)
+        slots[slots == len(self.phrase_keys)] = 0
+        is_phrase = _within_texts(corpus)
+        if len(self.phrase_keys):
+            is_phrase &= self.phrase_keys[slots] == keys
+        else:
+            is_phrase[:] = False
+        del keys
+
+        # greedy from the left: in a run of overlapping phrases, every other one starting from the first is joined
+        index = np.arange(len(is_phrase))
+        run_starts = is_phrase & ~np.concatenate(([False], is_phrase[:-1]))
+        run_start = np.maximum.accumulate(np.where(run_starts, index, 0)) if len(index) else index
+        joined = is_phrase & ((index - run_start) % 2 == 0)
+
+        new_ids = ids.copy()
+        new_ids[:-1][joined] = self.phrase_ids[slots[joined]]
+        keep = np.ones(len(ids), dtype=bool)
+        keep[1:][joined] = False
+
+        kept_before = np.concatenate(([0], np.cumsum(keep, dtype=OFFSET_DTYPE)))
+        return EncodedCorpus(new_ids[keep], kept_before[corpus.offsets], self.vocabulary)
+
+
+def train_phrases(
+    corpus: EncodedCorpus | Iterable[list[Token]],
+    min_count: int = 5,
+    threshold: float = 10.0,
+    scoring: str = 'default',
+    delimiter: str = '_',
+) -> PhraseModel:
+    """Detect bigram phrases, counting unigrams and bigrams with NumPy. A `training_model_fn` for `process_ngram`.
+
+    The parameters and scores follow gensim `Phrases` (without connector words): `len_vocab`
+    is the number of distinct unigrams and bigrams and `corpus_word_count` the number of tokens.
+    Configure it with `functools.partial`:
+
+    Example:
+        >>> process_bigram = process_ngram(
+        ...     partial(train_phrases, min_count=1, threshold=0.1, delimiter=NGRAM_DELIMITER),
+        ...     apply_phrases,
+        ...     filter_encoded(lambda token: NGRAM_DELIMITER in token),
+        ...     replace_encoded(lambda token: token.replace(NGRAM_DELIMITER, "")),
+        ... )
+
+    Args:
+        corpus: An `EncodedCorpus`, or tokenised texts, which are encoded first
+        min_count: Bigrams seen fewer times are ignored by the scorers
+        threshold: Score above which a bigram is a phrase
+        scoring: 'default' or 'original' (Mikolov et al.), or 'npmi'
+        delimiter: Glue between the two tokens of a phrase
+
+    Returns:
+        The detected phrases
+
+    Raises:
+        ValueError: For the settings gensim rejects: `min_count` below 1, `threshold` not positive
+            with the default scorer, or outside [-1, 1] with 'npmi'
+    """
+    # the same checks as gensim `Phrases`
+    if scoring not in SCORERS:
+        raise ValueError(f"Unknown scoring '{scoring}', expected one of {sorted(SCORERS)}")
+    if min_count <= 0:
+        raise ValueError("min_count should be at least 1")
+    if threshold <= 0 and SCORERS[scoring] is original_scorer:
+        raise ValueError("threshold should be positive for default scoring")
+    if scoring == 'npmi' and not -1 <= threshold <= 1:
+        raise ValueError("threshold should be between -1 and 1 for npmi scoring")
+    if not isinstance(corpus, EncodedCorpus):
+        corpus = encode_corpus(corpus)
+
+    ids = corpus.ids
+    word_counts = np.bincount(ids, minlength=len(corpus.vocabulary))
+    keys = _pair_keys(ids[:-1], ids[1:])[_within_texts(corpus)]
+    keys.sort()
+    # counting runs of the sorted keys, as np.unique does, without its copy of the keys
+    run_starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1]))) if len(keys) else keys
+    bigram_keys = keys[run_starts]
+    bigram_counts = np.diff(np.append(run_starts, len(keys)))
+    del keys
+    len_vocab = int(np.count_nonzero(word_counts)) + len(bigram_keys)
+
+    if threshold >= 0:
+        # both scorers give bigrams seen fewer than min_count times a negative score, so only score the others
+        candidates = bigram_counts >= min_count
+        bigram_keys, bigram_counts = bigram_keys[candidates], bigram_counts[candidates]
+
+    scores = SCORERS[scoring](
+        word_counts[bigram_keys >> 32],
+        word_counts[bigram_keys & 0xFFFFFFFF],
+        bigram_counts,
+        len_vocab,
+        min_count,
+        len(ids),
+    )
+    is_phrase = scores > threshold
+    return PhraseModel(corpus.vocabulary, bigram_keys[is_phrase], scores[is_phrase], delimiter, threshold)
+
+
+def apply_phrases(
+    model: PhraseModel, corpus: EncodedCorpus | Iterable[list[Token]]
+) -> EncodedCorpus | list[list[Token]]:
+    """Join the phrases of every text of a corpus. A `get_ngram_tokens_fn` for `process_ngram`.
+
+    Args:
+        model: Phrases from `train_phrases`
+        corpus: An `EncodedCorpus`, or tokenised texts
+
+    Returns:
+        The texts with phrases joined, in the same form as `corpus`
+    """
+    if isinstance(corpus, EncodedCorpus) and corpus.vocabulary is model.vocabulary:
+        return model.transform(corpus)
+    if isinstance(corpus, EncodedCorpus):
+        return encode_corpus(map(model.__getitem__, corpus), model.vocabulary)
+    return [model[tokens] for tokens in corpus]
@@ -1,13 +1,185 @@
 from ._types import Text, Token, Word
 from pymonad.tools import curry
+import multiprocessing
 import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Callable, Iterable, Pattern
+
+
+__all__ = [
+    'WordFilter',
+    'RegexFilter',
+    'exclude_words',
+    'exclude_by_regex',
+    'exclude_words_from_corpus',
+    'exclude_by_regex_from_corpus',
+    'tokenise_corpus',
+]
+
+
+class WordFilter:
+    """Remove the tokens found in a list of words, e.g. stopwords.
+
+    The words are put in a frozenset once, when the filter is built,
+    so each token is looked up in constant time however long the list is.
+
+    Example:
+        >>> remove_stopwords = WordFilter(stopwords)
+        >>> remove_stopwords(tokens)  # one tokenised text
+        >>> remove_stopwords.corpus(tokenised_texts)  # every text of a corpus
+    """
+
+    __slots__ = ('words',)
+
+    def __init__(self, words: Iterable[Word]):
+        self.words = frozenset(words)
+
+    def __call__(self, tokens: list[Token]) -> list[Token]:
+        words = self.words
+        return [token for token in tokens if token not in words]
+
+    def corpus(self, tokenised_texts: Iterable[list[Token]]) -> list[list[Token]]:
+        words = self.words
+        return [[token for token in tokens if token not in words] for tokens in tokenised_texts]
+
+
+class RegexFilter:
+    """Remove the tokens matching any of several regexes, as `re.match` does (anchored at the start of the token).
+
+    The regexes are compiled once, into a single alternation, so each token is matched
+    once instead of once per regex. Regexes with groups or flags are compiled on their own,
+    since joining them would renumber their backreferences.
+
+    Example:
+        >>> remove_numbers_and_spaces = RegexFilter(r"^\\d+$", r"^\\s+$")
+        >>> remove_numbers_and_spaces(tokens)  # one tokenised text
+        >>> remove_numbers_and_spaces.corpus(tokenised_texts)  # every text of a corpus
+    """
+
+    __slots__ = ('_matchers', 'patterns')
+
+    def __init__(self, *regex_patterns: str | Pattern[str]):
+        self.patterns = tuple(re.compile(pattern) for pattern in regex_patterns)
+
+        # regexes with groups or flags (other than the default re.UNICODE) cannot be joined safely
+        plain, separate = [], []
+        for pattern in self.patterns:
+            if pattern.groups or pattern.flags & ~re.UNICODE:
+                separate.append(pattern)
+            else:
+                plain.append(pattern.pattern)
+
+        if len(plain) > 1:
+            separate.insert(0, re.compile('|'.join(f'(?:{pattern})' for pattern in plain)))
+        elif plain:
+            separate.insert(0, re.compile(plain[0]))
+        self._matchers = tuple(pattern.match for pattern in separate)
+
+    def __call__(self, tokens: list[Token]) -> list[Token]:
+        if len(self._matchers) == 1:
+            match = self._matchers[0]
+            return [token for token in tokens if not match(token)]
+        return [token for token in tokens if not any(match(token) for match in self._matchers)]
+
+    def corpus(self, tokenised_texts: Iterable[list[Token]]) -> list[list[Token]]:
+        return [self(tokens) for tokens in tokenised_texts]
 
 
 @curry(2)
-def exclude_words(words: list[Word], tokens: list[Token]) -> list[Token]:
+def exclude_words(words: list[Word] | WordFilter, tokens: list[Token]) -> list[Token]:
+    if isinstance(words, WordFilter):
+        return words(tokens)
     return [token for token in tokens if token not in words]
 
 
 @curry(2)
-def exclude_by_regex(regex_pattern: str, tokens: list[Token]) -> list[Token]:
+def exclude_by_regex(regex_pattern: str | RegexFilter, tokens: list[Token]) -> list[Token]:
+    if isinstance(regex_pattern, RegexFilter):
+        return regex_pattern(tokens)
     return [token for token in tokens if not re.match(regex_pattern, token)]
+
+
+@curry(2)
+def exclude_words_from_corpus(
+    words: Iterable[Word] | WordFilter, tokenised_texts: Iterable[list[Token]]
+) -> list[list[Token]]:
+    """Remove the tokens found in `words` from every text of a corpus, building the word set once."""
+    word_filter = words if isinstance(words, WordFilter) else WordFilter(words)
+    return word_filter.corpus(tokenised_texts)
+
+
+@curry(2)
+def exclude_by_regex_from_corpus(
+    regex_patterns: str | Iterable[str] | RegexFilter, tokenised_texts: Iterable[list[Token]]
+) -> list[list[Token]]:
+    """Remove the tokens matching any of `regex_patterns` from every text of a corpus, compiling them once."""
+    if isinstance(regex_patterns, RegexFilter):
+        regex_filter = regex_patterns
+    elif isinstance(regex_patterns, str):
+        regex_filter = RegexFilter(regex_patterns)
+    else:
+        regex_filter = RegexFilter(*regex_patterns)
+    return regex_filter.corpus(tokenised_texts)
+
+
+def tokenise_corpus(
+    texts: Iterable[Text],
+    engine: str = "newmm",
+    keep_whitespace: bool = False,
+    processes: int | None = None,
+    chunksize: int = 1000,
+    memoise: bool = True,
+    tokenise_fn: Callable[[Text], list[Token]] | None = None,
+) -> list[list[Token]]:
+    """Tokenise every text of a corpus with pythainlp `word_tokenize`, optionally on a process pool.
+
+    The texts keep their order. It takes a single argument, so it plugs into `compose`
+    with its defaults, or configured with `functools.partial`:
+
+    Example:
+        >>> pipeline = compose(partial(tokenise_corpus, processes=8), prepare_data_for_ngram)
+
+    Args:
+        texts: The texts to tokenise
+        engine: The `word_tokenize` engine
+        keep_whitespace: Whether `word_tokenize` keeps whitespace tokens
+        processes: Number of worker processes for large inputs (None or 1 tokenises in this process)
+        chunksize: Number of texts sent to a worker at a time; inputs no larger than this are tokenised in this process
+        memoise: Whether repeated texts are tokenised once; each repeat still gets its own list of tokens
+        tokenise_fn: Function tokenising one text, used instead of `word_tokenize` (must be picklable with `processes`)
+
+    Returns:
+        The list of tokens of each text
+    """
+    texts = list(texts)
+    if tokenise_fn is None:
+        tokenise_fn = partial(_word_tokenize, engine=engine, keep_whitespace=keep_whitespace)
+
+    # duplicated texts are tokenised once, then copied back in place
+    unique_texts = list(dict.fromkeys(texts)) if memoise else texts
+
+    if processes is None or processes <= 1 or len(unique_texts) <= chunksize:
+        tokens = list(map(tokenise_fn, unique_texts))
+    else:
+        with ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context('spawn')) as executor:
+            tokens = list(executor.map(tokenise_fn, unique_texts, chunksize=chunksize))
+
+    if not memoise or len(unique_texts) == len(texts):
+        return tokens
+
+    tokens_by_text = dict(zip(unique_texts, tokens))
+    seen = set()
+    result = []
+    for text in texts:
+        text_tokens = tokens_by_text[text]
+        result.append(list(text_tokens) if text in seen else text_tokens)
+        seen.add(text)
+    return result
+
+
+def _word_tokenize(text: Text, engine: str, keep_whitespace: bool) -> list[Token]:
+    # imported here, so that workers only pay for it when the pythainlp tokeniser is used
+    from pythainlp.tokenize import word_tokenize
+
+    return word_tokenize(text, engine=engine, keep_whitespace=keep_whitespace)
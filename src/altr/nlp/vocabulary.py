@@ -0,0 +1,202 @@
+from ._types import Token
+
+from array import array
+from itertools import pairwise
+from pymonad.tools import curry
+from typing import Callable, Iterable, Iterator
+
+import numpy as np
+
+
+__all__ = ['Vocabulary', 'EncodedCorpus', 'encode_corpus', 'map_encoded', 'filter_encoded', 'replace_encoded']
+
+# dtype of token IDs and of text offsets
+ID_DTYPE = np.int32
+OFFSET_DTYPE = np.int64
+# largest token ID
+MAX_ID = int(np.iinfo(ID_DTYPE).max)
+
+
+class Vocabulary:
+    """Intern tokens, mapping each distinct token to an int32 ID.
+
+    IDs are given in order of first appearance and never change, so a vocabulary can be shared
+    by the corpora of every n-gram level: new n-gram tokens are added at the end and the IDs of
+    the earlier corpora stay valid.
+
+    Example:
+        >>> vocabulary = Vocabulary()
+        >>> vocabulary.encode(["ผม", "ชอบ", "ผม"])
+        array([0, 1, 0], dtype=int32)
+        >>> vocabulary.decode([1, 0])
+        ['ชอบ', 'ผม']
+    """
+
+    __slots__ = ('_ids', 'tokens')
+
+    def __init__(self, tokens: Iterable[Token] = ()):
+        self._ids: dict[Token, int] = {}
+        # tokens by ID
+        self.tokens: list[Token] = []
+        for token in tokens:
+            self.add(token)
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def __contains__(self, token: Token) -> bool:
+        return token in self._ids
+
+    def add(self, token: Token) -> int:
+        """Get the ID of a token, adding it to the vocabulary if it is new"""
+        token_id = self._ids.get(token)
+        if token_id is None:
+            token_id = len(self.tokens)
+            # checked before inserting, so `_ids` and `tokens` stay in step
+            if token_id > MAX_ID:
+                raise OverflowError(f"Vocabulary is limited to {MAX_ID + 1} tokens")
+            self._ids[token] = token_id
+            self.tokens.append(token)
+        return token_id
+
+    def id_of(self, token: Token) -> int:
+        """Get the ID of a token, raising KeyError if it is not in the vocabulary"""
+        return self._ids[token]
+
+    def encode(self, tokens: Iterable[Token]) -> np.ndarray:
+        """Convert tokens to an int32 array of IDs, adding the new tokens to the vocabulary"""
+        add = self.add
+        return np.fromiter((add(token) for token in tokens), dtype=ID_DTYPE)
+
+    def decode(self, ids: Iterable[int]) -> list[Token]:
+        """Convert IDs back to tokens"""
+        tokens = self.tokens
+        if isinstance(ids, np.ndarray):
+            ids = ids.tolist()
+        return [tokens[token_id] for token_id in ids]
+
+
+class EncodedCorpus:
+    """A read-only corpus of tokenised texts stored as token IDs, CSR style.
+
+    The IDs of every text are concatenated in one flat int32 array, `ids`, and text `i` is
+    `ids[offsets[i]:offsets[i + 1]]`. Each distinct token is stored once, in the vocabulary,
+    instead of once per occurrence as in a `list[list[Token]]`.
+
+    Reading it as a sequence gives lists of tokens, decoded one text at a time, so it can be
+    passed where a corpus of tokenised texts is read, such as `gensim.models.Phrases`, and
+    iterated again. The arrays are not writeable, so corpora can share them.
+
+    Attributes:
+        ids (np.ndarray): The token IDs of every text, concatenated
+        offsets (np.ndarray): Where each text starts in `ids`, followed by `len(ids)`
+        vocabulary (Vocabulary): The vocabulary the IDs refer to
+    """
+
+    __slots__ = ('ids', 'offsets', 'vocabulary')
+
+    def __init__(self, ids: np.ndarray, offsets: np.ndarray, vocabulary: Vocabulary):
+        self.ids = np.asarray(ids, dtype=ID_DTYPE)
+        self.offsets = np.asarray(offsets, dtype=OFFSET_DTYPE)
+        self.vocabulary = vocabulary
+        self.ids.flags.writeable = False
+        self.offsets.flags.writeable = False
+
+    @classmethod
+    def from_texts(
+        cls, tokenised_texts: Iterable[list[Token]], vocabulary: Vocabulary | None = None
+    ) -> 'EncodedCorpus':
+        """Encode tokenised texts, consumed one at a time, adding their tokens to `vocabulary`"""
+        vocabulary = vocabulary if vocabulary is not None else Vocabulary()
+        add = vocabulary.add
+        # typed arrays grow without holding a Python int per token
+        ids = array('i')
+        offsets = array('q', [0])
+        for tokens in tokenised_texts:
+            ids.extend(add(token) for token in tokens)
+            offsets.append(len(ids))
+        return cls(np.frombuffer(ids, dtype=ID_DTYPE), np.frombuffer(offsets, dtype=OFFSET_DTYPE), vocabulary)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> list[Token]:
+        return self.vocabulary.decode(self.row(index))
+
+    def __iter__(self) -> Iterator[list[Token]]:
+        decode = self.vocabulary.decode
+        ids, offsets = self.ids, self.offsets.tolist()
+        for start, stop in pairwise(offsets):
+            yield decode(ids[start:stop])
+
+    def row(self, index: int) -> np.ndarray:
+        """The token IDs of a text, as a view of `ids`"""
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("EncodedCorpus index out of range")
+        return self.ids[self.offsets[index] : self.offsets[index + 1]]
+
+    def to_texts(self) -> list[list[Token]]:
+        """Decode the whole corpus back to lists of tokens"""
+        return list(self)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the ID and offset arrays, not counting the shared vocabulary"""
+        return self.ids.nbytes + self.offsets.nbytes
+
+    def __repr__(self) -> str:
+        return f"EncodedCorpus({len(self)} texts, {len(self.ids)} tokens, {len(self.vocabulary)} distinct tokens)"
+
+
+def encode_corpus(tokenised_texts: Iterable[list[Token]], vocabulary: Vocabulary | None = None) -> EncodedCorpus:
+    """Encode tokenised texts, e.g. before `prepare_data_for_ngram`, so that every n-gram level is stored as IDs"""
+    return EncodedCorpus.from_texts(tokenised_texts, vocabulary)
+
+
+@curry(2)
+def map_encoded(func: Callable[[list[Token]], list[Token]], corpus: EncodedCorpus) -> EncodedCorpus:
+    """Apply a function to the tokens of every text, decoding and encoding one text at a time.
+
+    New tokens returned by `func` (e.g. n-gram tokens) are added to the corpus vocabulary.
+
+    Example:
+        >>> get_ngram_tokens = lambda model, corpus: map_encoded(lambda tokens: model[tokens], corpus)
+    """
+    return EncodedCorpus.from_texts(map(func, corpus), corpus.vocabulary)
+
+
+@curry(2)
+def filter_encoded(predicate: Callable[[Token], bool], corpus: EncodedCorpus) -> EncodedCorpus:
+    """Keep the tokens for which `predicate` is true, without decoding the corpus.
+
+    The predicate is called once per vocabulary entry rather than once per occurrence.
+
+    Example:
+        >>> filter_ngram_tokens = filter_encoded(lambda token: DELIMITER in token)
+    """
+    tokens = corpus.vocabulary.tokens
+    keep_token = np.fromiter((bool(predicate(token)) for token in tokens), dtype=bool, count=len(tokens))
+    keep = keep_token[corpus.ids]
+
+    # the number of kept tokens before each offset gives the new offsets
+    kept_before = np.concatenate(([0], np.cumsum(keep, dtype=OFFSET_DTYPE)))
+    return EncodedCorpus(corpus.ids[keep], kept_before[corpus.offsets], corpus.vocabulary)
+
+
+@curry(2)
+def replace_encoded(func: Callable[[Token], Token], corpus: EncodedCorpus) -> EncodedCorpus:
+    """Replace every token with `func(token)`, without decoding the corpus.
+
+    The function is called once per vocabulary entry rather than once per occurrence,
+    and the texts keep their offsets.
+
+    Example:
+        >>> concat_ngram_tokens = replace_encoded(lambda token: token.replace(DELIMITER, ""))
+    """
+    vocabulary = corpus.vocabulary
+    # taken before adding the replaced tokens, which are looked up but not replaced themselves
+    tokens = vocabulary.tokens[:]
+    table = np.fromiter((vocabulary.add(func(token)) for token in tokens), dtype=ID_DTYPE, count=len(tokens))
+    return EncodedCorpus(table[corpus.ids], corpus.offsets, vocabulary)
@@ -10,19 +10,35 @@ Modules:
     search: Functions for searching topics
     topic: Functions for fetching and parsing topic pages
     comment: Functions for fetching and parsing comments
+    rate_limit: Token-bucket rate limiter shared across requests
+    retry: Retry policy with jittered exponential backoff
+    cache: On-disk cache of HTTP responses
+    crawl: Incremental crawl with a persistent index of crawled topics
+    sink: Streaming JSONL/Parquet output of scraped records
+    work_queue: Shared SQLite queue distributing a crawl across processes and hosts
 """
 
-from .config import AUTH_TOKEN, USER_AGENTS, TIMEOUT_SECONDS, ROOMS
+from .config import AUTH_TOKEN, USER_AGENTS, TIMEOUT_SECONDS, POOL_SIZE, MAX_WORKERS, PARSE_WORKERS, ROOMS
 from .search import search_topics, count_total_topics, extract_search_results, extract_topic_ids
-from .topic import fetch_topic, extract_topic_content, extract_topic_text
-from .comment import fetch_comments, count_comment_pages, extract_comments
-from .text_cleaner import clean_pantip_text
+from .topic import fetch_topic, extract_topic_content, extract_topic_text, stream_topic_text, parse_topic_page
+from .comment import fetch_comments, count_comment_pages, count_max_comments, extract_comments
+from .text_cleaner import clean_pantip_text, clean_pantip_texts
+from .utils import create_session
+from .rate_limit import RateLimiter
+from .retry import RetryPolicy, RetryError, get_attempts
+from .cache import ResponseCache
+from .crawl import CrawlIndex, IncrementalCrawler
+from .sink import PantipSink, JsonlShardWriter, ParquetShardWriter, flatten_record
+from .work_queue import WorkQueue, QueueWorker
 
 __all__ = [
     # Config exports
     'AUTH_TOKEN',
     'USER_AGENTS',
     'TIMEOUT_SECONDS',
+    'POOL_SIZE',
+    'MAX_WORKERS',
+    'PARSE_WORKERS',
     'ROOMS',
     # Search functions
     'search_topics',
@@ -33,10 +49,32 @@ __all__ = [
     'fetch_topic',
     'extract_topic_content',
     'extract_topic_text',
+    'stream_topic_text',
+    'parse_topic_page',
     # Comment functions
     'fetch_comments',
     'count_comment_pages',
+    'count_max_comments',
     'extract_comments',
     # Text cleaning functions
     'clean_pantip_text',
+    'clean_pantip_texts',
+    # HTTP helpers
+    'create_session',
+    'RateLimiter',
+    'RetryPolicy',
+    'RetryError',
+    'get_attempts',
+    'ResponseCache',
+    # Incremental crawl
+    'CrawlIndex',
+    'IncrementalCrawler',
+    # Distributed crawl
+    'WorkQueue',
+    'QueueWorker',
+    # Output
+    'PantipSink',
+    'JsonlShardWriter',
+    'ParquetShardWriter',
+    'flatten_record',
 ]
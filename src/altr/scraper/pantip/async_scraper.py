@@ -0,0 +1,489 @@
+"""
+Pantip asyncio scraper module.
+
+This module provides asyncio counterparts of the Pantip fetchers and of `PantipScraper`,
+built on `aiohttp` (install with the `async` extra).
+
+Fetched bodies are wrapped in `requests.Response` objects, so the results are the same
+`Either` values as the blocking fetchers and can be bound to the same parsing functions
+(`response_to_soup`, `response_to_json`, `extract_comments`, ...).
+"""
+
+import asyncio
+import logging
+from typing import Any, Callable, List, Optional, Self, Union
+
+import aiohttp
+import requests
+
+from altr.monad.extended_pymonad import Right
+from .config import SEARCH_API, TOPIC_BASE_URL, COMMENT_API, AUTH_TOKEN, TIMEOUT_SECONDS, POOL_SIZE, MAX_WORKERS
+from .cache import ResponseCache
+from .rate_limit import RateLimiter
+from .retry import RetryPolicy
+from .scraper import BasePantipScraper, CommentResult, SearchResult, TopicID
+from .search import check_search_response, is_valid_search_response
+from .utils import build_response, check_status_code, get_random_user_agent, MaybeResponse, RequestPolicy
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Exceptions of aiohttp that retry policies treat as `ConnectionError` (refused, dropped or reset connections)
+ASYNC_CONNECTION_ERRORS = (aiohttp.ClientConnectionError,)
+
+
+def create_async_session(pool_size: int = POOL_SIZE, keep_alive: bool = True) -> aiohttp.ClientSession:
+    """Create a pooled aiohttp session for reusing connections across requests.
+
+    Must be called from within a running event loop.
+
+    Args:
+        pool_size: Maximum number of connections to keep per host
+        keep_alive: Whether to keep connections open between requests
+
+    Returns:
+        aiohttp.ClientSession: A session with a pooled connector
+    """
+    connector = aiohttp.TCPConnector(limit=0, limit_per_host=pool_size, force_close=not keep_alive)
+    return aiohttp.ClientSession(connector=connector)
+
+
+async def _send(
+    session: Optional[aiohttp.ClientSession],
+    method: str,
+    url: str,
+    rate_limiter: Optional[RateLimiter] = None,
+    retry_policy: Optional[RetryPolicy] = None,
+    cache: Optional[ResponseCache] = None,
+    cache_if: Optional[Callable[[requests.Response], bool]] = None,
+    **kwargs: Any,
+) -> MaybeResponse:
+    """Send a request and read the whole body into a `requests.Response`.
+
+    Args:
+        session: Session to send the request with (will use a one-off session if None)
+        method: HTTP method
+        url: URL to request
+        rate_limiter: Rate limiter to wait on before sending, and to report the status code to
+        retry_policy: Policy deciding whether and when to retry (no retries if None)
+        cache: Cache to look the response up in and store it to (no caching if None)
+        cache_if: Check of a 200 response before it is cached, e.g. that it is not an error reported in the body
+        **kwargs: Extra arguments passed to `aiohttp.ClientSession.request`
+
+    Returns:
+        Either[str, requests.Response]: Right containing response on success,
+                                       Left containing error message on failure
+    """
+    if session is None:
+        async with aiohttp.ClientSession() as one_off_session:
+            return await _send(
+                one_off_session,
+                method,
+                url,
+                rate_limiter=rate_limiter,
+                retry_policy=retry_policy,
+                cache=cache,
+                cache_if=cache_if,
+                **kwargs,
+            )
+
+    policy = RequestPolicy(
+        method,
+        url,
+        rate_limiter=rate_limiter,
+        retry_policy=retry_policy,
+        cache=cache,
+        cache_if=cache_if,
+        params=kwargs.get('params'),
+        json_body=kwargs.get('json'),
+        connection_errors=ASYNC_CONNECTION_ERRORS,
+    )
+    # the SQLite cache blocks, so it is read and written on a worker thread
+    if cache is not None:
+        cached_response = await asyncio.to_thread(policy.cached_response)
+        if cached_response is not None:
+            return Right(cached_response)
+
+    timeout = aiohttp.ClientTimeout(total=TIMEOUT_SECONDS)
+    while True:
+        policy.next_attempt()
+        if rate_limiter is not None:
+            await rate_limiter.acquire_async()
+
+        try:
+            async with session.request(method, url, timeout=timeout, **kwargs) as client_response:
+                response = build_response(
+                    url=str(client_response.url),
+                    status_code=client_response.status,
+                    content=await client_response.read(),
+                    headers=dict(client_response.headers),
+                    encoding=client_response.charset,
+                )
+        except Exception as e:
+            delay = policy.retry_after_error(e)
+            if delay is not None:
+                await asyncio.sleep(delay)
+                continue
+            return policy.failure(e)
+
+        delay = policy.retry_after_response(response)
+        if delay is not None:
+            await asyncio.sleep(delay)
+            continue
+
+        if cache is not None:
+            await asyncio.to_thread(policy.store, response)
+        return policy.success(response)
+
+
+async def async_fetch_topic(
+    topic_id: Union[int, str],
+    auth_token: str = AUTH_TOKEN,
+    user_agent: Optional[str] = None,
+    session: Optional[aiohttp.ClientSession] = None,
+    rate_limiter: Optional[RateLimiter] = None,
+    retry_policy: Optional[RetryPolicy] = None,
+    cache: Optional[ResponseCache] = None,
+) -> MaybeResponse:
+    """Fetch a topic page from Pantip without blocking the event loop.
+
+    Args:
+        topic_id: The ID of the topic to fetch
+        auth_token: Authorization token for Pantip API
+        user_agent: User agent string to use for the request
+                   (will use random one if None)
+        session: Session to send the request with, allowing connection reuse
+                 (will use a one-off session if None)
+        rate_limiter: Rate limiter shared with other requests (no limit if None)
+        retry_policy: Policy for retrying failed requests (no retries if None)
+        cache: Response cache to read from and write to (no caching if None)
+
+    Returns:
+        Either[str, requests.Response]: Right containing response on success,
+                                       Left containing error message on failure
+    """
+    if user_agent is None:
+        user_agent = get_random_user_agent()
+
+    topic_url = f"{TOPIC_BASE_URL.rstrip('/')}/{topic_id}"
+    headers = {'ptauthorize': auth_token, 'User-Agent': user_agent}
+
+    response = await _send(
+        session, 'GET', topic_url, rate_limiter=rate_limiter, retry_policy=retry_policy, cache=cache, headers=headers
+    )
+    return response.bind(check_status_code)
+
+
+async def async_fetch_comments(
+    topic_id: Union[int, str],
+    page: int,
+    auth_token: str = AUTH_TOKEN,
+    user_agent: Optional[str] = None,
+    session: Optional[aiohttp.ClientSession] = None,
+    rate_limiter: Optional[RateLimiter] = None,
+    retry_policy: Optional[RetryPolicy] = None,
+    cache: Optional[ResponseCache] = None,
+) -> MaybeResponse:
+    """Fetch comments for a specific topic and page without blocking the event loop.
+
+    Args:
+        topic_id: The ID of the topic to fetch comments for
+        page: The page number of comments to fetch
+        auth_token: Authorization token for Pantip API
+        user_agent: User agent string to use for the request
+                   (will use random one if None)
+        session: Session to send the request with, allowing connection reuse
+                 (will use a one-off session if None)
+        rate_limiter: Rate limiter shared with other requests (no limit if None)
+        retry_policy: Policy for retrying failed requests (no retries if None)
+        cache: Response cache to read from and write to (no caching if None)
+
+    Returns:
+        Either[str, requests.Response]: Right containing response on success,
+                                       Left containing error message on failure
+    """
+    if user_agent is None:
+        user_agent = get_random_user_agent()
+
+    params = {'tid': str(topic_id), 'param': f'page{page}'}
+    headers = {'x-requested-with': 'XMLHttpRequest', 'ptauthorize': auth_token, 'User-Agent': user_agent}
+
+    response = await _send(
+        session,
+        'GET',
+        COMMENT_API,
+        rate_limiter=rate_limiter,
+        retry_policy=retry_policy,
+        cache=cache,
+        params=params,
+        headers=headers,
+    )
+    return response.bind(check_status_code)
+
+
+async def async_search_topics(
+    keyword: str,
+    rooms: Optional[List[str]] = None,
+    page: int = 1,
+    auth_token: str = AUTH_TOKEN,
+    user_agent: Optional[str] = None,
+    sort_by_time: bool = False,
+    session: Optional[aiohttp.ClientSession] = None,
+    rate_limiter: Optional[RateLimiter] = None,
+    retry_policy: Optional[RetryPolicy] = None,
+    cache: Optional[ResponseCache] = None,
+) -> MaybeResponse:
+    """Search for topics on Pantip without blocking the event loop.
+
+    Args:
+        keyword: The search term
+        rooms: List of room categories to filter by (None for all rooms)
+        page: The page number of search results
+        auth_token: Authorization token for Pantip API
+        user_agent: User agent string to use for the request
+                   (will use random one if None)
+        sort_by_time: Whether to sort results by time (True) or relevance (False)
+        session: Session to send the request with, allowing connection reuse
+                 (will use a one-off session if None)
+        rate_limiter: Rate limiter shared with other requests (no limit if None)
+        retry_policy: Policy for retrying failed requests (no retries if None)
+        cache: Response cache to read from and write to (no caching if None)
+
+    Returns:
+        Either[str, requests.Response]: Right containing response on success,
+                                       Left containing error message on failure
+    """
+    if rooms is None:
+        rooms = []
+
+    if user_agent is None:
+        user_agent = get_random_user_agent()
+
+    headers = {'ptauthorize': auth_token, 'User-Agent': user_agent}
+    request_json = {"keyword": keyword, "page": page, 'rooms': rooms, 'timebias': sort_by_time}
+
+    response = await _send(
+        session,
+        'POST',
+        SEARCH_API,
+        rate_limiter=rate_limiter,
+        retry_policy=retry_policy,
+        cache=cache,
+        cache_if=is_valid_search_response,
+        headers=headers,
+        json=request_json,
+    )
+    return response.bind(check_search_response)
+
+
+class AsyncPantipScraper(BasePantipScraper):
+    """An asyncio interface for scraping Pantip data.
+
+    The async counterpart of `PantipScraper`: the methods are coroutines returning the
+    same values, so many topic and comment requests can be in flight on a single event loop.
+
+    The pooled session is created lazily on the first request. Use the scraper as an
+    async context manager, or call `aclose`, to release the connections.
+
+    Attributes:
+        auth_token (str): Authentication token for Pantip API
+        user_agents (List[str]): List of user agent strings to rotate through
+        timeout (int): Timeout in seconds for HTTP requests
+        pool_size (int): Maximum number of keep-alive connections per host
+        keep_alive (bool): Whether to keep connections open between requests
+        rate_limiter (Optional[RateLimiter]): Rate limiter every request goes through
+        retry_policy (Optional[RetryPolicy]): Policy for retrying failed requests
+        cache (Optional[ResponseCache]): Cache of responses shared by all requests
+        parser (str): How topic pages are parsed: 'html.parser', 'lxml' or 'stream'
+    """
+
+    def __init__(
+        self,
+        auth_token: str = AUTH_TOKEN,
+        user_agents: Optional[List[str]] = None,
+        timeout: int = TIMEOUT_SECONDS,
+        log_level: int = logging.INFO,
+        pool_size: int = POOL_SIZE,
+        keep_alive: bool = True,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        cache: Optional[ResponseCache] = None,
+        parser: str = 'html.parser',
+        session: Optional[aiohttp.ClientSession] = None,
+    ):
+        """Initialize the AsyncPantipScraper.
+
+        Args:
+            auth_token: Authentication token for Pantip API
+            user_agents: List of user agent strings to rotate through (uses defaults if None)
+            timeout: Timeout in seconds for HTTP requests
+            log_level: Logging level to use
+            pool_size: Maximum number of keep-alive connections per host
+            keep_alive: Whether to keep connections open between requests
+            rate_limiter: Rate limiter to share across requests (no limit if None)
+            retry_policy: Policy for retrying failed requests (no retries if None)
+            cache: Response cache to read from and write to (no caching if None)
+            parser: How topic pages are parsed: a BeautifulSoup tree builder ('html.parser' or 'lxml'),
+                    or 'stream' to extract the topic text without building a tree
+            session: Session to use instead of creating a pooled one
+        """
+        super().__init__(
+            auth_token=auth_token,
+            user_agents=user_agents,
+            timeout=timeout,
+            log_level=log_level,
+            rate_limiter=rate_limiter,
+            retry_policy=retry_policy,
+            cache=cache,
+            parser=parser,
+        )
+        self.pool_size = pool_size
+        self.keep_alive = keep_alive
+        self._session = session
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """The pooled session shared by all requests of this scraper."""
+        if self._session is None or self._session.closed:
+            self._session = create_async_session(pool_size=self.pool_size, keep_alive=self.keep_alive)
+        return self._session
+
+    async def aclose(self) -> None:
+        """Close the pooled connections held by the session."""
+        if self._session is not None:
+            await self._session.close()
+
+    async def get_topic_detail(self, topic_id: TopicID) -> str:
+        """Fetch and extract the main content of a Pantip topic.
+
+        Args:
+            topic_id: The ID of the topic to fetch
+
+        Returns:
+            The topic content as a string, or an empty string on failure
+        """
+        logger.debug(f"Fetching topic {topic_id}")
+
+        response = await async_fetch_topic(
+            topic_id=topic_id,
+            auth_token=self.auth_token,
+            user_agent=self._random_user_agent(),
+            session=self.session,
+            rate_limiter=self.rate_limiter,
+            retry_policy=self.retry_policy,
+            cache=self.cache,
+        )
+
+        # building the page tree blocks, so it is done on a worker thread
+        return await asyncio.to_thread(self._topic_detail_result, topic_id, response)
+
+    async def get_topic_comments(self, topic_id: TopicID, page: int = 1) -> CommentResult:
+        """Fetch comments for a Pantip topic.
+
+        Args:
+            topic_id: The ID of the topic to fetch comments for
+            page: The page number of comments to fetch (defaults to 1)
+
+        Returns:
+            A dictionary containing:
+                - data: List of comment dictionaries
+                - page_count: Total number of comment pages
+                - max_comments: Total number of comments of the topic
+                - error: Error message if any, None otherwise
+                - attempts: Number of attempts made for the request
+        """
+        logger.debug(f"Fetching comments for topic {topic_id}, page {page}")
+
+        response = await async_fetch_comments(
+            topic_id=topic_id,
+            page=page,
+            auth_token=self.auth_token,
+            user_agent=self._random_user_agent(),
+            session=self.session,
+            rate_limiter=self.rate_limiter,
+            retry_policy=self.retry_policy,
+            cache=self.cache,
+        )
+
+        return self._comments_result(topic_id, page, response)
+
+    async def get_all_comments(self, topic_id: TopicID, max_workers: int = MAX_WORKERS) -> CommentResult:
+        """Fetch every comment page of a Pantip topic.
+
+        The first page is fetched to read the number of pages, then the remaining
+        pages are fetched concurrently and merged in page order.
+
+        Args:
+            topic_id: The ID of the topic to fetch comments for
+            max_workers: Maximum number of pages fetched at the same time
+
+        Returns:
+            A dictionary containing:
+                - data: List of comment dictionaries from all pages
+                - page_count: Total number of comment pages
+                - max_comments: Total number of comments of the topic
+                - error: Error message if any page failed, None otherwise
+                - attempts: Number of attempts made for all pages
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+
+        first_page = await self.get_topic_comments(topic_id, page=1)
+        if first_page["error"] is not None:
+            return first_page
+
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def get_page(page: int) -> CommentResult:
+            async with semaphore:
+                return await self.get_topic_comments(topic_id, page=page)
+
+        remaining_pages = range(2, first_page["page_count"] + 1)
+        other_pages = await asyncio.gather(*(get_page(page) for page in remaining_pages))
+        return self._merge_comment_pages(topic_id, [first_page, *other_pages])
+
+    async def search(
+        self,
+        keyword: str,
+        rooms: Optional[List[str]] = None,
+        page: int = 1,
+        sort_by_time: bool = False,
+    ) -> SearchResult:
+        """Search for topics on Pantip based on keywords and filters.
+
+        Args:
+            keyword: The search keyword/phrase
+            rooms: List of room IDs to search within (None searches all rooms)
+            page: The search results page number to fetch
+            sort_by_time: If True, sort results by time; otherwise by relevance
+
+        Returns:
+            A dictionary containing:
+                - data: List of topic dictionaries with search results
+                - topic_ids: List of topic IDs from search results
+                - total_topics: Total number of topics matching the search
+                - error: Error message if any, None otherwise
+                - attempts: Number of attempts made for the request
+        """
+        logger.debug(f"Searching for '{keyword}' in rooms {rooms or 'all'}, page {page}")
+
+        response = await async_search_topics(
+            keyword=keyword,
+            rooms=rooms,
+            page=page,
+            auth_token=self.auth_token,
+            user_agent=self._random_user_agent(),
+            sort_by_time=sort_by_time,
+            session=self.session,
+            rate_limiter=self.rate_limiter,
+            retry_policy=self.retry_policy,
+            cache=self.cache,
+        )
+
+        return self._search_result(keyword, response)
@@ -0,0 +1,193 @@
+"""
+Response cache for Pantip scraper.
+
+This module provides an on-disk cache of HTTP responses backed by SQLite, so the same
+topic, comment and search pages are not downloaded again while developing or re-running crawls.
+
+Entries are keyed by the request method, URL (including query parameters) and JSON body.
+They expire after a time-to-live, and the least recently used entries are evicted when
+the cache grows over its size cap.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional, Self, Union
+
+import requests
+
+from .utils import build_response
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    status_code INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    encoding TEXT,
+    content BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at);
+"""
+
+
+class ResponseCache:
+    """An SQLite-backed HTTP response cache with TTL and LRU eviction.
+
+    The cache can be shared by threads of one process, and by several processes using
+    the same file.
+
+    Attributes:
+        path (str): Path of the SQLite database (":memory:" for an in-memory cache)
+        ttl_seconds (Optional[float]): Age after which entries expire (never if None)
+        max_bytes (Optional[int]): Total size of response bodies to keep (unbounded if None)
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        ttl_seconds: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+    ):
+        """Initialize the ResponseCache, creating the database if needed.
+
+        Args:
+            path: Path of the SQLite database (":memory:" for an in-memory cache)
+            ttl_seconds: Age after which entries expire (never if None)
+            max_bytes: Total size of response bodies to keep (unbounded if None)
+        """
+        self.path = str(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.executescript(SCHEMA)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._connection.close()
+
+    @staticmethod
+    def key(method: str, url: str, params: Optional[dict] = None, json_body: Optional[Any] = None) -> str:
+        """Compute the cache key of a request.
+
+        Args:
+            method: HTTP method
+            url: URL of the request
+            params: Query parameters of the request
+            json_body: JSON body of the request
+
+        Returns:
+            A hex digest identifying the request
+        """
+        prepared = requests.Request(method.upper(), url, params=params).prepare()
+        body = json.dumps(json_body, sort_keys=True, ensure_ascii=False) if json_body is not None else ''
+        return hashlib.sha256(f"{prepared.method} {prepared.url} {body}".encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[requests.Response]:
+        """Look up a cached response.
+
+        Args:
+            key: Cache key of the request
+
+        Returns:
+            The cached response (with `from_cache` set to True), or None on a miss or if it expired
+        """
+        now = time.time()
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT url, status_code, headers, encoding, content, created_at FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+
+            url, status_code, headers, encoding, content, created_at = row
+            if self.ttl_seconds is not None and now - created_at > self.ttl_seconds:
+                self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+
+            self._connection.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+
+        response = build_response(url, status_code, content, headers=json.loads(headers), encoding=encoding)
+        response.from_cache = True
+        return response
+
+    def put(self, key: str, response: requests.Response) -> None:
+        """Store a response, evicting the least recently used entries if the cache is over its size cap.
+
+        Args:
+            key: Cache key of the request
+            response: The response to store
+        """
+        now = time.time()
+        content = response.content
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    response.url,
+                    response.status_code,
+                    json.dumps(dict(response.headers)),
+                    response.encoding,
+                    content,
+                    len(content),
+                    now,
+                    now,
+                ),
+            )
+            if self.max_bytes is not None:
+                self._evict(self.max_bytes)
+
+    def _evict(self, max_bytes: int) -> None:
+        """Delete the least recently used entries until the bodies fit in `max_bytes`."""
+        (total,) = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+        if total <= max_bytes:
+            return
+
+        evicted = []
+        for key, size in self._connection.execute("SELECT key, size FROM responses ORDER BY accessed_at"):
+            if total <= max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+        self._connection.executemany("DELETE FROM responses WHERE key = ?", evicted)
+
+    def prune(self) -> int:
+        """Delete expired entries.
+
+        Returns:
+            Number of deleted entries
+        """
+        if self.ttl_seconds is None:
+            return 0
+        with self._lock, self._connection:
+            cursor = self._connection.execute(
+                "DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+            )
+            return cursor.rowcount
+
+    def clear(self) -> None:
+        """Delete every entry."""
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM responses")
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._connection.execute("SELECT COUNT(*) FROM responses").fetchone()
+        return count
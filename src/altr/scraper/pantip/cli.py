@@ -0,0 +1,248 @@
+"""
+Command line crawler for Pantip.
+
+This module provides the `altr-pantip` console script. It searches for keywords, fetches
+every topic and all of its comment pages, cleans the texts with `clean_pantip_text` and
+streams the records to JSONL or Parquet shards, reporting throughput at the end.
+
+Usage:
+    altr-pantip KEYWORD [KEYWORD ...] --output DIR [--room ROOM ...] [--max-pages N]
+                [--workers N] [--rate-limit RPS] [--format jsonl|parquet] [--index PATH | --queue PATH]
+
+With `--queue`, several processes or hosts sharing the queue database (and, typically,
+the output directory) crawl the same keywords together, each claiming its own batches.
+"""
+
+import argparse
+import logging
+import sys
+import time
+from typing import Any, Dict, Optional, Sequence
+
+from .config import MAX_WORKERS, ROOMS, SHARD_SIZE
+from .crawl import CrawlIndex, IncrementalCrawler, clean_update
+from .rate_limit import RateLimiter
+from .retry import RetryPolicy
+from .scraper import PantipScraper
+from .sink import WRITERS, PantipSink
+from .work_queue import QueueWorker, WorkQueue, default_worker_id
+
+
+def resolve_room(room: str) -> str:
+    """Find the room category searched for a room ID, Thai name or English name.
+
+    Args:
+        room: ID, name or English name of a room in `ROOMS`
+
+    Returns:
+        The English name of the room, as sent to the search API
+
+    Raises:
+        ValueError: If no room matches
+    """
+    for candidate in ROOMS:
+        if room.casefold() in (str(candidate['id']), candidate['name'].casefold(), candidate['name_en'].casefold()):
+            return candidate['name_en']
+    raise ValueError(f"Unknown room '{room}', expected one of {[candidate['name_en'] for candidate in ROOMS]}")
+
+
+def positive_int(value: str) -> int:
+    """Parse a command line argument that must be an integer of at least 1.
+
+    Args:
+        value: The argument
+
+    Returns:
+        The parsed integer
+
+    Raises:
+        argparse.ArgumentTypeError: If the argument is not an integer of at least 1
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{value}'") from None
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1 (got {number})")
+    return number
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """Parse the command line arguments.
+
+    Args:
+        argv: Arguments to parse (defaults to `sys.argv[1:]`)
+
+    Returns:
+        The parsed arguments
+    """
+    parser = argparse.ArgumentParser(
+        prog='altr-pantip', description="Crawl Pantip topics and comments matching keywords."
+    )
+    parser.add_argument('keywords', nargs='+', metavar='KEYWORD', help="keyword to search for")
+    parser.add_argument('-o', '--output', required=True, help="output directory")
+    parser.add_argument('-f', '--format', choices=sorted(WRITERS), default='jsonl', help="output format")
+    parser.add_argument(
+        '-r', '--room', action='append', dest='rooms', metavar='ROOM', help="room ID, name or English name (repeatable)"
+    )
+    parser.add_argument('--max-pages', type=positive_int, help="maximum number of search result pages per keyword")
+    parser.add_argument('--relevance', action='store_true', help="sort search results by relevance instead of time")
+    parser.add_argument('-w', '--workers', type=positive_int, default=MAX_WORKERS, help="number of concurrent requests")
+    parser.add_argument('--rate-limit', type=float, help="maximum number of requests per second")
+    parser.add_argument('--attempts', type=positive_int, default=3, help="number of attempts per request")
+    parser.add_argument(
+        '--parser',
+        default='html.parser',
+        choices=['html.parser', 'lxml', 'stream'],
+        help="topic page parser (lxml needs the lxml extra)",
+    )
+    parser.add_argument(
+        '--max-records', type=positive_int, default=SHARD_SIZE, help="maximum number of records per shard"
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--index', help="crawl index database; only fetches what changed since the last run")
+    mode.add_argument('--queue', help="shared work queue database; crawls together with other workers of the queue")
+    parser.add_argument('--worker-id', help="ID of this queue worker, also its shard prefix (default: host-pid)")
+    parser.add_argument('--raw', action='store_true', help="keep texts as HTML instead of cleaning them")
+    parser.add_argument('--log-level', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'], default='INFO')
+
+    args = parser.parse_args(argv)
+    try:
+        args.rooms = [resolve_room(room) for room in args.rooms] if args.rooms else None
+    except ValueError as error:
+        parser.error(str(error))
+    return args
+
+
+def create_scraper(args: argparse.Namespace) -> PantipScraper:
+    """Create the scraper configured by the command line arguments.
+
+    Args:
+        args: Parsed command line arguments
+
+    Returns:
+        A PantipScraper
+    """
+    rate_limiter = RateLimiter(args.rate_limit, burst=args.workers) if args.rate_limit else None
+    return PantipScraper(
+        log_level=getattr(logging, args.log_level),
+        pool_size=args.workers,
+        rate_limiter=rate_limiter,
+        retry_policy=RetryPolicy(max_attempts=args.attempts),
+        parser=args.parser,
+    )
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """Crawl every keyword into the output directory.
+
+    Args:
+        args: Parsed command line arguments, with rooms resolved by `parse_args`
+
+    Returns:
+        A dictionary of crawl statistics: topics, new_topics, comments, errors and seconds
+    """
+    if args.queue:
+        return run_queue(args)
+
+    stats = {'topics': 0, 'new_topics': 0, 'comments': 0, 'errors': 0, 'seconds': 0.0}
+    start = time.perf_counter()
+
+    with (
+        create_scraper(args) as scraper,
+        CrawlIndex(args.index or ':memory:') as index,
+        PantipSink(args.output, format=args.format, max_records=args.max_records) as sink,
+    ):
+        crawler = IncrementalCrawler(scraper, index, max_workers=args.workers)
+        for keyword in args.keywords:
+            updates = crawler.crawl(
+                keyword, rooms=args.rooms, sort_by_time=not args.relevance, max_pages=args.max_pages
+            )
+            for update in updates:
+                if update['error'] is not None:
+                    stats['errors'] += 1
+                    continue
+                if not args.raw:
+                    update = clean_update(update)
+
+                if update['is_new']:
+                    stats['new_topics'] += 1
+                    if update['topic'] is not None:
+                        sink.write_search_results([update['topic']])
+                    sink.write_topic(update['topic_id'], update['content'])
+                sink.write_comments(update['topic_id'], update['comments'])
+                stats['topics'] += 1
+                stats['comments'] += len(update['comments'])
+
+    stats['seconds'] = time.perf_counter() - start
+    return stats
+
+
+def run_queue(args: argparse.Namespace) -> Dict[str, Any]:
+    """Add the keywords to the shared work queue and work through it until it is drained.
+
+    Enqueuing is idempotent, so every worker of a crawl can be started with the same command.
+
+    Args:
+        args: Parsed command line arguments, with `queue` set
+
+    Returns:
+        A dictionary of crawl statistics, as returned by `run` but without new_topics:
+        a queue worker does not know which topics were crawled before
+    """
+    worker = args.worker_id or default_worker_id()
+    start = time.perf_counter()
+
+    with (
+        create_scraper(args) as scraper,
+        WorkQueue(args.queue) as queue,
+        PantipSink(args.output, format=args.format, max_records=args.max_records, prefix=worker) as sink,
+    ):
+        for keyword in args.keywords:
+            queue.enqueue_search(keyword, rooms=args.rooms, sort_by_time=not args.relevance, max_pages=args.max_pages)
+        worker_stats = QueueWorker(
+            queue, scraper, sink, worker=worker, max_workers=args.workers, clean=not args.raw
+        ).run()
+
+    return {
+        'topics': worker_stats['topics'],
+        'comments': worker_stats['comments'],
+        'errors': worker_stats['failed'],
+        'seconds': time.perf_counter() - start,
+    }
+
+
+def format_stats(stats: Dict[str, Any]) -> str:
+    """Format crawl statistics as a throughput report.
+
+    Args:
+        stats: Statistics returned by `run` (new_topics is optional)
+
+    Returns:
+        A one-line report
+    """
+    seconds = max(stats['seconds'], 1e-9)
+    new_topics = f" ({stats['new_topics']} new)" if 'new_topics' in stats else ''
+    return (
+        f"Crawled {stats['topics']} topics{new_topics} and {stats['comments']} comments "
+        f"in {stats['seconds']:.1f}s: {stats['topics'] / seconds:.2f} topics/s, "
+        f"{stats['comments'] / seconds:.2f} comments/s, {stats['errors']} errors"
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Entry point of the `altr-pantip` console script.
+
+    Args:
+        argv: Command line arguments (defaults to `sys.argv[1:]`)
+
+    Returns:
+        Exit status: 0 on success, 1 if some topics failed
+    """
+    stats = run(parse_args(argv))
+    print(format_stats(stats), file=sys.stderr)
+    return 1 if stats['errors'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
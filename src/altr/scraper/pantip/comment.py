@@ -9,8 +9,11 @@ import requests
 from typing import Union, Optional
 
 from altr.monad.extended_pymonad import Left, Right, Either
-from .config import COMMENT_API, AUTH_TOKEN, TIMEOUT_SECONDS
-from .utils import get_random_user_agent, extract_json_key, MaybeJSON
+from .config import COMMENT_API, AUTH_TOKEN, COMMENTS_PER_PAGE
+from .cache import ResponseCache
+from .rate_limit import RateLimiter
+from .retry import RetryPolicy
+from .utils import get_random_user_agent, send_request, check_status_code, extract_json_key, MaybeJSON
 
 # Type aliases
 MaybeResponse = Either[str, requests.Response]
@@ -22,6 +25,10 @@ def fetch_comments(
     page: int,
     auth_token: str = AUTH_TOKEN,
     user_agent: Optional[str] = None,
+    session: Optional[requests.Session] = None,
+    rate_limiter: Optional[RateLimiter] = None,
+    retry_policy: Optional[RetryPolicy] = None,
+    cache: Optional[ResponseCache] = None,
 ) -> MaybeResponse:
     """Fetch comments for a specific topic and page.
 
@@ -31,6 +38,11 @@ def fetch_comments(
         auth_token: Authorization token for Pantip API
         user_agent: User agent string to use for the request
                    (will use random one if None)
+        session: Session to send the request with, allowing connection reuse
+                 (will use a one-off connection if None)
+        rate_limiter: Rate limiter shared with other requests (no limit if None)
+        retry_policy: Policy for retrying failed requests (no retries if None)
+        cache: Response cache to read from and write to (no caching if None)
 
     Returns:
         Either[str, requests.Response]: Right containing response on success,
@@ -42,25 +54,27 @@ def fetch_comments(
     params = {'tid': str(topic_id), 'param': f'page{page}'}
     headers = {'x-requested-with': 'XMLHttpRequest', 'ptauthorize': auth_token, 'User-Agent': user_agent}
 
-    try:
-        response = requests.get(COMMENT_API, params=params, headers=headers, timeout=TIMEOUT_SECONDS)
-    except Exception as e:
-        return Left(f"{e.__class__.__name__}: {e}")
+    response = send_request(
+        'GET',
+        COMMENT_API,
+        session=session,
+        rate_limiter=rate_limiter,
+        retry_policy=retry_policy,
+        cache=cache,
+        params=params,
+        headers=headers,
+    )
+    return response.bind(check_status_code)
 
-    if response.status_code != 200:
-        return Left(f"Response code is not 200 (got {response.status_code})")
 
-    return Right(response)
-
-
-def count_comment_pages(response_data: dict) -> MaybeInt:
-    """Calculate the number of pages of comments based on response data.
+def count_max_comments(response_data: dict) -> MaybeInt:
+    """Get the number of comments of a topic from response data.
 
     Args:
         response_data: Response data from Pantip API
 
     Returns:
-        Either[str, int]: Right containing number of pages on success,
+        Either[str, int]: Right containing number of comments on success,
                          Left containing error message on failure
     """
     # Extract max comments from paging information
@@ -72,9 +86,21 @@ def count_comment_pages(response_data: dict) -> MaybeInt:
     if maybe_max_comments.is_left():
         return Left(maybe_max_comments.error or "Failed to extract max_comments")
 
+    return Right(maybe_max_comments.value)
+
+
+def count_comment_pages(response_data: dict) -> MaybeInt:
+    """Calculate the number of pages of comments based on response data.
+
+    Args:
+        response_data: Response data from Pantip API
+
+    Returns:
+        Either[str, int]: Right containing number of pages on success,
+                         Left containing error message on failure
+    """
     # Calculate number of pages (100 comments per page)
-    num_pages = math.ceil(maybe_max_comments.value / 100)
-    return Right(num_pages)
+    return count_max_comments(response_data).map(lambda max_comments: math.ceil(max_comments / COMMENTS_PER_PAGE))
 
 
 def extract_comments(response_data: dict) -> MaybeJSON:
@@ -23,8 +23,21 @@ USER_AGENTS: Final[list[str]] = [
 
 # Request parameters
 TOPICS_PER_PAGE: Final[int] = 10  # Number of topics per page in search results
+COMMENTS_PER_PAGE: Final[int] = 100  # Number of comments per page of a topic
 TIMEOUT_SECONDS: Final[int] = 4  # Request timeout in seconds
 
+# Connection pooling
+POOL_CONNECTIONS: Final[int] = 4  # Number of per-host connection pools to keep
+POOL_SIZE: Final[int] = 10  # Maximum number of keep-alive connections per host
+
+# Concurrency
+MAX_WORKERS: Final[int] = 8  # Default number of concurrent requests for batch fetches
+PARSE_WORKERS: Final[int] = 4  # Default number of processes parsing topic pages in pipeline mode
+
+# Output shards
+SHARD_SIZE: Final[int] = 100_000  # Maximum number of records per output shard
+ROW_GROUP_SIZE: Final[int] = 10_000  # Number of records per Parquet row group
+
 # API Endpoints
 SEARCH_API: Final[str] = "https://pantip.com/api/search-service/search/getresult"
 TOPIC_BASE_URL: Final[str] = "https://pantip.com/topic/"
@@ -0,0 +1,360 @@
+"""
+Incremental crawl for Pantip scraper.
+
+This module keeps a local SQLite index of the topics already crawled, with the number of
+comments they had and when they were fetched, so that crawling the same keywords and rooms
+again only fetches new topics and the comment pages that grew since the last run.
+
+A crawl saves a checkpoint after every search result page, so that it resumes where it
+stopped if it is interrupted.
+"""
+
+import json
+import logging
+import math
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Self, Union
+
+from .config import COMMENTS_PER_PAGE, MAX_WORKERS, TOPICS_PER_PAGE
+from .scraper import PantipScraper, TopicID
+from .text_cleaner import clean_pantip_text
+from .utils import map_concurrently
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Type aliases for better readability
+TopicUpdate = Dict[str, Any]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS topics (
+    topic_id TEXT PRIMARY KEY,
+    max_comments INTEGER NOT NULL,
+    first_fetched_at REAL NOT NULL,
+    fetched_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS checkpoints (
+    crawl TEXT PRIMARY KEY,
+    page INTEGER NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+class CrawlIndex:
+    """An SQLite index of crawled topics and crawl checkpoints.
+
+    Attributes:
+        path (str): Path of the SQLite database (":memory:" for an in-memory index)
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """Initialize the CrawlIndex, creating the database if needed.
+
+        Args:
+            path: Path of the SQLite database (":memory:" for an in-memory index)
+        """
+        self.path = str(path)
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.executescript(SCHEMA)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._connection.close()
+
+    def get(self, topic_id: TopicID) -> Optional[Dict[str, Any]]:
+        """Look up a crawled topic.
+
+        Args:
+            topic_id: The ID of the topic
+
+        Returns:
+            A dictionary with the topic's max_comments, first_fetched_at and fetched_at,
+            or None if the topic was never crawled
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT max_comments, first_fetched_at, fetched_at FROM topics WHERE topic_id = ?", (str(topic_id),)
+            ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(("max_comments", "first_fetched_at", "fetched_at"), row))
+
+    def record(self, topic_id: TopicID, max_comments: int) -> None:
+        """Record that a topic was fetched with the given number of comments.
+
+        Args:
+            topic_id: The ID of the topic
+            max_comments: Number of comments the topic had when it was fetched
+        """
+        now = time.time()
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT INTO topics VALUES (?, ?, ?, ?) ON CONFLICT (topic_id) "
+                "DO UPDATE SET max_comments = excluded.max_comments, fetched_at = excluded.fetched_at",
+                (str(topic_id), max_comments, now, now),
+            )
+
+    @staticmethod
+    def crawl_key(keyword: str, rooms: Optional[List[str]] = None, sort_by_time: bool = True) -> str:
+        """Compute the key identifying the checkpoint of a crawl.
+
+        Args:
+            keyword: The searched keyword/phrase
+            rooms: List of room IDs searched within
+            sort_by_time: Whether results are sorted by time
+
+        Returns:
+            A string identifying the crawl
+        """
+        return json.dumps([keyword, sorted(rooms or []), sort_by_time], ensure_ascii=False)
+
+    def checkpoint(self, crawl: str) -> int:
+        """Get the last search result page a crawl finished.
+
+        Args:
+            crawl: Key of the crawl, from `crawl_key`
+
+        Returns:
+            The last finished page, or 0 if the crawl has no checkpoint
+        """
+        with self._lock:
+            row = self._connection.execute("SELECT page FROM checkpoints WHERE crawl = ?", (crawl,)).fetchone()
+        return row[0] if row is not None else 0
+
+    def save_checkpoint(self, crawl: str, page: int) -> None:
+        """Record that a crawl finished a search result page.
+
+        Args:
+            crawl: Key of the crawl, from `crawl_key`
+            page: The finished page
+        """
+        with self._lock, self._connection:
+            self._connection.execute("INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?)", (crawl, page, time.time()))
+
+    def clear_checkpoint(self, crawl: str) -> None:
+        """Forget the checkpoint of a finished crawl.
+
+        Args:
+            crawl: Key of the crawl, from `crawl_key`
+        """
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM checkpoints WHERE crawl = ?", (crawl,))
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._connection.execute("SELECT COUNT(*) FROM topics").fetchone()
+        return count
+
+
+def fetch_topic_update(
+    scraper: PantipScraper,
+    topic_id: TopicID,
+    topic: Optional[Dict[str, Any]] = None,
+    max_workers: int = MAX_WORKERS,
+) -> TopicUpdate:
+    """Fetch the content and every comment of a topic, as an update of a new topic.
+
+    Args:
+        scraper: Scraper used to send the requests
+        topic_id: The ID of the topic
+        topic: The topic dictionary from the search results, passed through to the update
+        max_workers: Maximum number of comment pages fetched at the same time
+
+    Returns:
+        An update as returned by `IncrementalCrawler.update_topic`
+    """
+    content = scraper.fetch_topic_detail(topic_id)
+    comments = scraper.get_all_comments(topic_id, max_workers=max_workers)
+
+    # a topic with an empty story is recorded with empty content; only failed fetches are errors
+    error = comments["error"]
+    if content.is_left():
+        error = f"Failed to fetch topic {topic_id}: {content.error}"
+    return {
+        "topic_id": topic_id,
+        "topic": topic,
+        "is_new": True,
+        "content": content.value if content.is_right() else '',
+        "comments": comments["data"],
+        "max_comments": comments["max_comments"],
+        "error": error,
+    }
+
+
+def clean_update(update: Dict[str, Any]) -> Dict[str, Any]:
+    """Clean the topic content and comment messages of a crawl update.
+
+    Args:
+        update: An update from `IncrementalCrawler.crawl`
+
+    Returns:
+        The update with cleaned texts
+    """
+    comments = [
+        {**comment, "message": clean_pantip_text(comment["message"])} if "message" in comment else comment
+        for comment in update["comments"]
+    ]
+    content = clean_pantip_text(update["content"]) if update["content"] else update["content"]
+    return {**update, "content": content, "comments": comments}
+
+
+class IncrementalCrawler:
+    """Crawl search results, fetching only what changed since the topics were last crawled.
+
+    New topics are fetched in full. For topics already in the index, only the comment page
+    holding the last known comment is fetched to read the current number of comments; if it
+    grew, the following pages are fetched too, and only the new comments are returned.
+
+    A topic is recorded in the index once the caller asks for the next update, so an update
+    that was not consumed before a crash is fetched again on the next run.
+
+    Each topic fetches its comment pages `comment_workers` at a time, so at most
+    `max_workers * comment_workers` requests are sent at the same time.
+
+    Attributes:
+        scraper (PantipScraper): Scraper used to send the requests
+        index (CrawlIndex): Index of the crawled topics and checkpoints
+        max_workers (int): Number of topics updated at the same time
+        comment_workers (int): Number of comment pages of a topic fetched at the same time
+    """
+
+    def __init__(
+        self, scraper: PantipScraper, index: CrawlIndex, max_workers: int = MAX_WORKERS, comment_workers: int = 1
+    ):
+        """Initialize the IncrementalCrawler.
+
+        Args:
+            scraper: Scraper used to send the requests
+            index: Index of the crawled topics and checkpoints
+            max_workers: Number of topics updated at the same time
+            comment_workers: Number of comment pages of a topic fetched at the same time
+        """
+        self.scraper = scraper
+        self.index = index
+        self.max_workers = max_workers
+        self.comment_workers = comment_workers
+
+    def crawl(
+        self,
+        keyword: str,
+        rooms: Optional[List[str]] = None,
+        sort_by_time: bool = True,
+        max_pages: Optional[int] = None,
+    ) -> Iterator[TopicUpdate]:
+        """Crawl every search result page, resuming from the last checkpoint of the same crawl.
+
+        Args:
+            keyword: The search keyword/phrase
+            rooms: List of room IDs to search within (None searches all rooms)
+            sort_by_time: If True, sort results by time; otherwise by relevance
+            max_pages: Maximum number of result pages to crawl (None crawls all pages)
+
+        Yields:
+            An update for each new topic and each topic with new comments, as returned by `update_topic`
+        """
+        crawl = self.index.crawl_key(keyword, rooms, sort_by_time)
+        page = self.index.checkpoint(crawl) + 1
+        if page > 1:
+            logger.info(f"Resuming crawl of '{keyword}' from search page {page}")
+
+        num_pages = None
+        while max_pages is None or page <= max_pages:
+            result = self.scraper.search(keyword, rooms=rooms, page=page, sort_by_time=sort_by_time)
+            if result["error"] is not None:
+                # keep the checkpoint, so that the next run starts from this page
+                return
+
+            if num_pages is None:
+                num_pages = math.ceil(result["total_topics"] / TOPICS_PER_PAGE)
+            if not result["data"]:
+                break
+
+            updates = map_concurrently(
+                lambda topic: self.update_topic(topic["id"], topic=topic),
+                result["data"],
+                max_workers=self.max_workers,
+                ordered=True,
+            )
+            with closing(updates):
+                for _, update in updates:
+                    if update is None:
+                        continue
+                    yield update
+                    if update["error"] is None:
+                        self.index.record(update["topic_id"], update["max_comments"])
+
+            self.index.save_checkpoint(crawl, page)
+            if page >= num_pages:
+                break
+            page += 1
+
+        self.index.clear_checkpoint(crawl)
+
+    def update_topic(self, topic_id: TopicID, topic: Optional[Dict[str, Any]] = None) -> Optional[TopicUpdate]:
+        """Fetch what changed in a topic since it was last crawled.
+
+        Topics whose number of comments did not grow are recorded as fetched right away.
+
+        Args:
+            topic_id: The ID of the topic
+            topic: The topic dictionary from the search results, passed through to the update
+
+        Returns:
+            None if nothing changed, otherwise a dictionary containing:
+                - topic_id: The ID of the topic
+                - topic: The topic dictionary from the search results
+                - is_new: Whether the topic was not in the index
+                - content: The topic content (None for topics already in the index)
+                - comments: The comments added since the topic was last crawled
+                - max_comments: Total number of comments of the topic
+                - error: Error message if any, None otherwise
+        """
+        known = self.index.get(topic_id)
+        if known is None:
+            return fetch_topic_update(self.scraper, topic_id, topic=topic, max_workers=self.comment_workers)
+
+        last_page = max(1, math.ceil(known["max_comments"] / COMMENTS_PER_PAGE))
+        first_page = self.scraper.get_topic_comments(topic_id, page=last_page)
+        if first_page["error"] is None and first_page["max_comments"] <= known["max_comments"]:
+            self.index.record(topic_id, known["max_comments"])
+            return None
+
+        pages = [first_page]
+        if first_page["error"] is None:
+            next_pages = map_concurrently(
+                lambda page: self.scraper.get_topic_comments(topic_id, page=page),
+                range(last_page + 1, first_page["page_count"] + 1),
+                max_workers=self.comment_workers,
+                ordered=True,
+            )
+            pages += [result for _, result in next_pages]
+
+        failed_pages = [result["error"] for result in pages if result["error"] is not None]
+        return {
+            "topic_id": topic_id,
+            "topic": topic,
+            "is_new": False,
+            "content": None,
+            "comments": [
+                comment
+                for result in pages
+                for comment in result["data"]
+                if comment.get("comment_no", 0) > known["max_comments"]
+            ],
+            "max_comments": first_page["max_comments"],
+            "error": failed_pages[0] if failed_pages else None,
+        }
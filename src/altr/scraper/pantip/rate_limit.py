@@ -0,0 +1,106 @@
+"""
+Rate limiting for Pantip scraper.
+
+This module provides a token-bucket rate limiter that can be shared by every fetcher
+(and every thread or coroutine) talking to Pantip. It backs off adaptively when the
+server signals overload and recovers gradually while requests succeed.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Final, Optional
+
+# Status codes that make the limiter slow down
+BACKOFF_STATUS_CODES: Final[frozenset[int]] = frozenset({429, 500, 502, 503, 504})
+
+
+class RateLimiter:
+    """A thread-safe token bucket with additive-increase/multiplicative-decrease backoff.
+
+    Each request takes one token. Tokens refill at the current rate, up to `burst`
+    tokens. When a response has a status code in `BACKOFF_STATUS_CODES`, the current
+    rate is multiplied by `backoff_factor` (never going below `min_requests_per_second`).
+    Every other response raises it again by `recovery` times the configured rate,
+    up to `requests_per_second`.
+
+    Attributes:
+        requests_per_second (float): The highest rate the limiter allows
+        burst (int): Number of requests that can be sent back to back
+        min_requests_per_second (float): The lowest rate the limiter backs off to
+        backoff_factor (float): Factor applied to the rate on a backoff status code
+        recovery (float): Fraction of `requests_per_second` regained per successful response
+    """
+
+    def __init__(
+        self,
+        requests_per_second: float,
+        burst: int = 1,
+        min_requests_per_second: Optional[float] = None,
+        backoff_factor: float = 0.5,
+        recovery: float = 0.05,
+    ):
+        """Initialize the RateLimiter.
+
+        Args:
+            requests_per_second: The highest rate the limiter allows
+            burst: Number of requests that can be sent back to back
+            min_requests_per_second: The lowest rate to back off to (defaults to 1/16 of the rate)
+            backoff_factor: Factor applied to the rate on a backoff status code
+            recovery: Fraction of `requests_per_second` regained per successful response
+        """
+        if requests_per_second <= 0:
+            raise ValueError("requests_per_second must be positive")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self.min_requests_per_second = (
+            min_requests_per_second if min_requests_per_second is not None else requests_per_second / 16
+        )
+        self.backoff_factor = backoff_factor
+        self.recovery = recovery
+
+        self._rate = requests_per_second
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self) -> float:
+        """The current number of requests allowed per second."""
+        return self._rate
+
+    def _reserve(self) -> float:
+        """Take a token, returning how long the caller must wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self._rate)
+
+    def acquire(self) -> None:
+        """Block until a request is allowed."""
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self) -> None:
+        """Wait without blocking the event loop until a request is allowed."""
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def update(self, status_code: int) -> None:
+        """Adapt the rate to the status code of a response.
+
+        Args:
+            status_code: HTTP status code of the response
+        """
+        with self._lock:
+            if status_code in BACKOFF_STATUS_CODES:
+                self._rate = max(self.min_requests_per_second, self._rate * self.backoff_factor)
+            else:
+                self._rate = min(self.requests_per_second, self._rate + self.recovery * self.requests_per_second)
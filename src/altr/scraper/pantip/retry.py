@@ -0,0 +1,142 @@
+"""
+Retry policy for Pantip scraper.
+
+This module describes when and how long to wait before a failed request is sent again.
+The number of attempts made for a request is kept on the result, as `response.attempts`
+on success and as the `attempts` attribute of the `RetryError` message on failure.
+"""
+
+import random
+from typing import Any, Final, Iterable, Optional, Self
+
+import requests
+
+from altr.monad.extended_pymonad import Either
+
+# Exceptions retried by default: connection problems and timeouts
+RETRY_EXCEPTIONS: Final[tuple[type[BaseException], ...]] = (
+    requests.ConnectionError,
+    requests.Timeout,
+    ConnectionError,
+    TimeoutError,
+)
+
+# Status codes retried by default: rate limiting and transient server errors
+RETRY_STATUS_CODES: Final[frozenset[int]] = frozenset({429, 500, 502, 503, 504})
+
+
+class RetryError(str):
+    """Error message of a failed request that also records how many attempts were made.
+
+    It is a plain `str` everywhere else, so it can be used as the value of a `Left`.
+    """
+
+    attempts: int
+
+    def __new__(cls, message: str, attempts: int) -> Self:
+        error = super().__new__(cls, message)
+        error.attempts = attempts
+        return error
+
+
+class RetryPolicy:
+    """A retry policy with jittered exponential backoff.
+
+    The delay before attempt `n + 1` is `min(max_backoff, backoff_base * backoff_factor ** (n - 1))`,
+    reduced by a random fraction of up to `jitter` so that concurrent workers do not retry in lockstep.
+    A `Retry-After` header on the response is honoured when it asks for a longer delay.
+
+    Attributes:
+        max_attempts (int): Total number of attempts, including the first request
+        backoff_base (float): Delay in seconds before the second attempt
+        backoff_factor (float): Factor the delay grows by after each attempt
+        max_backoff (float): Upper bound of the delay in seconds
+        jitter (float): Largest fraction of the delay removed at random (0 disables jitter)
+        retry_exceptions (tuple[type[BaseException], ...]): Exception types that are retried
+        retry_status_codes (frozenset[int]): Response status codes that are retried
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        backoff_base: float = 0.5,
+        backoff_factor: float = 2.0,
+        max_backoff: float = 30.0,
+        jitter: float = 1.0,
+        retry_exceptions: Iterable[type[BaseException]] = RETRY_EXCEPTIONS,
+        retry_status_codes: Iterable[int] = RETRY_STATUS_CODES,
+    ):
+        """Initialize the RetryPolicy.
+
+        Args:
+            max_attempts: Total number of attempts, including the first request
+            backoff_base: Delay in seconds before the second attempt
+            backoff_factor: Factor the delay grows by after each attempt
+            max_backoff: Upper bound of the delay in seconds
+            jitter: Largest fraction of the delay removed at random (0 disables jitter)
+            retry_exceptions: Exception types that are retried
+            retry_status_codes: Response status codes that are retried
+        """
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        if not 0 <= jitter <= 1:
+            raise ValueError("jitter must be between 0 and 1")
+
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.retry_exceptions = tuple(retry_exceptions)
+        self.retry_status_codes = frozenset(retry_status_codes)
+
+    def should_retry(
+        self, attempt: int, error: Optional[BaseException] = None, status_code: Optional[int] = None
+    ) -> bool:
+        """Decide whether a request is sent again.
+
+        Args:
+            attempt: Number of attempts made so far
+            error: Exception raised by the last attempt, if any
+            status_code: Status code of the last response, if any
+
+        Returns:
+            True if there are attempts left and the failure is retryable
+        """
+        if attempt >= self.max_attempts:
+            return False
+        if error is not None:
+            return isinstance(error, self.retry_exceptions)
+        return status_code in self.retry_status_codes
+
+    def backoff(self, attempt: int, response: Optional[Any] = None) -> float:
+        """Compute the delay before the next attempt.
+
+        Args:
+            attempt: Number of attempts made so far
+            response: The last response, used to honour its `Retry-After` header
+
+        Returns:
+            Delay in seconds
+        """
+        delay = min(self.max_backoff, self.backoff_base * self.backoff_factor ** (attempt - 1))
+        delay *= 1 - self.jitter * random.random()
+
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after is not None and retry_after.isdigit():
+            delay = max(delay, min(self.max_backoff, float(retry_after)))
+        return delay
+
+
+def get_attempts(result: Either) -> int:
+    """Get the number of attempts made for a fetch result.
+
+    Args:
+        result: The Either returned by a fetcher
+
+    Returns:
+        Number of attempts made for the request (1 if it was not retried)
+    """
+    if result.is_left():
+        return getattr(result.error, 'attempts', 1)
+    return getattr(result.value, 'attempts', 1)
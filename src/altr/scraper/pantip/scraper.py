@@ -5,14 +5,42 @@ This module provides a high-level OOP interface for scraping data from Pantip fo
 It handles authentication, request management, and data extraction with proper error handling.
 """
 
+import math
 import random
 import logging
-from typing import Union, List, Dict, Any, cast, Optional
-
-from .config import USER_AGENTS, TIMEOUT_SECONDS, AUTH_TOKEN
-from .topic import fetch_topic, extract_topic_content, extract_topic_text, MaybeStr
-from .utils import response_to_soup, response_to_json, response_content_to_json
-from .comment import fetch_comments, extract_comments, count_comment_pages
+import multiprocessing
+import requests
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import closing
+from functools import partial
+from typing import Union, List, Dict, Any, cast, Optional, Iterable, Iterator, Tuple, Self
+
+from altr.monad.extended_pymonad import Right
+from .config import (
+    USER_AGENTS,
+    TIMEOUT_SECONDS,
+    AUTH_TOKEN,
+    POOL_CONNECTIONS,
+    POOL_SIZE,
+    MAX_WORKERS,
+    PARSE_WORKERS,
+    TOPICS_PER_PAGE,
+)
+from .topic import fetch_topic, parse_topic_page, MaybeStr
+from .text_cleaner import clean_pantip_text
+from .utils import (
+    response_to_json,
+    response_content_to_json,
+    build_response,
+    create_session,
+    map_concurrently,
+    MaybeResponse,
+)
+from .comment import fetch_comments, extract_comments, count_comment_pages, count_max_comments
+from .cache import ResponseCache
+from .rate_limit import RateLimiter
+from .retry import RetryPolicy, get_attempts
 from .search import search_topics, extract_search_results, count_total_topics, extract_topic_ids
 
 # Configure logger
@@ -24,21 +52,43 @@ SearchResult = Dict[str, Any]
 CommentResult = Dict[str, Any]
 
 
-class PantipScraper:
-    """A high-level interface for scraping Pantip data.
+def parse_topic_body(
+    url: str, content: bytes, encoding: Optional[str], parser: str = 'html.parser', clean: bool = False
+) -> MaybeStr:
+    """Parse the topic text out of the raw body of a topic page.
 
-    This class provides methods to retrieve topic content, comments, and perform searches
-    with proper error handling and logging.
+    This is the work done by the parsing processes of `PantipScraper.get_topics` in pipeline mode,
+    so it only takes picklable arguments.
 
-    All methods return unwrapped values (not monads) for a simpler API:
-    - Successful calls return the actual data (string, list, etc.)
-    - Failed calls return appropriate identity values (empty string, empty list, etc.)
-    - Error details are logged but not exposed in return values
+    Args:
+        url: URL the page was fetched from
+        content: Raw body of the page
+        encoding: Text encoding of the body (guessed from content if None)
+        parser: How the page is parsed: 'html.parser', 'lxml' or 'stream'
+        clean: If True, clean the topic text with `clean_pantip_text`
+
+    Returns:
+        Either[str, str]: Right containing the topic text on success,
+                          Left containing error message on failure
+    """
+    result = parse_topic_page(Right(build_response(url, 200, content, encoding=encoding)), parser=parser)
+    return result.map(clean_pantip_text) if clean else result
+
+
+class BasePantipScraper:
+    """Shared configuration and response handling for the Pantip scrapers.
+
+    Subclasses provide the transport (blocking or asyncio) and call the `_*_result`
+    methods to turn a fetched response into the unwrapped values returned to users.
 
     Attributes:
         auth_token (str): Authentication token for Pantip API
         user_agents (List[str]): List of user agent strings to rotate through
         timeout (int): Timeout in seconds for HTTP requests
+        rate_limiter (Optional[RateLimiter]): Rate limiter every request goes through
+        retry_policy (Optional[RetryPolicy]): Policy for retrying failed requests
+        cache (Optional[ResponseCache]): Cache of responses shared by all requests
+        parser (str): How topic pages are parsed: 'html.parser', 'lxml' or 'stream'
     """
 
     def __init__(
@@ -47,18 +97,31 @@ class PantipScraper:
         user_agents: Optional[List[str]] = None,
         timeout: int = TIMEOUT_SECONDS,
         log_level: int = logging.INFO,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        cache: Optional[ResponseCache] = None,
+        parser: str = 'html.parser',
     ):
-        """Initialize the PantipScraper.
+        """Initialize the scraper configuration.
 
         Args:
             auth_token: Authentication token for Pantip API
             user_agents: List of user agent strings to rotate through (uses defaults if None)
             timeout: Timeout in seconds for HTTP requests
             log_level: Logging level to use
+            rate_limiter: Rate limiter to share across requests (no limit if None)
+            retry_policy: Policy for retrying failed requests (no retries if None)
+            cache: Response cache to read from and write to (no caching if None)
+            parser: How topic pages are parsed: a BeautifulSoup tree builder ('html.parser' or 'lxml'),
+                    or 'stream' to extract the topic text without building a tree
         """
         self.auth_token = auth_token
         self.user_agents = user_agents if user_agents is not None else USER_AGENTS
         self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.cache = cache
+        self.parser = parser
 
         # Configure logger
         self._setup_logger(log_level)
@@ -102,25 +165,30 @@ class PantipScraper:
         logger.error(error_msg)
         return error_msg
 
-    def get_topic_detail(self, topic_id: TopicID) -> str:
-        """Fetch and extract the main content of a Pantip topic.
+    def _parse_topic_detail(self, response: MaybeResponse) -> MaybeStr:
+        """Parse the topic content out of a fetched topic page.
 
         Args:
-            topic_id: The ID of the topic to fetch
+            response: Result of fetching the topic page
 
         Returns:
-            The topic content as a string, or an empty string on failure
+            Either[str, str]: Right containing the topic content on success,
+                              Left containing error message on failure
         """
-        logger.debug(f"Fetching topic {topic_id}")
+        # Cast the result to the proper type for type checking
+        return cast(MaybeStr, parse_topic_page(response, parser=self.parser))
 
-        # Get the topic content
-        response = fetch_topic(topic_id=topic_id, auth_token=self.auth_token, user_agent=self._random_user_agent())
+    def _topic_detail_result(self, topic_id: TopicID, response: MaybeResponse) -> str:
+        """Extract the topic content from a fetched topic page.
 
-        # Process the response through the monad chain
-        result = response.bind(response_to_soup).bind(extract_topic_content).bind(extract_topic_text)
+        Args:
+            topic_id: The ID of the fetched topic
+            response: Result of fetching the topic page
 
-        # Cast the result to the proper type for type checking
-        typed_result = cast(MaybeStr, result)
+        Returns:
+            The topic content as a string, or an empty string on failure
+        """
+        typed_result = self._parse_topic_detail(response)
 
         # Handle the result based on the Either monad
         if typed_result.is_left():
@@ -130,46 +198,398 @@ class PantipScraper:
         logger.debug(f"Successfully fetched topic {topic_id}")
         return typed_result.value
 
-    def get_topic_comments(self, topic_id: TopicID, page: int = 1) -> CommentResult:
-        """Fetch comments for a Pantip topic.
+    def _comments_result(self, topic_id: TopicID, page: int, response: MaybeResponse) -> CommentResult:
+        """Extract comments and the page count from a fetched comments page.
 
         Args:
-            topic_id: The ID of the topic to fetch comments for
-            page: The page number of comments to fetch (defaults to 1)
+            topic_id: The ID of the topic the comments belong to
+            page: The page number of the fetched comments
+            response: Result of fetching the comments page
 
         Returns:
             A dictionary containing:
                 - data: List of comment dictionaries
                 - page_count: Total number of comment pages
+                - max_comments: Total number of comments of the topic
                 - error: Error message if any, None otherwise
+                - attempts: Number of attempts made for the request
         """
-        logger.debug(f"Fetching comments for topic {topic_id}, page {page}")
-
-        # Get the comments
-        response = fetch_comments(
-            topic_id=topic_id, page=page, auth_token=self.auth_token, user_agent=self._random_user_agent()
-        )
-
         # Process the response through the monad chain
         response_json = response.bind(response_content_to_json)
         result = response_json.bind(extract_comments)
         page_count = response_json.bind(count_comment_pages)
+        max_comments = response_json.bind(count_max_comments)
 
         if result.is_left():
             error_msg = self._format_error("fetch comments for topic", f"{topic_id}, page {page}", result.error)
             return {
                 "data": [],
                 "page_count": 0,
+                "max_comments": 0,
                 "error": error_msg,
+                "attempts": get_attempts(response),
             }
 
         logger.debug(f"Successfully fetched comments for topic {topic_id}, page {page}")
         return {
             "data": result.value,
             "page_count": page_count.value if not page_count.is_left() else 0,
+            "max_comments": max_comments.value if not max_comments.is_left() else 0,
             "error": None,
+            "attempts": get_attempts(response),
+        }
+
+    def _merge_comment_pages(self, topic_id: TopicID, pages: List[CommentResult]) -> CommentResult:
+        """Merge the results of fetching every comment page of a topic.
+
+        Args:
+            topic_id: The ID of the topic the comments belong to
+            pages: Results of `get_topic_comments` for pages 1..N, in page order
+
+        Returns:
+            A dictionary containing:
+                - data: Comments of all fetched pages, in page order
+                - page_count: Total number of comment pages
+                - max_comments: Total number of comments of the topic
+                - error: Error message listing the failed pages if any, None otherwise
+                - attempts: Number of attempts made for all pages
+        """
+        failed_pages = [page for page, result in enumerate(pages, start=1) if result["error"] is not None]
+        error_msg = None
+        if failed_pages:
+            error_msg = f"Failed to fetch comment pages {failed_pages} of topic {topic_id}"
+
+        return {
+            "data": [comment for result in pages for comment in result["data"]],
+            "page_count": pages[0]["page_count"],
+            "max_comments": pages[0]["max_comments"],
+            "error": error_msg,
+            "attempts": sum(result["attempts"] for result in pages),
         }
 
+    def _search_result(self, keyword: str, response: MaybeResponse) -> SearchResult:
+        """Extract topics and the topic count from a fetched search page.
+
+        Args:
+            keyword: The searched keyword/phrase
+            response: Result of the search request
+
+        Returns:
+            A dictionary containing:
+                - data: List of topic dictionaries with search results
+                - topic_ids: List of topic IDs from search results
+                - total_topics: Total number of topics matching the search
+                - error: Error message if any, None otherwise
+                - attempts: Number of attempts made for the request
+        """
+        # Convert response to JSON and extract data
+        response_json = response.bind(response_to_json)
+
+        # If JSON conversion failed, return error
+        if response_json.is_left():
+            error_msg = self._format_error("search for", f"'{keyword}'", response_json.error)
+            return {
+                "data": [],
+                "topic_ids": [],
+                "total_topics": 0,
+                "error": error_msg,
+                "attempts": get_attempts(response),
+            }
+
+        # Extract data from the JSON response
+        topic_data = response_json.bind(extract_search_results)
+        topic_ids = response_json.bind(extract_search_results).bind(extract_topic_ids)
+        num_topics = response_json.bind(count_total_topics)
+
+        # Build the result dictionary with proper error handling
+        return {
+            "data": topic_data.value if not topic_data.is_left() else [],
+            "topic_ids": topic_ids.value if not topic_ids.is_left() else [],
+            "total_topics": num_topics.value if not num_topics.is_left() else 0,
+            "error": None,
+            "attempts": get_attempts(response),
+        }
+
+
+class PantipScraper(BasePantipScraper):
+    """A high-level interface for scraping Pantip data.
+
+    This class provides methods to retrieve topic content, comments, and perform searches
+    with proper error handling and logging.
+
+    All methods return unwrapped values (not monads) for a simpler API:
+    - Successful calls return the actual data (string, list, etc.)
+    - Failed calls return appropriate identity values (empty string, empty list, etc.)
+    - Error details are logged but not exposed in return values
+
+    Attributes:
+        auth_token (str): Authentication token for Pantip API
+        user_agents (List[str]): List of user agent strings to rotate through
+        timeout (int): Timeout in seconds for HTTP requests
+        session (requests.Session): Pooled keep-alive session shared by all requests
+        rate_limiter (Optional[RateLimiter]): Rate limiter every request goes through
+        retry_policy (Optional[RetryPolicy]): Policy for retrying failed requests
+        cache (Optional[ResponseCache]): Cache of responses shared by all requests
+        parser (str): How topic pages are parsed: 'html.parser', 'lxml' or 'stream'
+
+    The scraper can be used as a context manager to close the pooled connections on exit.
+    """
+
+    def __init__(
+        self,
+        auth_token: str = AUTH_TOKEN,
+        user_agents: Optional[List[str]] = None,
+        timeout: int = TIMEOUT_SECONDS,
+        log_level: int = logging.INFO,
+        pool_size: int = POOL_SIZE,
+        keep_alive: bool = True,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        cache: Optional[ResponseCache] = None,
+        parser: str = 'html.parser',
+        session: Optional[requests.Session] = None,
+    ):
+        """Initialize the PantipScraper.
+
+        Args:
+            auth_token: Authentication token for Pantip API
+            user_agents: List of user agent strings to rotate through (uses defaults if None)
+            timeout: Timeout in seconds for HTTP requests
+            log_level: Logging level to use
+            pool_size: Maximum number of keep-alive connections per host
+            keep_alive: Whether to keep connections open between requests
+            rate_limiter: Rate limiter to share across requests (no limit if None)
+            retry_policy: Policy for retrying failed requests (no retries if None)
+            cache: Response cache to read from and write to (no caching if None)
+            parser: How topic pages are parsed: a BeautifulSoup tree builder ('html.parser' or 'lxml'),
+                    or 'stream' to extract the topic text without building a tree
+            session: Session to use instead of creating a pooled one
+        """
+        super().__init__(
+            auth_token=auth_token,
+            user_agents=user_agents,
+            timeout=timeout,
+            log_level=log_level,
+            rate_limiter=rate_limiter,
+            retry_policy=retry_policy,
+            cache=cache,
+            parser=parser,
+        )
+        self.session = (
+            session
+            if session is not None
+            else create_session(pool_connections=POOL_CONNECTIONS, pool_size=pool_size, keep_alive=keep_alive)
+        )
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the pooled connections held by the session."""
+        self.session.close()
+
+    def get_topic_detail(self, topic_id: TopicID) -> str:
+        """Fetch and extract the main content of a Pantip topic.
+
+        Args:
+            topic_id: The ID of the topic to fetch
+
+        Returns:
+            The topic content as a string, or an empty string on failure
+        """
+        logger.debug(f"Fetching topic {topic_id}")
+
+        return self._topic_detail_result(topic_id, self._fetch_topic(topic_id))
+
+    def fetch_topic_detail(self, topic_id: TopicID) -> MaybeStr:
+        """Fetch and extract the main content of a Pantip topic, telling failures from empty topics.
+
+        Args:
+            topic_id: The ID of the topic to fetch
+
+        Returns:
+            Either[str, str]: Right containing the topic content (possibly empty) on success,
+                              Left containing error message on failure
+        """
+        logger.debug(f"Fetching topic {topic_id}")
+
+        return self._parse_topic_detail(self._fetch_topic(topic_id))
+
+    def get_topics(
+        self,
+        topic_ids: Iterable[TopicID],
+        max_workers: int = MAX_WORKERS,
+        ordered: bool = False,
+        clean: bool = False,
+        pipeline: bool = False,
+        parse_workers: int = PARSE_WORKERS,
+    ) -> Iterator[Tuple[TopicID, MaybeStr]]:
+        """Fetch and extract the main content of many topics concurrently.
+
+        Topic IDs are consumed lazily and fetched on a pool of `max_workers` threads
+        sharing the scraper's pooled session.
+
+        In pipeline mode, the threads only fetch, and the raw bodies are handed to a pool of
+        `parse_workers` processes for parsing (and cleaning), so parsing is not held back by
+        the GIL while fetching continues. Both stages keep a bounded number of pages in flight
+        (`2 * max_workers` and `2 * parse_workers`), so memory stays flat however many topics are fetched.
+
+        Args:
+            topic_ids: The IDs of the topics to fetch
+            max_workers: Maximum number of topics fetched at the same time
+            ordered: If True, yield results in the order of `topic_ids`; otherwise as they finish
+            clean: If True, clean the topic content with `clean_pantip_text`
+            pipeline: If True, parse pages on a process pool instead of the fetching threads
+            parse_workers: Number of processes parsing pages in pipeline mode
+
+        Yields:
+            Tuples of the topic ID and an Either with the topic content on success,
+            or the error message on failure
+        """
+        if pipeline:
+            results = self._pipeline_topics(topic_ids, max_workers, ordered, parse_workers, clean)
+        else:
+            results = self._fetch_and_parse_topics(topic_ids, max_workers, ordered, clean)
+
+        with closing(results):
+            for topic_id, result in results:
+                if result.is_left():
+                    self._format_error("fetch topic", topic_id, result.error)
+                yield topic_id, result
+
+    def _fetch_and_parse_topics(
+        self, topic_ids: Iterable[TopicID], max_workers: int, ordered: bool, clean: bool
+    ) -> Iterator[Tuple[TopicID, MaybeStr]]:
+        """Fetch and parse topics on the same threads."""
+
+        def fetch_detail(topic_id: TopicID) -> MaybeStr:
+            logger.debug(f"Fetching topic {topic_id}")
+            result = self._parse_topic_detail(self._fetch_topic(topic_id))
+            return result.map(clean_pantip_text) if clean else result
+
+        return map_concurrently(fetch_detail, topic_ids, max_workers=max_workers, ordered=ordered)
+
+    def _pipeline_topics(
+        self, topic_ids: Iterable[TopicID], max_workers: int, ordered: bool, parse_workers: int, clean: bool
+    ) -> Iterator[Tuple[TopicID, MaybeStr]]:
+        """Fetch topics on threads and parse them on a process pool.
+
+        Parsed pages are yielded first in, first out, so the order of the fetching stage is kept.
+        Failed fetches skip the process pool.
+        """
+        max_in_flight = 2 * parse_workers
+        in_flight: deque[Tuple[TopicID, Future]] = deque()
+        parse = partial(parse_topic_body, parser=self.parser, clean=clean)
+        fetched = map_concurrently(self._fetch_topic, topic_ids, max_workers=max_workers, ordered=ordered)
+
+        # not forked: the fetching threads are already running and may hold locks
+        executor = ProcessPoolExecutor(max_workers=parse_workers, mp_context=multiprocessing.get_context('spawn'))
+        try:
+            for topic_id, response in fetched:
+                if response.is_left():
+                    failed: Future = Future()
+                    failed.set_result(response)
+                    in_flight.append((topic_id, failed))
+                else:
+                    page = response.value
+                    in_flight.append((topic_id, executor.submit(parse, page.url, page.content, page.encoding)))
+
+                if len(in_flight) >= max_in_flight:
+                    topic_id, future = in_flight.popleft()
+                    yield topic_id, future.result()
+
+            while in_flight:
+                topic_id, future = in_flight.popleft()
+                yield topic_id, future.result()
+        finally:
+            fetched.close()
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _fetch_topic(self, topic_id: TopicID) -> MaybeResponse:
+        """Fetch a topic page with the scraper's session and credentials.
+
+        Args:
+            topic_id: The ID of the topic to fetch
+
+        Returns:
+            Either[str, requests.Response]: Right containing response on success,
+                                           Left containing error message on failure
+        """
+        return fetch_topic(
+            topic_id=topic_id,
+            auth_token=self.auth_token,
+            user_agent=self._random_user_agent(),
+            session=self.session,
+            rate_limiter=self.rate_limiter,
+            retry_policy=self.retry_policy,
+            cache=self.cache,
+        )
+
+    def get_topic_comments(self, topic_id: TopicID, page: int = 1) -> CommentResult:
+        """Fetch comments for a Pantip topic.
+
+        Args:
+            topic_id: The ID of the topic to fetch comments for
+            page: The page number of comments to fetch (defaults to 1)
+
+        Returns:
+            A dictionary containing:
+                - data: List of comment dictionaries
+                - page_count: Total number of comment pages
+                - max_comments: Total number of comments of the topic
+                - error: Error message if any, None otherwise
+                - attempts: Number of attempts made for the request
+        """
+        logger.debug(f"Fetching comments for topic {topic_id}, page {page}")
+
+        # Get the comments
+        response = fetch_comments(
+            topic_id=topic_id,
+            page=page,
+            auth_token=self.auth_token,
+            user_agent=self._random_user_agent(),
+            session=self.session,
+            rate_limiter=self.rate_limiter,
+            retry_policy=self.retry_policy,
+            cache=self.cache,
+        )
+
+        return self._comments_result(topic_id, page, response)
+
+    def get_all_comments(self, topic_id: TopicID, max_workers: int = MAX_WORKERS) -> CommentResult:
+        """Fetch every comment page of a Pantip topic.
+
+        The first page is fetched to read the number of pages, then the remaining
+        pages are fetched concurrently and merged in page order.
+
+        Args:
+            topic_id: The ID of the topic to fetch comments for
+            max_workers: Maximum number of pages fetched at the same time
+
+        Returns:
+            A dictionary containing:
+                - data: List of comment dictionaries from all pages
+                - page_count: Total number of comment pages
+                - max_comments: Total number of comments of the topic
+                - error: Error message if any page failed, None otherwise
+                - attempts: Number of attempts made for all pages
+        """
+        first_page = self.get_topic_comments(topic_id, page=1)
+        if first_page["error"] is not None:
+            return first_page
+
+        remaining_pages = range(2, first_page["page_count"] + 1)
+        other_pages = map_concurrently(
+            lambda page: self.get_topic_comments(topic_id, page=page),
+            remaining_pages,
+            max_workers=max_workers,
+            ordered=True,
+        )
+        return self._merge_comment_pages(topic_id, [first_page] + [result for _, result in other_pages])
+
     def search(
         self,
         keyword: str,
@@ -191,6 +611,7 @@ class PantipScraper:
                 - topic_ids: List of topic IDs from search results
                 - total_topics: Total number of topics matching the search
                 - error: Error message if any, None otherwise
+                - attempts: Number of attempts made for the request
         """
         logger.debug(f"Searching for '{keyword}' in rooms {rooms or 'all'}, page {page}")
 
@@ -202,30 +623,87 @@ class PantipScraper:
             auth_token=self.auth_token,
             user_agent=self._random_user_agent(),
             sort_by_time=sort_by_time,
+            session=self.session,
+            rate_limiter=self.rate_limiter,
+            retry_policy=self.retry_policy,
+            cache=self.cache,
         )
 
-        # Convert response to JSON and extract data
-        response_json = response.bind(response_to_json)
+        return self._search_result(keyword, response)
 
-        # If JSON conversion failed, return error
-        if response_json.is_left():
-            error_msg = self._format_error("search for", f"'{keyword}'", response_json.error)
-            return {
-                "data": [],
-                "topic_ids": [],
-                "total_topics": 0,
-                "error": error_msg,
-            }
+    def iter_search(
+        self,
+        keyword: str,
+        rooms: Optional[List[str]] = None,
+        sort_by_time: bool = False,
+        max_pages: Optional[int] = None,
+        prefetch: int = 2,
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream the topics of every search result page.
 
-        # Extract data from the JSON response
-        topic_data = response_json.bind(extract_search_results)
-        topic_ids = response_json.bind(extract_search_results).bind(extract_topic_ids)
-        num_topics = response_json.bind(count_total_topics)
+        The first page is fetched to work out the number of pages, then the following
+        `prefetch` pages are fetched in the background while the topics of each page,
+        the first one included, are being consumed. With `prefetch=0`, each page is only
+        fetched once the previous one is consumed.
 
-        # Build the result dictionary with proper error handling
-        return {
-            "data": topic_data.value if not topic_data.is_left() else [],
-            "topic_ids": topic_ids.value if not topic_ids.is_left() else [],
-            "total_topics": num_topics.value if not num_topics.is_left() else 0,
-            "error": None,
-        }
+        Args:
+            keyword: The search keyword/phrase
+            rooms: List of room IDs to search within (None searches all rooms)
+            sort_by_time: If True, sort results by time; otherwise by relevance
+            max_pages: Maximum number of result pages to fetch (None fetches all pages)
+            prefetch: Number of pages fetched ahead of the one being consumed (0 fetches sequentially)
+
+        Yields:
+            Topic dictionaries from the search results, in page order
+
+        Raises:
+            ValueError: If `prefetch` is negative
+        """
+        if prefetch < 0:
+            raise ValueError("prefetch must be at least 0")
+        if max_pages is not None and max_pages < 1:
+            return
+
+        def search_page(page: int) -> SearchResult:
+            return self.search(keyword, rooms=rooms, page=page, sort_by_time=sort_by_time)
+
+        first_page = search_page(1)
+        num_pages = math.ceil(first_page["total_topics"] / TOPICS_PER_PAGE)
+        if max_pages is not None:
+            num_pages = min(num_pages, max_pages)
+
+        pages = iter(range(2, num_pages + 1))
+        in_flight: deque[Tuple[int, Future]] = deque()
+        executor = ThreadPoolExecutor(max_workers=prefetch) if prefetch > 0 else None
+
+        def fetch_ahead() -> None:
+            while executor is not None and len(in_flight) < prefetch:
+                page = next(pages, None)
+                if page is None:
+                    return
+                in_flight.append((page, executor.submit(search_page, page)))
+
+        try:
+            # started before the first page is consumed, so that no page waits for its fetch to start
+            fetch_ahead()
+            yield from first_page["data"]
+
+            while True:
+                if in_flight:
+                    page, future = in_flight.popleft()
+                    result = future.result()
+                else:
+                    page = next(pages, None)
+                    if page is None:
+                        break
+                    result = search_page(page)
+                fetch_ahead()
+
+                # "more than X topics" counts can overshoot the real number of pages
+                if result["error"] is None and not result["data"]:
+                    logger.debug(f"Search for '{keyword}' has no results after page {page - 1}")
+                    break
+                yield from result["data"]
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
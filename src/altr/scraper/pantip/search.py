@@ -8,9 +8,13 @@ import re
 import requests
 from typing import Optional, List
 
+from altr.monad import partition_eithers
 from altr.monad.extended_pymonad import Left, Right, Either
-from .config import SEARCH_API, AUTH_TOKEN, TIMEOUT_SECONDS
-from .utils import get_random_user_agent, response_to_json, extract_json_key, MaybeJSON
+from .config import SEARCH_API, AUTH_TOKEN
+from .cache import ResponseCache
+from .rate_limit import RateLimiter
+from .retry import RetryPolicy
+from .utils import get_random_user_agent, send_request, response_to_json, extract_json_key, MaybeJSON
 
 # Type aliases
 MaybeResponse = Either[str, requests.Response]
@@ -25,6 +29,10 @@ def search_topics(
     auth_token: str = AUTH_TOKEN,
     user_agent: Optional[str] = None,
     sort_by_time: bool = False,
+    session: Optional[requests.Session] = None,
+    rate_limiter: Optional[RateLimiter] = None,
+    retry_policy: Optional[RetryPolicy] = None,
+    cache: Optional[ResponseCache] = None,
 ) -> MaybeResponse:
     """Search for topics on Pantip based on keyword and filters.
 
@@ -36,6 +44,11 @@ def search_topics(
         user_agent: User agent string to use for the request
                    (will use random one if None)
         sort_by_time: Whether to sort results by time (True) or relevance (False)
+        session: Session to send the request with, allowing connection reuse
+                 (will use a one-off connection if None)
+        rate_limiter: Rate limiter shared with other requests (no limit if None)
+        retry_policy: Policy for retrying failed requests (no retries if None)
+        cache: Response cache to read from and write to (no caching if None)
 
     Returns:
         Either[str, requests.Response]: Right containing response on success,
@@ -50,11 +63,30 @@ def search_topics(
     headers = {'ptauthorize': auth_token, 'User-Agent': user_agent}
     request_json = {"keyword": keyword, "page": page, 'rooms': rooms, 'timebias': sort_by_time}
 
-    try:
-        response = requests.post(SEARCH_API, headers=headers, json=request_json, timeout=TIMEOUT_SECONDS)
-    except Exception as e:
-        return Left(f"{e.__class__.__name__}: {e}")
+    response = send_request(
+        'POST',
+        SEARCH_API,
+        session=session,
+        rate_limiter=rate_limiter,
+        retry_policy=retry_policy,
+        cache=cache,
+        cache_if=is_valid_search_response,
+        headers=headers,
+        json=request_json,
+    )
+    return response.bind(check_search_response)
+
 
+def check_search_response(response: requests.Response) -> MaybeResponse:
+    """Check that a search response is valid JSON and not a server-side error.
+
+    Args:
+        response: HTTP response object from the search API
+
+    Returns:
+        Either[str, requests.Response]: Right containing the response if it is valid,
+                                       Left containing error message if not
+    """
     # Check if the response is valid JSON
     maybe_response_json = response_to_json(response)
     if maybe_response_json.is_left():
@@ -68,6 +100,18 @@ def search_topics(
     return Right(response)
 
 
+def is_valid_search_response(response: requests.Response) -> bool:
+    """Check whether a search response can be cached, i.e. is not an error such as an expired token.
+
+    Args:
+        response: HTTP response object from the search API
+
+    Returns:
+        bool: True if `check_search_response` accepts the response
+    """
+    return check_search_response(response).is_right()
+
+
 def count_total_topics(response_data: dict) -> MaybeInt:
     """Count the total number of topics found in search results.
 
@@ -130,13 +174,9 @@ def extract_topic_ids(topics: List[dict]) -> MaybeStrList:
     if not topics:
         return Right([])  # Empty list is valid
 
-    ids = []
-    for topic in topics:
-        maybe_id = extract_json_key(topic, 'id')
-        if maybe_id.is_right():
-            ids.append(maybe_id.value)
+    ids, _ = partition_eithers(extract_json_key(topic, 'id') for topic in topics)
 
-    if not ids and topics:
+    if not ids:
         return Left("Could not extract any IDs from topics")
 
     return Right(ids)
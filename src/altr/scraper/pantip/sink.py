@@ -0,0 +1,408 @@
+"""
+Output sink for Pantip scraper.
+
+This module streams scraped records to disk as they arrive, in JSONL or Parquet shards
+of bounded size, so that a crawl does not hold the whole corpus in memory.
+
+Records are flattened: nested objects become `parent_child` columns and lists are
+stored as JSON strings. Writing Parquet needs the optional `pyarrow` dependency
+(`pip install 'altr[parquet]'`).
+"""
+
+import json
+import re
+from abc import ABC, abstractmethod
+from functools import partial
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Self, Union
+
+from .config import SHARD_SIZE, ROW_GROUP_SIZE
+
+# Type aliases for better readability
+Record = Dict[str, Any]
+
+# Columns of the topic records, whose Parquet schema is fixed
+TOPIC_COLUMNS = [('topic_id', 'string'), ('content', 'string')]
+
+
+def flatten_record(record: Record, parent_key: str = '', sep: str = '_') -> Record:
+    """Flatten a nested JSON record into a single level of columns.
+
+    Args:
+        record: The record to flatten, e.g. a comment from `extract_comments`
+        parent_key: Prefix of the column names
+        sep: Separator between the names of nested keys
+
+    Returns:
+        A dictionary of scalar values, with lists encoded as JSON strings
+    """
+    flat = {}
+    for key, value in record.items():
+        name = f"{parent_key}{sep}{key}" if parent_key else key
+        if isinstance(value, dict):
+            flat.update(flatten_record(value, name, sep))
+        elif isinstance(value, list):
+            flat[name] = json.dumps(value, ensure_ascii=False)
+        else:
+            flat[name] = value
+    return flat
+
+
+class ShardWriter(ABC):
+    """Write records to numbered shards of at most `max_records` records.
+
+    Shards are named `{prefix}-{number:05d}{extension}`. When appending to a directory that
+    already holds shards, numbering continues after the last one.
+
+    Attributes:
+        directory (Path): Directory holding the shards
+        prefix (str): Prefix of the shard file names
+        max_records (int): Maximum number of records per shard
+        records_written (int): Number of records written by this writer
+        shards (List[Path]): Shards written by this writer
+    """
+
+    extension = ''
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        prefix: str = 'part',
+        max_records: int = SHARD_SIZE,
+        append: bool = True,
+    ):
+        """Initialize the ShardWriter, creating the directory if needed.
+
+        Args:
+            directory: Directory holding the shards
+            prefix: Prefix of the shard file names
+            max_records: Maximum number of records per shard
+            append: If False, refuse to write to a directory that already holds shards
+        """
+        if max_records < 1:
+            raise ValueError("max_records must be at least 1")
+
+        self.directory = Path(directory)
+        self.prefix = prefix
+        self.max_records = max_records
+        self.records_written = 0
+        self.shards: List[Path] = []
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        shard_pattern = re.compile(rf"{re.escape(prefix)}-(\d+){re.escape(self.extension)}")
+        existing = [int(match[1]) for path in self.directory.iterdir() if (match := shard_pattern.fullmatch(path.name))]
+        if existing and not append:
+            raise FileExistsError(f"{self.directory} already holds {prefix} shards")
+
+        self._next_shard = max(existing, default=-1) + 1
+        self._records_in_shard = 0
+        self._is_open = False
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def write(self, record: Record) -> None:
+        """Write a record, starting a new shard when the current one is full.
+
+        Args:
+            record: A flat record
+        """
+        self._append(record)
+        self.flush()
+
+    def write_many(self, records: Iterable[Record]) -> None:
+        """Write every record of an iterable.
+
+        Args:
+            records: Flat records
+        """
+        for record in records:
+            self._append(record)
+        self.flush()
+
+    def flush(self) -> None:
+        """Push the records written so far to the current shard, where the format allows it."""
+        if self._is_open:
+            self._flush()
+
+    def close(self) -> None:
+        """Finish the current shard."""
+        if self._is_open:
+            self._close_shard()
+            self._is_open = False
+
+    def _append(self, record: Record) -> None:
+        if self._is_open and self._records_in_shard >= self.max_records:
+            self._close_shard()
+            self._is_open = False
+
+        if not self._is_open:
+            path = self.directory / f"{self.prefix}-{self._next_shard:05d}{self.extension}"
+            self._open_shard(path)
+            self.shards.append(path)
+            self._next_shard += 1
+            self._records_in_shard = 0
+            self._is_open = True
+
+        self._write(record)
+        self._records_in_shard += 1
+        self.records_written += 1
+
+    def _flush(self) -> None:
+        """Push the buffered records of the current shard to its file (nothing by default)."""
+
+    @abstractmethod
+    def _open_shard(self, path: Path) -> None:
+        """Start a shard at `path`."""
+
+    @abstractmethod
+    def _write(self, record: Record) -> None:
+        """Write a record to the current shard."""
+
+    @abstractmethod
+    def _close_shard(self) -> None:
+        """Finish the current shard."""
+
+
+class JsonlShardWriter(ShardWriter):
+    """Write records as JSON lines, flushed to the file at the end of each `write` and `write_many`."""
+
+    extension = '.jsonl'
+
+    def _open_shard(self, path: Path) -> None:
+        self._file = path.open('w', encoding='utf-8')
+
+    def _write(self, record: Record) -> None:
+        self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    def _flush(self) -> None:
+        self._file.flush()
+
+    def _close_shard(self) -> None:
+        self._file.close()
+
+
+class ParquetShardWriter(ShardWriter):
+    """Write records to Parquet shards in row groups of `row_group_size` records.
+
+    With a fixed `schema`, records holding a column that is not in the schema raise a
+    ValueError, and values that do not fit the type of their column raise an Arrow error.
+    Otherwise the schema is inferred and widened as records arrive: columns first seen in a
+    later row group are added, null columns take the type of their first values, and
+    integer columns holding floats become floating point. Columns missing from a record are
+    written as nulls. Columns whose values cannot share a type raise a TypeError.
+
+    A shard is written under a temporary name and renamed once it is complete, so `flush`
+    has no effect: records reach the shard with their row group. When the
+    schema is widened, the row groups already in the current shard are rewritten with it;
+    shards completed earlier keep the schema they were written with.
+
+    Attributes:
+        row_group_size (int): Number of records buffered before a row group is written
+        schema (Optional[pyarrow.Schema]): Schema of the shards
+    """
+
+    extension = '.parquet'
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        prefix: str = 'part',
+        max_records: int = SHARD_SIZE,
+        append: bool = True,
+        row_group_size: int = ROW_GROUP_SIZE,
+        schema: Optional[Any] = None,
+    ):
+        """Initialize the ParquetShardWriter.
+
+        Args:
+            directory: Directory holding the shards
+            prefix: Prefix of the shard file names
+            max_records: Maximum number of records per shard
+            append: If False, refuse to write to a directory that already holds shards
+            row_group_size: Number of records buffered before a row group is written
+            schema: Fixed pyarrow schema of the shards, or `(name, type)` pairs of its columns
+                (inferred and widened as records arrive if None)
+        """
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as error:
+            raise ImportError("Writing Parquet needs pyarrow: pip install 'altr[parquet]'") from error
+
+        super().__init__(directory, prefix=prefix, max_records=max_records, append=append)
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+        self.row_group_size = row_group_size
+        self.schema = (
+            pyarrow.schema(schema) if schema is not None and not isinstance(schema, pyarrow.Schema) else schema
+        )
+        self._fixed_schema = schema is not None
+        self._rows: List[Record] = []
+
+    def _open_shard(self, path: Path) -> None:
+        self._path = path
+        self._writer = None
+
+    def _write(self, record: Record) -> None:
+        self._rows.append(record)
+        if len(self._rows) >= self.row_group_size:
+            self._write_row_group()
+
+    def _write_row_group(self) -> None:
+        if not self._rows:
+            return
+        table = self._infer_table(self._rows)
+        self._rows = []
+
+        if self._fixed_schema:
+            unknown = [name for name in table.column_names if self.schema.get_field_index(name) == -1]
+            if unknown:
+                raise ValueError(f"Columns {unknown} are not in the schema of {self.directory}")
+        elif self.schema is None:
+            self.schema = table.schema
+        else:
+            try:
+                schema = self._pa.unify_schemas([self.schema, table.schema], promote_options='permissive')
+            except (self._pa.ArrowInvalid, self._pa.ArrowTypeError) as error:
+                raise TypeError(f"Records of {self.directory} do not fit one schema: {error}") from error
+            if not schema.equals(self.schema):
+                self.schema = schema
+                self._rewrite_shard()
+
+        if self._writer is None:
+            self._writer = self._pq.ParquetWriter(self._temporary_path(), self.schema)
+        self._writer.write_table(self._conform(table))
+
+    def _infer_table(self, rows: List[Record]) -> Any:
+        # every column of every row, not only those of the first row as in `Table.from_pylist`
+        names = list(dict.fromkeys(name for row in rows for name in row))
+        columns = []
+        for name in names:
+            try:
+                columns.append(self._pa.array([row.get(name) for row in rows]))
+            except (self._pa.ArrowInvalid, self._pa.ArrowTypeError) as error:
+                raise TypeError(f"Column '{name}' of {self.directory} holds values of several types") from error
+        return self._pa.table(columns, names=names)
+
+    def _conform(self, table: Any) -> Any:
+        """Cast a table to the schema, adding its missing columns as nulls"""
+        columns = [
+            table[field.name].cast(field.type)
+            if field.name in table.column_names
+            else self._pa.nulls(len(table), field.type)
+            for field in self.schema
+        ]
+        return self._pa.table(columns, schema=self.schema)
+
+    def _rewrite_shard(self) -> None:
+        if self._writer is None:
+            return
+        self._writer.close()
+        with self._pq.ParquetFile(self._temporary_path()) as file:
+            row_groups = [file.read_row_group(index) for index in range(file.num_row_groups)]
+        self._writer = self._pq.ParquetWriter(self._temporary_path(), self.schema)
+        for row_group in row_groups:
+            self._writer.write_table(self._conform(row_group))
+
+    def _close_shard(self) -> None:
+        self._write_row_group()
+        if self._writer is not None:
+            self._writer.close()
+            self._temporary_path().rename(self._path)
+
+    def _temporary_path(self) -> Path:
+        return self._path.with_name(self._path.name + '.tmp')
+
+
+# Shard writers by output format
+WRITERS = {'jsonl': JsonlShardWriter, 'parquet': ParquetShardWriter}
+
+
+class PantipSink:
+    """Stream search results, topic texts and comments to shards in one output directory.
+
+    Each kind of record goes to its own subdirectory (`search`, `topics` and `comments`):
+        - search: flattened topic dictionaries from the search results
+        - topics: `topic_id` and `content` of each topic
+        - comments: `topic_id` and the flattened comment dictionary
+
+    In Parquet, the topics have a fixed schema of two string columns, while the schemas of the
+    search results and comments, which follow the Pantip API, are inferred and widened as
+    records arrive (see `ParquetShardWriter`).
+
+    Attributes:
+        directory (Path): Output directory
+        format (str): Output format, 'jsonl' or 'parquet'
+        search (ShardWriter): Writer of the search results
+        topics (ShardWriter): Writer of the topic texts
+        comments (ShardWriter): Writer of the comments
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        format: str = 'jsonl',
+        max_records: int = SHARD_SIZE,
+        append: bool = True,
+        prefix: str = 'part',
+    ):
+        """Initialize the PantipSink.
+
+        Args:
+            directory: Output directory
+            format: Output format, 'jsonl' or 'parquet'
+            max_records: Maximum number of records per shard
+            append: If False, refuse to write to an output directory that already holds shards
+            prefix: Prefix of the shard file names, unique per process when several write to the same directory
+        """
+        if format not in WRITERS:
+            raise ValueError(f"Unknown output format '{format}', expected one of {sorted(WRITERS)}")
+
+        self.directory = Path(directory)
+        self.format = format
+        writer = partial(WRITERS[format], prefix=prefix, max_records=max_records, append=append)
+        self.search = writer(self.directory / 'search')
+        self.topics = writer(self.directory / 'topics', **({'schema': TOPIC_COLUMNS} if format == 'parquet' else {}))
+        self.comments = writer(self.directory / 'comments')
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def write_search_results(self, topics: Iterable[Record]) -> None:
+        """Write topics from the search results.
+
+        Args:
+            topics: Topic dictionaries, as in the `data` of `PantipScraper.search`
+        """
+        self.search.write_many(flatten_record(topic) for topic in topics)
+
+    def write_topic(self, topic_id: Union[str, int], content: str) -> None:
+        """Write the text of a topic.
+
+        Args:
+            topic_id: The ID of the topic
+            content: The topic content
+        """
+        self.topics.write({"topic_id": str(topic_id), "content": content})
+
+    def write_comments(self, topic_id: Union[str, int], comments: Iterable[Record]) -> None:
+        """Write comments of a topic.
+
+        Args:
+            topic_id: The ID of the topic the comments belong to
+            comments: Comment dictionaries, as returned by `extract_comments`
+        """
+        self.comments.write_many({"topic_id": str(topic_id), **flatten_record(comment)} for comment in comments)
+
+    def close(self) -> None:
+        """Finish the current shards."""
+        self.search.close()
+        self.topics.close()
+        self.comments.close()
@@ -1,6 +1,15 @@
 import re
 import html
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from html.parser import HTMLParser
+from typing import Iterable, Optional, Union
+
+import pandas as pd
 from bs4 import BeautifulSoup
+from bs4.builder import HTMLTreeBuilder
+from bs4.dammit import EntitySubstitution, UnicodeDammit
 
 PANTIP_SPOIL_PATTERN = re.compile(r"\[Spoil\] คลิกเพื่อดูข้อความที่ซ่อนไว้")
 EDIT_TEXT_PATTERN = re.compile(r"แก้ไขข้อความเมื่อ")
@@ -43,3 +52,188 @@ def clean_pantip_text(text: str, remove_punctuations: bool = True, base_clean_fu
     if base_clean_func:
         text = base_clean_func(text, remove_punctuations=remove_punctuations)
     return text
+
+
+# All Pantip markers removed by `clean_pantip_text`, matched in a single pass
+PANTIP_MARKER_PATTERN = re.compile(
+    "|".join(pattern.pattern for pattern in [PANTIP_SPOIL_PATTERN, EDIT_TEXT_PATTERN, *PANTIP_SPACE_PATTERN])
+)
+
+# Tag handling of BeautifulSoup's "html.parser" builder, mirrored by `_TextExtractor`
+ASCII_SPACES = "\x20\x0a\x09\x0c\x0d"
+EMPTY_ELEMENT_TAGS = HTMLTreeBuilder.DEFAULT_EMPTY_ELEMENT_TAGS
+PRESERVE_WHITESPACE_TAGS = HTMLTreeBuilder.DEFAULT_PRESERVE_WHITESPACE_TAGS
+HIDDEN_TEXT_TAGS = frozenset(HTMLTreeBuilder.DEFAULT_STRING_CONTAINERS)
+DECIMAL_REFERENCE_PATTERN = re.compile("^([0-9]+)(.*)")
+HEX_REFERENCE_PATTERN = re.compile("^([0-9a-f]+)(.*)")
+
+
+def replace_pantip_markers(text: str) -> str:
+    """Remove the spoil, edit and space markers like the three `replace_*` steps of `clean_pantip_text`.
+
+    The markers cannot overlap each other, so one pass gives the same result unless removing
+    a marker joins the pieces of another one; those rare texts take the step-by-step path.
+    """
+    cleaned = PANTIP_MARKER_PATTERN.sub("", text)
+    if PANTIP_MARKER_PATTERN.search(cleaned):
+        return replace_pantip_spaces(replace_edit_text(replace_spoil_component(text)))
+    return cleaned
+
+
+class _TextExtractor(HTMLParser):
+    """Collect the text `BeautifulSoup(text, "html.parser").get_text()` returns, without building a tree.
+
+    Strings are split, whitespace-collapsed and hidden (inside script, style, template, rt and rp)
+    the way BeautifulSoup does it, and entities are resolved with the same tables.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.texts = []
+        self._data = []
+        self._open_tags = []
+        self._closed_empty_tags = []
+        self._hidden = 0
+        self._preserved = 0
+
+    def _flush(self, keep: Optional[bool] = None) -> None:
+        if not self._data:
+            return
+        data = "".join(self._data)
+        self._data = []
+        if not self._preserved and not data.strip(ASCII_SPACES):
+            data = "\n" if "\n" in data else " "
+        if keep or (keep is None and not self._hidden):
+            self.texts.append(data)
+
+    def _push(self, tag: str) -> None:
+        self._open_tags.append(tag)
+        self._hidden += tag in HIDDEN_TEXT_TAGS
+        self._preserved += tag in PRESERVE_WHITESPACE_TAGS
+
+    def _pop_to(self, tag: str) -> None:
+        self._flush()
+        if tag not in self._open_tags:
+            return
+        while True:
+            popped = self._open_tags.pop()
+            self._hidden -= popped in HIDDEN_TEXT_TAGS
+            self._preserved -= popped in PRESERVE_WHITESPACE_TAGS
+            if popped == tag:
+                return
+
+    def handle_starttag(self, tag, attrs, handle_empty_element=True):
+        self._flush()
+        self._push(tag)
+        if handle_empty_element and tag in EMPTY_ELEMENT_TAGS:
+            self._pop_to(tag)
+            self._closed_empty_tags.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs, handle_empty_element=False)
+        self._pop_to(tag)
+
+    def handle_endtag(self, tag):
+        if tag in self._closed_empty_tags:
+            self._closed_empty_tags.remove(tag)
+        else:
+            self._pop_to(tag)
+
+    def handle_data(self, data):
+        self._data.append(data)
+
+    def handle_charref(self, name):
+        digits, base, pattern = name, 10, DECIMAL_REFERENCE_PATTERN
+        if name.startswith(("x", "X")):
+            digits, base, pattern = name[1:], 16, HEX_REFERENCE_PATTERN
+
+        extra = ""
+        try:
+            number = int(digits, base)
+        except ValueError:
+            match = pattern.search(digits)
+            number, extra = (int(match[1], base), match[2]) if match else (None, digits)
+
+        if number is not None:
+            self._data.append(UnicodeDammit.numeric_character_reference(number)[0])
+        self._data.append(extra)
+
+    def handle_entityref(self, name):
+        self._data.append(EntitySubstitution.HTML_ENTITY_TO_CHARACTER.get(name, f"&{name}"))
+
+    def handle_comment(self, data):
+        self._flush()
+
+    def handle_decl(self, decl):
+        self._flush()
+
+    def handle_pi(self, data):
+        self._flush()
+
+    def unknown_decl(self, data):
+        self._flush()
+        if data.upper().startswith("CDATA["):
+            self._data.append(data[len("CDATA[") :])
+            self._flush(keep=True)
+
+    def get_text(self, text: str) -> str:
+        self.feed(text)
+        self.close()
+        self._flush()
+        return "".join(self.texts)
+
+
+def strip_html_tags(text: str) -> str:
+    """A lightweight `remove_html_tags` that skips BeautifulSoup's tree building."""
+    if "<" not in text and "&" not in text:
+        if text.strip(ASCII_SPACES) or not text:
+            return text
+        return "\n" if "\n" in text else " "
+    return _TextExtractor().get_text(text)
+
+
+def _clean_text(text: str, remove_punctuations: bool = True, base_clean_func=None) -> str:
+    text = replace_pantip_markers(text)
+    text = unescape_html(text)
+    text = strip_html_tags(text)
+    text = remove_leading_trailing_spaces(text)
+    if base_clean_func:
+        text = base_clean_func(text, remove_punctuations=remove_punctuations)
+    return text
+
+
+def clean_pantip_texts(
+    texts: Union[Iterable[str], pd.Series],
+    remove_punctuations: bool = True,
+    base_clean_func=None,
+    processes: Optional[int] = None,
+    chunksize: int = 1000,
+) -> Union[list[str], pd.Series]:
+    """Clean many Pantip texts at once.
+
+    The result is identical to calling `clean_pantip_text` on every text, but the markers are removed
+    with one precompiled pattern and the HTML is stripped without building a BeautifulSoup tree.
+
+    Args:
+        texts: A list (or any iterable) of texts, or a pandas Series
+        remove_punctuations: Passed to `base_clean_func`
+        base_clean_func: Optional extra cleaning function applied to every text
+        processes: Number of worker processes for large inputs (None or 1 cleans in this process);
+            `base_clean_func` must then be picklable
+        chunksize: Number of texts sent to a worker at a time; inputs no larger than this are cleaned in this process
+
+    Returns:
+        The cleaned texts, as a pandas Series with the same index and name if `texts` is a Series, otherwise a list
+    """
+    values = texts.tolist() if isinstance(texts, pd.Series) else list(texts)
+    clean = partial(_clean_text, remove_punctuations=remove_punctuations, base_clean_func=base_clean_func)
+
+    if processes is None or processes <= 1 or len(values) <= chunksize:
+        cleaned = list(map(clean, values))
+    else:
+        with ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context('spawn')) as executor:
+            cleaned = list(executor.map(clean, values, chunksize=chunksize))
+
+    if isinstance(texts, pd.Series):
+        return pd.Series(cleaned, index=texts.index, name=texts.name, dtype=texts.dtype)
+    return cleaned
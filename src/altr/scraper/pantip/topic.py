@@ -4,22 +4,49 @@ Pantip topic scraper module.
 This module handles fetching and processing topic content from Pantip forums.
 """
 
+import re
 import requests
-from typing import Union, Optional
+from functools import partial
+from html.parser import HTMLParser
+from typing import Final, Union, Optional
 from bs4 import BeautifulSoup, Tag
 
 from altr.monad.extended_pymonad import Left, Right, Either
-from .config import TOPIC_BASE_URL, AUTH_TOKEN, TIMEOUT_SECONDS
-from .utils import get_random_user_agent
+from .config import TOPIC_BASE_URL, AUTH_TOKEN
+from .cache import ResponseCache
+from .rate_limit import RateLimiter
+from .retry import RetryPolicy
+from .utils import get_random_user_agent, send_request, check_status_code, response_to_soup
 
 # Type aliases
 MaybeResponse = Either[str, requests.Response]
 MaybeTag = Either[str, Tag]
 MaybeStr = Either[str, str]
 
+# Parser name selecting `stream_topic_text` instead of a BeautifulSoup tree builder
+STREAM_PARSER: Final[str] = 'stream'
+
+# Class of the main post written by the topic creator, and of its text
+TOPIC_CONTENT_CLASS: Final[str] = "display-post-wrapper main-post type"
+TOPIC_TEXT_CLASS: Final[str] = "display-post-story"
+
+# Tags without an end tag, and tags whose strings are not part of `Tag.text`
+VOID_TAGS: Final[frozenset[str]] = frozenset(
+    {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'param', 'source', 'track', 'wbr'}
+)
+NON_TEXT_TAGS: Final[frozenset[str]] = frozenset({'script', 'style', 'template'})
+
+TOPIC_CONTENT_START_PATTERN = re.compile(r'<\w+[^<>]*class\s*=\s*["\']?' + re.escape(TOPIC_CONTENT_CLASS))
+
 
 def fetch_topic(
-    topic_id: Union[int, str], auth_token: str = AUTH_TOKEN, user_agent: Optional[str] = None
+    topic_id: Union[int, str],
+    auth_token: str = AUTH_TOKEN,
+    user_agent: Optional[str] = None,
+    session: Optional[requests.Session] = None,
+    rate_limiter: Optional[RateLimiter] = None,
+    retry_policy: Optional[RetryPolicy] = None,
+    cache: Optional[ResponseCache] = None,
 ) -> MaybeResponse:
     """Fetch a topic page from Pantip.
 
@@ -28,6 +55,11 @@ def fetch_topic(
         auth_token: Authorization token for Pantip API
         user_agent: User agent string to use for the request
                    (will use random one if None)
+        session: Session to send the request with, allowing connection reuse
+                 (will use a one-off connection if None)
+        rate_limiter: Rate limiter shared with other requests (no limit if None)
+        retry_policy: Policy for retrying failed requests (no retries if None)
+        cache: Response cache to read from and write to (no caching if None)
 
     Returns:
         Either[str, requests.Response]: Right containing response on success,
@@ -40,15 +72,16 @@ def fetch_topic(
     topic_url = f"{TOPIC_BASE_URL.rstrip('/')}/{topic_id}"
     headers = {'ptauthorize': auth_token, 'User-Agent': user_agent}
 
-    try:
-        response = requests.get(topic_url, headers=headers, timeout=TIMEOUT_SECONDS)
-    except Exception as e:
-        return Left(f"{e.__class__.__name__}: {e}")
-
-    if response.status_code != 200:
-        return Left(f"Response code is not 200 (got {response.status_code})")
-
-    return Right(response)
+    response = send_request(
+        'GET',
+        topic_url,
+        session=session,
+        rate_limiter=rate_limiter,
+        retry_policy=retry_policy,
+        cache=cache,
+        headers=headers,
+    )
+    return response.bind(check_status_code)
 
 
 def extract_topic_content(soup: BeautifulSoup) -> MaybeTag:
@@ -63,7 +96,7 @@ def extract_topic_content(soup: BeautifulSoup) -> MaybeTag:
     """
     # topic content is the detail section of the topic
     # the first main post written by the topic creator
-    topic_content = soup.find(attrs={'class': "display-post-wrapper main-post type"})
+    topic_content = soup.find(attrs={'class': TOPIC_CONTENT_CLASS})
     if topic_content is None:
         return Left("Cannot find topic content section")
     # Ensure the found content is a Tag element (BeautifulSoup object)
@@ -83,9 +116,128 @@ def extract_topic_text(soup: BeautifulSoup) -> MaybeStr:
                          Left containing error message on failure
     """
     try:
-        content_section = soup.find(attrs={'class': "display-post-story"})
+        content_section = soup.find(attrs={'class': TOPIC_TEXT_CLASS})
         if content_section is None:
             return Left("Cannot find content section in topic")
         return Right(content_section.text)
     except Exception as e:
         return Left(f"{e.__class__.__name__}: {e}")
+
+
+class _TopicTextParser(HTMLParser):
+    """Collect the text of the topic story, and stop as soon as the story element is closed.
+
+    Mirrors `extract_topic_content` followed by `extract_topic_text` on an `html.parser` tree:
+    unmatched end tags are ignored, and an end tag closes every element opened after its start tag.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.found_content = False
+        self.found_text = False
+        self.done = False
+        self.parts: list[str] = []
+        # open elements inside the topic content section, starting with the section itself
+        self._stack: list[str] = []
+        self._text_depth: Optional[int] = None
+        self._skip_depth: Optional[int] = None
+
+    def handle_starttag(self, tag, attrs):
+        if self.done or tag in VOID_TAGS:
+            return
+        classes = ' '.join((dict(attrs).get('class') or '').split())
+
+        if not self._stack:
+            if classes == TOPIC_CONTENT_CLASS:
+                self.found_content = True
+                self._stack.append(tag)
+            return
+
+        self._stack.append(tag)
+        if self._text_depth is None:
+            if classes == TOPIC_TEXT_CLASS or TOPIC_TEXT_CLASS in classes.split(' '):
+                self.found_text = True
+                self._text_depth = len(self._stack)
+        elif self._skip_depth is None and tag in NON_TEXT_TAGS:
+            self._skip_depth = len(self._stack)
+
+    def handle_endtag(self, tag):
+        if self.done or tag not in self._stack:
+            return
+        depth = len(self._stack) - self._stack[::-1].index(tag) - 1
+        del self._stack[depth:]
+
+        if self._skip_depth is not None and depth < self._skip_depth:
+            self._skip_depth = None
+        if self._text_depth is not None and depth < self._text_depth:
+            self.done = True
+        elif not self._stack:
+            # the content section closed without a story element
+            self.done = True
+
+    def handle_data(self, data):
+        if self._text_depth is not None and self._skip_depth is None and not self.done:
+            self.parts.append(data)
+
+
+def _response_text(response: requests.Response) -> str:
+    """Decode a response body, using UTF-8 unless the response declares a charset."""
+    encoding = 'utf-8'
+    if 'charset' in response.headers.get('content-type', ''):
+        encoding = requests.utils.get_encoding_from_headers(response.headers) or encoding
+    return response.content.decode(encoding, errors='replace')
+
+
+def stream_topic_text(response: requests.Response, chunk_size: int = 4096) -> MaybeStr:
+    """Extract the text of a topic directly from the topic page, without building a tree.
+
+    A faster equivalent of binding `response_to_soup`, `extract_topic_content` and
+    `extract_topic_text`: parsing starts at the topic content section and stops once
+    its story element is closed, so the rest of the page is never parsed.
+
+    Args:
+        response: HTTP response object of the topic page
+        chunk_size: Number of characters fed to the parser at a time
+
+    Returns:
+        Either[str, str]: Right containing text content on success,
+                         Left containing error message on failure
+    """
+    try:
+        text = _response_text(response)
+        start = TOPIC_CONTENT_START_PATTERN.search(text)
+
+        parser = _TopicTextParser()
+        for offset in range(start.start() if start else 0, len(text), chunk_size):
+            parser.feed(text[offset : offset + chunk_size])
+            if parser.done:
+                break
+        else:
+            parser.close()
+    except Exception as e:
+        return Left(f"{e.__class__.__name__}: {e}")
+
+    if not parser.found_content:
+        return Left("Cannot find topic content section")
+    if not parser.found_text:
+        return Left("Cannot find content section in topic")
+    return Right(''.join(parser.parts))
+
+
+def parse_topic_page(response: MaybeResponse, parser: str = 'html.parser') -> MaybeStr:
+    """Extract the topic text from a fetched topic page.
+
+    Args:
+        response: Result of fetching the topic page
+        parser: A BeautifulSoup tree builder ('html.parser' or 'lxml'),
+                or 'stream' to extract the topic text without building a tree
+
+    Returns:
+        Either[str, str]: Right containing the topic text on success,
+                          Left containing error message on failure
+    """
+    if parser == STREAM_PARSER:
+        return response.bind(stream_topic_text)
+
+    to_soup = partial(response_to_soup, parser=parser)
+    return response.bind(to_soup).bind(extract_topic_content).bind(extract_topic_text)
@@ -7,13 +7,22 @@ including response parsing, error handling, and data extraction.
 
 import json
 import random
+import time
 import requests
-from typing import Any
-from bs4 import BeautifulSoup
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, Optional, TypeVar
+from bs4 import BeautifulSoup, FeatureNotFound
+from requests.adapters import HTTPAdapter
 
 from altr.monad.extended_pymonad import Left, Right, Either
 
-from .config import USER_AGENTS
+from .config import USER_AGENTS, POOL_CONNECTIONS, POOL_SIZE, TIMEOUT_SECONDS
+from .rate_limit import RateLimiter
+from .retry import RetryError, RetryPolicy
+
+if TYPE_CHECKING:
+    from .cache import ResponseCache
 
 # Type aliases for better readability
 JSON = dict[str, Any] | list[dict[str, Any]]
@@ -21,6 +30,9 @@ MaybeJSON = Either[str, JSON]
 MaybeSoup = Either[str, BeautifulSoup]
 MaybeResponse = Either[str, requests.Response]
 
+T = TypeVar('T')
+R = TypeVar('R')
+
 
 def get_random_user_agent() -> str:
     """Get a random user agent from the configured list.
@@ -31,6 +43,274 @@ def get_random_user_agent() -> str:
     return random.choice(USER_AGENTS)
 
 
+def create_session(
+    pool_connections: int = POOL_CONNECTIONS,
+    pool_size: int = POOL_SIZE,
+    keep_alive: bool = True,
+) -> requests.Session:
+    """Create a pooled HTTP session for reusing connections across requests.
+
+    Args:
+        pool_connections: Number of per-host connection pools to cache
+        pool_size: Maximum number of connections to keep per host
+        keep_alive: Whether to keep connections open between requests
+
+    Returns:
+        requests.Session: A session with pooled adapters mounted for http and https
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    if not keep_alive:
+        session.headers['Connection'] = 'close'
+    return session
+
+
+class RequestPolicy:
+    """The cache, rate limit and retry decisions of one request.
+
+    Shared by `send_request` and its asyncio counterpart, which only differ in how they
+    wait and send: each looks the response up with `cached_response`, then for every
+    attempt calls `next_attempt`, waits on the rate limiter and sends the request, and
+    asks `retry_after_error` or `retry_after_response` how long to wait before retrying
+    (None to stop). The final outcome goes through `failure`, or `store` and `success`.
+
+    `cached_response` and `store` read and write the cache, which blocks.
+
+    Attributes:
+        rate_limiter (Optional[RateLimiter]): Rate limiter to wait on, and to report the status codes to
+        retry_policy (Optional[RetryPolicy]): Policy deciding whether and when to retry
+        cache (Optional[ResponseCache]): Cache to look the response up in and store it to
+        cache_if (Optional[Callable]): Check of a 200 response before it is cached
+        cache_key (Optional[str]): Cache key of the request
+        attempt (int): Number of attempts started
+    """
+
+    def __init__(
+        self,
+        method: str,
+        url: str,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        cache: Optional["ResponseCache"] = None,
+        cache_if: Optional[Callable[[requests.Response], bool]] = None,
+        params: Optional[dict] = None,
+        json_body: Optional[Any] = None,
+        connection_errors: Iterable[type[BaseException]] = (),
+    ):
+        """Initialize the RequestPolicy.
+
+        Args:
+            method: HTTP method
+            url: URL to request
+            rate_limiter: Rate limiter to wait on, and to report the status codes to (no limit if None)
+            retry_policy: Policy deciding whether and when to retry (no retries if None)
+            cache: Cache to look the response up in and store it to (no caching if None)
+            cache_if: Check of a 200 response before it is cached, e.g. that it is not an error reported in the body
+            params: Query parameters of the request, part of the cache key
+            json_body: JSON body of the request, part of the cache key
+            connection_errors: Exception types of the transport that the retry policy treats as `ConnectionError`
+        """
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.cache = cache
+        self.cache_if = cache_if
+        self.cache_key = cache.key(method, url, params=params, json_body=json_body) if cache is not None else None
+        self.connection_errors = tuple(connection_errors)
+        self.attempt = 0
+
+    def cached_response(self) -> Optional[requests.Response]:
+        """Look the response up in the cache.
+
+        Returns:
+            The cached response, with `attempts` set to 0, or None on a miss or without a cache
+        """
+        if self.cache is None:
+            return None
+        response = self.cache.get(self.cache_key)
+        if response is not None:
+            response.attempts = 0
+        return response
+
+    def next_attempt(self) -> int:
+        """Start an attempt.
+
+        Returns:
+            The number of the attempt, from 1
+        """
+        self.attempt += 1
+        return self.attempt
+
+    def retry_after_error(self, error: Exception) -> Optional[float]:
+        """Decide whether to retry after sending raised an exception.
+
+        Args:
+            error: The exception raised
+
+        Returns:
+            Seconds to wait before retrying, or None to give up
+        """
+        if isinstance(error, self.connection_errors):
+            error = ConnectionError(str(error))
+        if self.retry_policy is not None and self.retry_policy.should_retry(self.attempt, error=error):
+            return self.retry_policy.backoff(self.attempt)
+        return None
+
+    def retry_after_response(self, response: requests.Response) -> Optional[float]:
+        """Report the status code to the rate limiter and decide whether to retry.
+
+        Args:
+            response: The response received
+
+        Returns:
+            Seconds to wait before retrying, or None to keep the response
+        """
+        if self.rate_limiter is not None:
+            self.rate_limiter.update(response.status_code)
+        if self.retry_policy is not None and self.retry_policy.should_retry(
+            self.attempt, status_code=response.status_code
+        ):
+            return self.retry_policy.backoff(self.attempt, response)
+        return None
+
+    def should_store(self, response: requests.Response) -> bool:
+        """Check whether a kept response goes to the cache: status code 200 and `cache_if` true if given."""
+        return (
+            self.cache is not None
+            and response.status_code == 200
+            and (self.cache_if is None or self.cache_if(response))
+        )
+
+    def store(self, response: requests.Response) -> None:
+        """Store a kept response in the cache if `should_store` allows it."""
+        if self.should_store(response):
+            self.cache.put(self.cache_key, response)
+
+    def success(self, response: requests.Response) -> MaybeResponse:
+        """Wrap the kept response, with the number of attempts made stored as `attempts`."""
+        response.attempts = self.attempt
+        return Right(response)
+
+    def failure(self, error: Exception) -> MaybeResponse:
+        """Wrap the exception raised by the last attempt, with the number of attempts made."""
+        return Left(RetryError(f"{error.__class__.__name__}: {error}", attempts=self.attempt))
+
+
+def send_request(
+    method: str,
+    url: str,
+    session: Optional[requests.Session] = None,
+    rate_limiter: Optional[RateLimiter] = None,
+    retry_policy: Optional[RetryPolicy] = None,
+    cache: Optional["ResponseCache"] = None,
+    cache_if: Optional[Callable[[requests.Response], bool]] = None,
+    **kwargs: Any,
+) -> MaybeResponse:
+    """Send an HTTP request, going through the cache, rate limiter and retry policy if given.
+
+    The number of attempts made is stored as `attempts` on the returned response
+    (0 for a cached response), or on the `RetryError` message when every attempt raised an exception.
+    Only responses with status code 200, for which `cache_if` is true if given, are stored in the cache.
+
+    Args:
+        method: HTTP method
+        url: URL to request
+        session: Session to send the request with (will use a one-off connection if None)
+        rate_limiter: Rate limiter to wait on before sending, and to report the status code to
+        retry_policy: Policy deciding whether and when to retry (no retries if None)
+        cache: Cache to look the response up in and store it to (no caching if None)
+        cache_if: Check of a 200 response before it is cached, e.g. that it is not an error reported in the body
+        **kwargs: Extra arguments passed to `requests.Session.request`
+
+    Returns:
+        Either[str, requests.Response]: Right containing response on success,
+                                       Left containing error message on failure
+    """
+    policy = RequestPolicy(
+        method,
+        url,
+        rate_limiter=rate_limiter,
+        retry_policy=retry_policy,
+        cache=cache,
+        cache_if=cache_if,
+        params=kwargs.get('params'),
+        json_body=kwargs.get('json'),
+    )
+    cached_response = policy.cached_response()
+    if cached_response is not None:
+        return Right(cached_response)
+
+    while True:
+        policy.next_attempt()
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+
+        try:
+            response = (session or requests).request(method, url, timeout=TIMEOUT_SECONDS, **kwargs)
+        except Exception as e:
+            delay = policy.retry_after_error(e)
+            if delay is not None:
+                time.sleep(delay)
+                continue
+            return policy.failure(e)
+
+        delay = policy.retry_after_response(response)
+        if delay is not None:
+            time.sleep(delay)
+            continue
+
+        policy.store(response)
+        return policy.success(response)
+
+
+def build_response(
+    url: str,
+    status_code: int,
+    content: bytes,
+    headers: dict[str, str] | None = None,
+    encoding: str | None = None,
+) -> requests.Response:
+    """Build a `requests.Response` from an already received body.
+
+    This lets responses received by other clients (or stored elsewhere) go through
+    the same parsing functions as responses fetched with `requests`.
+
+    Args:
+        url: URL the response was received from
+        status_code: HTTP status code of the response
+        content: Raw body of the response
+        headers: Response headers
+        encoding: Text encoding of the body (guessed from content if None)
+
+    Returns:
+        requests.Response: A response object holding the given body
+    """
+    response = requests.Response()
+    response.url = url
+    response.status_code = status_code
+    response._content = content
+    response.headers.update(headers or {})
+    response.encoding = encoding
+    return response
+
+
+def check_status_code(response: requests.Response) -> MaybeResponse:
+    """Check that the response has a 200 status code.
+
+    Args:
+        response: HTTP response object
+
+    Returns:
+        Either[str, requests.Response]: Right containing the response if the status code is 200,
+                                        Left containing error message if not
+    """
+    if response.status_code != 200:
+        message = f"Response code is not 200 (got {response.status_code})"
+        return Left(RetryError(message, attempts=getattr(response, 'attempts', 1)))
+    return Right(response)
+
+
 def response_to_json(response: requests.Response) -> MaybeJSON:
     """Convert response to JSON using response.json().
 
@@ -63,19 +343,22 @@ def response_content_to_json(response: requests.Response) -> MaybeJSON:
         return Left(f"{e.__class__.__name__}: {e}")
 
 
-def response_to_soup(response: requests.Response) -> MaybeSoup:
+def response_to_soup(response: requests.Response, parser: str = 'html.parser') -> MaybeSoup:
     """Convert response content to BeautifulSoup object.
 
     Args:
         response: HTTP response object
+        parser: BeautifulSoup tree builder to use, e.g. 'html.parser' or 'lxml' (requires the `lxml` extra)
 
     Returns:
         Either[str, BeautifulSoup]: Right containing BeautifulSoup on success,
                                     Left containing error message on failure
     """
     try:
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = BeautifulSoup(response.content, parser)
         return Right(soup)
+    except FeatureNotFound:
+        return Left(f"BeautifulSoup parser '{parser}' is not installed (for 'lxml': pip install 'altr[lxml]')")
     except Exception as e:
         return Left(f"{e.__class__.__name__}: {e}")
 
@@ -94,3 +377,48 @@ def extract_json_key(data: dict, key: str) -> MaybeJSON:
     if key not in data:
         return Left(f"Cannot find key '{key}' in data")
     return Right(data[key])
+
+
+def map_concurrently(
+    func: Callable[[T], R],
+    items: Iterable[T],
+    max_workers: int,
+    ordered: bool = False,
+) -> Iterator[tuple[T, R]]:
+    """Apply a function to items on a thread pool, keeping a bounded number in flight.
+
+    Items are consumed lazily, so `items` can be an unbounded iterator: at most
+    `2 * max_workers` calls are submitted ahead of the results being consumed.
+
+    Args:
+        func: Function to apply to each item
+        items: Items to process
+        max_workers: Number of worker threads
+        ordered: If True, yield results in input order; otherwise as they finish
+
+    Yields:
+        tuple[T, R]: Each item paired with the result of `func(item)`
+    """
+    max_in_flight = 2 * max_workers
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    in_flight: deque[tuple[T, Future]] = deque()
+
+    def completed() -> Iterator[tuple[T, R]]:
+        if ordered:
+            item, future = in_flight.popleft()
+            yield item, future.result()
+            return
+        done, _ = wait([future for _, future in in_flight], return_when=FIRST_COMPLETED)
+        for item, future in [pair for pair in in_flight if pair[1] in done]:
+            in_flight.remove((item, future))
+            yield item, future.result()
+
+    try:
+        for item in items:
+            in_flight.append((item, executor.submit(func, item)))
+            if len(in_flight) >= max_in_flight:
+                yield from completed()
+        while in_flight:
+            yield from completed()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
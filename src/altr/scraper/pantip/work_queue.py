@@ -0,0 +1,539 @@
+"""
+Work queue for distributed Pantip crawls.
+
+This module lets several crawler processes (on one host, or on several hosts sharing the
+database file) split a crawl between them. Search result pages and topic IDs are tasks in
+an SQLite queue. A worker claims tasks under a lease, which it renews while it works; a
+task whose worker dies is claimed again once its lease expires, and a task is retried a
+bounded number of times before it is marked as failed.
+
+Tasks are unique by kind and payload, so every worker can enqueue the same crawl without
+duplicating work. The database uses SQLite's default rollback journal rather than WAL,
+which does not work over network filesystems; hosts sharing the database file need a
+filesystem with working file locks.
+"""
+
+import json
+import logging
+import math
+import os
+import socket
+import sqlite3
+import threading
+import time
+from contextlib import closing, contextmanager
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Self, Union
+
+from .config import MAX_WORKERS, TOPICS_PER_PAGE
+from .crawl import clean_update, fetch_topic_update
+from .scraper import PantipScraper, TopicID
+from .sink import PantipSink
+from .utils import map_concurrently
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Type aliases for better readability
+Task = Dict[str, Any]
+
+# Kinds of tasks
+SEARCH_TASK = 'search'
+TOPICS_TASK = 'topics'
+
+# Default lease of a claimed task, in seconds
+LEASE_SECONDS = 600.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    options TEXT,
+    UNIQUE (kind, payload)
+);
+CREATE INDEX IF NOT EXISTS tasks_state ON tasks (state, lease_expires);
+"""
+
+
+def default_worker_id() -> str:
+    """Get an ID for this process that is unique across hosts.
+
+    Returns:
+        The host name and process ID
+    """
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class WorkQueue:
+    """An SQLite queue of crawl tasks with leases.
+
+    Each process opens its own WorkQueue on the shared database file; the threads of a
+    process can share it. Claims run in an immediate transaction, so a task is never handed
+    to two workers at once. A worker that holds a task longer than `lease_seconds` renews
+    its lease with `extend` (see `LeaseKeeper`); `complete` and `fail` report whether the
+    task was still leased to the worker.
+
+    Attributes:
+        path (str): Path of the SQLite database
+        lease_seconds (float): How long a claimed task stays with its worker
+        max_attempts (int): Number of claims of a task before it is marked as failed
+    """
+
+    def __init__(self, path: Union[str, Path], lease_seconds: float = LEASE_SECONDS, max_attempts: int = 3):
+        """Initialize the WorkQueue, creating the database if needed.
+
+        Args:
+            path: Path of the SQLite database
+            lease_seconds: How long a claimed task stays with its worker
+            max_attempts: Number of claims of a task before it is marked as failed
+        """
+        self.path = str(path)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, timeout=60, isolation_level=None, check_same_thread=False)
+        # WAL needs shared memory between the processes, which network filesystems do not provide
+        with self._lock:
+            self._connection.execute("PRAGMA journal_mode=DELETE")
+            self._connection.executescript(SCHEMA)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Open a write transaction that takes the database lock right away, committed when the block exits."""
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            with self._connection:
+                yield self._connection
+
+    def enqueue(self, kind: str, payloads: Iterable[Any], options: Optional[Dict[str, Any]] = None) -> int:
+        """Add tasks, skipping those already in the queue.
+
+        Args:
+            kind: Kind of the tasks
+            payloads: JSON-serialisable payloads of the tasks, which identify them
+            options: JSON-serialisable settings of the tasks that do not identify them;
+                a task already in the queue keeps its options
+
+        Returns:
+            Number of tasks added
+        """
+        options = json.dumps(options, sort_keys=True, ensure_ascii=False) if options is not None else None
+        rows = [(kind, json.dumps(payload, sort_keys=True, ensure_ascii=False), options) for payload in payloads]
+        with self._transaction():
+            before = self._connection.total_changes
+            self._connection.executemany("INSERT OR IGNORE INTO tasks (kind, payload, options) VALUES (?, ?, ?)", rows)
+            return self._connection.total_changes - before
+
+    def enqueue_search(
+        self,
+        keyword: str,
+        rooms: Optional[List[str]] = None,
+        sort_by_time: bool = True,
+        max_pages: Optional[int] = None,
+        pages: Iterable[int] = (1,),
+    ) -> int:
+        """Add search result pages of a keyword.
+
+        The worker that fetches the first page adds the following ones. `max_pages` is not
+        part of the identity of a page: adding a page already in the queue with another
+        `max_pages` does not add it again.
+
+        Args:
+            keyword: The search keyword/phrase
+            rooms: List of room IDs to search within (None searches all rooms)
+            sort_by_time: If True, sort results by time; otherwise by relevance
+            max_pages: Maximum number of result pages to crawl (None crawls all pages)
+            pages: Pages to add
+
+        Returns:
+            Number of tasks added
+        """
+        search = {'keyword': keyword, 'rooms': rooms, 'sort_by_time': sort_by_time}
+        return self.enqueue(SEARCH_TASK, [{**search, 'page': page} for page in pages], options={'max_pages': max_pages})
+
+    def enqueue_topics(self, topic_ids: Iterable[TopicID]) -> int:
+        """Add topics, one task per topic, so a topic found by several searches is fetched once.
+
+        Workers claim topics in batches (see `QueueWorker`).
+
+        Args:
+            topic_ids: The IDs of the topics to fetch
+
+        Returns:
+            Number of tasks added
+        """
+        return self.enqueue(TOPICS_TASK, [str(topic_id) for topic_id in topic_ids])
+
+    def claim(self, worker: str, limit: int = 1, kind: Optional[str] = None) -> List[Task]:
+        """Claim pending tasks, or tasks whose lease expired.
+
+        Args:
+            worker: ID of the claiming worker
+            limit: Maximum number of tasks to claim
+            kind: Only claim tasks of this kind (None claims any kind)
+
+        Returns:
+            The claimed tasks, as dictionaries with id, kind, payload, options and attempts
+        """
+        now = time.time()
+        kinds = (kind,) if kind is not None else (SEARCH_TASK, TOPICS_TASK)
+        with self._transaction():
+            self._connection.execute(
+                "UPDATE tasks SET state = 'failed', error = 'lease expired' "
+                "WHERE state = 'leased' AND lease_expires < ? AND attempts >= ?",
+                (now, self.max_attempts),
+            )
+            rows = self._connection.execute(
+                "SELECT id, kind, payload, options, attempts FROM tasks "
+                "WHERE (state = 'pending' OR (state = 'leased' AND lease_expires < ?)) "
+                f"AND kind IN ({', '.join('?' * len(kinds))}) ORDER BY id LIMIT ?",
+                (now, *kinds, limit),
+            ).fetchall()
+            self._connection.executemany(
+                "UPDATE tasks SET state = 'leased', worker = ?, lease_expires = ?, attempts = attempts + 1 "
+                "WHERE id = ?",
+                [(worker, now + self.lease_seconds, task_id) for task_id, *_ in rows],
+            )
+
+        return [
+            {
+                'id': task_id,
+                'kind': task_kind,
+                'payload': json.loads(payload),
+                'options': json.loads(options) if options is not None else {},
+                'attempts': attempts + 1,
+            }
+            for task_id, task_kind, payload, options, attempts in rows
+        ]
+
+    def extend(self, task: Task, worker: str) -> bool:
+        """Renew the lease of a claimed task.
+
+        Args:
+            task: The claimed task
+            worker: ID of the worker holding the task
+
+        Returns:
+            False if the task is no longer leased to the worker
+        """
+        return self._update_leased(task, worker, "lease_expires = ?", time.time() + self.lease_seconds)
+
+    def complete(self, task: Task, worker: str) -> bool:
+        """Mark a claimed task as done.
+
+        Args:
+            task: The claimed task
+            worker: ID of the worker holding the task
+
+        Returns:
+            False if the task is no longer leased to the worker
+        """
+        return self._update_leased(task, worker, "state = 'done', lease_expires = ?", None)
+
+    def fail(self, task: Task, worker: str, error: str) -> bool:
+        """Give a claimed task back, to be retried until it used all of its attempts.
+
+        Args:
+            task: The claimed task
+            worker: ID of the worker holding the task
+            error: Why the task failed
+
+        Returns:
+            False if the task is no longer leased to the worker
+        """
+        state = 'failed' if task['attempts'] >= self.max_attempts else 'pending'
+        return self._update_leased(task, worker, f"state = '{state}', error = ?", error)
+
+    def _update_leased(self, task: Task, worker: str, assignments: str, value: Any) -> bool:
+        with self._transaction():
+            cursor = self._connection.execute(
+                f"UPDATE tasks SET {assignments} WHERE id = ? AND worker = ? AND state = 'leased'",
+                (value, task['id'], worker),
+            )
+        return cursor.rowcount == 1
+
+    def counts(self) -> Dict[str, int]:
+        """Count the tasks in each state.
+
+        Returns:
+            A dictionary with the number of pending, leased, done and failed tasks
+        """
+        counts = dict.fromkeys(['pending', 'leased', 'done', 'failed'], 0)
+        with self._lock:
+            counts.update(self._connection.execute("SELECT state, COUNT(*) FROM tasks GROUP BY state").fetchall())
+        return counts
+
+    def is_drained(self) -> bool:
+        """Check whether every task is done or failed.
+
+        Returns:
+            True if no task is pending or leased
+        """
+        counts = self.counts()
+        return counts['pending'] == 0 and counts['leased'] == 0
+
+
+class LeaseKeeper:
+    """Renew the leases of claimed tasks from a background thread until they are released.
+
+    Leases are renewed every `interval` seconds while the block runs, whether or not the
+    work on the tasks makes progress, so a slow task keeps its lease. A task whose lease
+    was taken by another worker is no longer renewed.
+
+    Example:
+        >>> with LeaseKeeper(queue, worker, tasks) as keeper:
+        ...     for task in tasks:
+        ...         ...  # process the task
+        ...         queue.complete(task, worker)
+        ...         keeper.release(task)
+
+    Attributes:
+        queue (WorkQueue): The queue holding the tasks
+        worker (str): ID of the worker holding the tasks
+        interval (float): Seconds between renewals
+    """
+
+    def __init__(self, queue: WorkQueue, worker: str, tasks: Iterable[Task], interval: Optional[float] = None):
+        """Initialize the LeaseKeeper.
+
+        Args:
+            queue: The queue holding the tasks
+            worker: ID of the worker holding the tasks
+            tasks: The claimed tasks
+            interval: Seconds between renewals (a third of the queue's `lease_seconds` if None)
+        """
+        self.queue = queue
+        self.worker = worker
+        self.interval = interval if interval is not None else queue.lease_seconds / 3
+
+        self._tasks = {task['id']: task for task in tasks}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._renew, name=f'lease-keeper-{worker}', daemon=True)
+
+    def __enter__(self) -> Self:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stopped.set()
+        self._thread.join()
+
+    def release(self, task: Task) -> None:
+        """Stop renewing the lease of a task.
+
+        Args:
+            task: A task given to the LeaseKeeper
+        """
+        with self._lock:
+            self._tasks.pop(task['id'], None)
+
+    def _renew(self) -> None:
+        while not self._stopped.wait(self.interval):
+            with self._lock:
+                tasks = list(self._tasks.values())
+            for task in tasks:
+                try:
+                    if not self.queue.extend(task, self.worker):
+                        self.release(task)
+                except sqlite3.Error as error:
+                    logger.warning(f"Could not renew the lease of task {task['id']}: {error}")
+
+
+class QueueWorker:
+    """Work through the tasks of a WorkQueue with a PantipScraper, writing results to a PantipSink.
+
+    A search task adds the topics found as topic tasks (and, for the first page, the
+    following search pages), then writes its results. Topic tasks are claimed in batches of
+    `batch_size`; each topic is fetched with all of its comments, and completed or failed
+    on its own. A `LeaseKeeper` renews the leases of the tasks being processed.
+
+    Records are written before their task is completed (at-least-once delivery): if the
+    worker dies in between, the task is claimed again and its records are written twice, so
+    readers should deduplicate them on their topic and comment IDs. A worker whose task was
+    claimed by another worker after its lease expired skips its records. Parquet shards
+    only reach the disk once they are complete, so use JSONL for crawls that must survive
+    a worker dying.
+
+    Attributes:
+        queue (WorkQueue): The shared queue
+        scraper (PantipScraper): Scraper used to send the requests
+        sink (PantipSink): Where the records are written
+        worker (str): ID of this worker
+        max_workers (int): Number of topics fetched at the same time
+        comment_workers (int): Number of comment pages of a topic fetched at the same time
+        batch_size (int): Number of topics claimed together
+        clean (bool): Whether texts are cleaned with `clean_pantip_text`
+        poll_seconds (float): How long to wait when other workers hold every remaining task
+    """
+
+    def __init__(
+        self,
+        queue: WorkQueue,
+        scraper: PantipScraper,
+        sink: PantipSink,
+        worker: Optional[str] = None,
+        max_workers: int = MAX_WORKERS,
+        comment_workers: int = 1,
+        batch_size: int = TOPICS_PER_PAGE,
+        clean: bool = True,
+        poll_seconds: float = 1.0,
+    ):
+        """Initialize the QueueWorker.
+
+        Args:
+            queue: The shared queue
+            scraper: Scraper used to send the requests
+            sink: Where the records are written
+            worker: ID of this worker (host name and process ID if None)
+            max_workers: Number of topics fetched at the same time
+            comment_workers: Number of comment pages of a topic fetched at the same time
+                (at most `max_workers * comment_workers` requests are sent at the same time)
+            batch_size: Number of topics claimed together
+            clean: Whether texts are cleaned with `clean_pantip_text`
+            poll_seconds: How long to wait when other workers hold every remaining task
+        """
+        self.queue = queue
+        self.scraper = scraper
+        self.sink = sink
+        self.worker = worker if worker is not None else default_worker_id()
+        self.max_workers = max_workers
+        self.comment_workers = comment_workers
+        self.batch_size = batch_size
+        self.clean = clean
+        self.poll_seconds = poll_seconds
+
+    def run(self, max_tasks: Optional[int] = None) -> Dict[str, int]:
+        """Claim and process tasks until the queue is drained.
+
+        Args:
+            max_tasks: Maximum number of tasks to process (None processes until the queue is drained)
+
+        Returns:
+            A dictionary counting the tasks done, failed and lost (claimed by another worker
+            after their lease expired), and the topics and comments written
+        """
+        stats = {'done': 0, 'failed': 0, 'lost': 0, 'topics': 0, 'comments': 0}
+        while True:
+            processed = stats['done'] + stats['failed'] + stats['lost']
+            if max_tasks is not None and processed >= max_tasks:
+                break
+
+            tasks = self.queue.claim(self.worker)
+            if not tasks:
+                if self.queue.is_drained():
+                    break
+                time.sleep(self.poll_seconds)
+                continue
+
+            if tasks[0]['kind'] == TOPICS_TASK:
+                batch_size = self.batch_size if max_tasks is None else min(self.batch_size, max_tasks - processed)
+                if batch_size > 1:
+                    tasks += self.queue.claim(self.worker, limit=batch_size - 1, kind=TOPICS_TASK)
+            self.process(tasks, stats)
+        return stats
+
+    def process(self, tasks: List[Task], stats: Dict[str, int]) -> None:
+        """Process claimed tasks, completing or failing each of them.
+
+        Args:
+            tasks: The claimed tasks, typically one search task or a batch of topic tasks
+            stats: Counters of the tasks and of the topics and comments written, updated in place
+        """
+        topics = [task for task in tasks if task['kind'] == TOPICS_TASK]
+        for task in tasks:
+            if task['kind'] == SEARCH_TASK:
+                with LeaseKeeper(self.queue, self.worker, [task]):
+                    self._process_search(task, stats)
+            elif task['kind'] != TOPICS_TASK:
+                self._finish(task, f"Unknown task kind '{task['kind']}'", stats)
+        if topics:
+            with LeaseKeeper(self.queue, self.worker, topics) as keeper:
+                self._process_topics(topics, stats, keeper)
+
+    def _finish(
+        self, task: Task, error: Optional[str], stats: Dict[str, int], write: Optional[Callable[[], None]] = None
+    ) -> None:
+        """Fail a task, or write its records with `write` and complete it.
+
+        The records are written before the task is completed, and skipped if the task is no
+        longer leased to this worker.
+        """
+        if error is not None:
+            logger.error(f"Task {task['id']} ({task['kind']}) failed: {error}")
+            held = self.queue.fail(task, self.worker, error)
+        elif self.queue.extend(task, self.worker):
+            if write is not None:
+                write()
+            held = self.queue.complete(task, self.worker)
+        else:
+            held = False
+
+        if not held:
+            logger.warning(f"Task {task['id']} ({task['kind']}) was claimed by another worker after its lease expired")
+            stats['lost'] += 1
+            return
+        stats['done' if error is None else 'failed'] += 1
+
+    def _write_topic(self, update: Dict[str, Any], stats: Dict[str, int]) -> None:
+        if self.clean:
+            update = clean_update(update)
+        self.sink.write_topic(update['topic_id'], update['content'])
+        self.sink.write_comments(update['topic_id'], update['comments'])
+        stats['topics'] += 1
+        stats['comments'] += len(update['comments'])
+
+    def _process_search(self, task: Task, stats: Dict[str, int]) -> None:
+        search = task['payload']
+        result = self.scraper.search(
+            search['keyword'], rooms=search['rooms'], page=search['page'], sort_by_time=search['sort_by_time']
+        )
+        if result['error'] is not None:
+            self._finish(task, result['error'], stats)
+            return
+
+        # adding tasks twice has no effect, so it is done before the task is completed
+        if search['page'] == 1:
+            max_pages = task['options'].get('max_pages')
+            num_pages = math.ceil(result['total_topics'] / TOPICS_PER_PAGE)
+            if max_pages is not None:
+                num_pages = min(num_pages, max_pages)
+            self.queue.enqueue_search(
+                search['keyword'],
+                rooms=search['rooms'],
+                sort_by_time=search['sort_by_time'],
+                max_pages=max_pages,
+                pages=range(2, num_pages + 1),
+            )
+        self.queue.enqueue_topics(result['topic_ids'])
+        self._finish(task, None, stats, write=lambda: self.sink.write_search_results(result['data']))
+
+    def _process_topics(self, tasks: List[Task], stats: Dict[str, int], keeper: LeaseKeeper) -> None:
+        updates = map_concurrently(
+            lambda task: fetch_topic_update(self.scraper, task['payload'], max_workers=self.comment_workers),
+            tasks,
+            max_workers=self.max_workers,
+        )
+        with closing(updates):
+            for task, update in updates:
+                self._finish(task, update['error'], stats, write=partial(self._write_topic, update, stats))
+                keeper.release(task)
@@ -0,0 +1,46 @@
+import itertools
+
+from altr.monad import partition_eithers, sequence, traverse
+from altr.monad import fast_either
+from altr.monad.extended_pymonad import Left, Right
+
+
+def parse_int(text):
+    return Right(int(text)) if text.isdigit() else Left(f"not a number: {text}")
+
+
+def test_traverse_collects_values():
+    result = traverse(parse_int, iter(['1', '2', '3']))
+    assert result.is_right()
+    assert result.value == [1, 2, 3]
+    assert traverse(parse_int, []).value == []
+
+
+def test_traverse_short_circuits_without_consuming_the_rest():
+    items = itertools.chain(['1', 'x', 'y'], itertools.repeat('2'))
+
+    result = traverse(parse_int, items)
+
+    assert result.error == "not a number: x"
+    assert next(items) == 'y'
+
+
+def test_traverse_without_short_circuit_returns_every_error():
+    result = traverse(parse_int, ['1', 'x', '2', 'y'], short_circuit=False)
+    assert result.error == ["not a number: x", "not a number: y"]
+
+
+def test_sequence_accepts_fast_either_values():
+    eithers = [fast_either.Right(1), fast_either.Right(2)]
+    result = sequence(eithers, left=fast_either.Left, right=fast_either.Right)
+    assert result == fast_either.Right([1, 2])
+    assert sequence([Right(1), Left("error"), Right(2)]).error == "error"
+
+
+def test_partition_eithers():
+    eithers = (parse_int(text) for text in ['1', 'x', '2', 'y', '3'])
+    assert partition_eithers(eithers) == ([1, 2, 3], ["not a number: x", "not a number: y"])
+
+    eithers = (parse_int(text) for text in ['1', 'x', '2'])
+    assert partition_eithers(eithers, short_circuit=True) == ([1], ["not a number: x"])
+    assert next(eithers).value == 2
@@ -0,0 +1,40 @@
+import pickle
+
+import pytest
+
+from altr.monad import extended_pymonad
+from altr.monad.fast_either import Either, Left, Right
+
+
+def increment(x):
+    return Right(x + 1)
+
+
+def fail(x):
+    return Left(f"failed at {x}")
+
+
+def test_binds_short_circuit_on_left():
+    assert (Right(1) >> increment | increment).then(increment) == Right(4)
+    result = Right(1) >> increment >> fail | increment
+    assert result.is_left() and not result.is_right()
+    assert result.error == "failed at 2"
+    assert result.value is None
+
+
+@pytest.mark.parametrize('value', [Right(1), Left("error")])
+def test_matches_extended_pymonad(value):
+    reference = extended_pymonad.Right(1) if value.is_right() else extended_pymonad.Left("error")
+
+    assert (value.value, value.error, value.monoid) == (reference.value, reference.error, reference.monoid)
+    assert repr(value) == repr(reference)
+    assert value.map(str).value == reference.map(str).value
+    assert value.either(len, str) == reference.either(len, str)
+
+
+def test_values_are_slotted_and_picklable():
+    with pytest.raises(AttributeError):
+        Right(1).other = 2
+    assert pickle.loads(pickle.dumps(Left("error"))) == Left("error")
+    assert Either.insert(1) == Right(1)
+    assert Right(None) != Left(None)
@@ -0,0 +1,52 @@
+import pytest
+
+from altr.monad import MaybePipeline, lookup
+from altr.monad.maybe_monad import Just, Nothing
+
+USER_NAME = MaybePipeline(lookup('user'), lookup('name'))
+
+
+def test_just_and_nothing():
+    assert Just(1).map(lambda x: x + 1) == Just(2)
+    assert (Just(1) >> (lambda x: Nothing("failed")) | (lambda x: Just(x + 1))).error == "failed"
+    assert Nothing("failed").map(str) == Nothing("failed")
+    assert Nothing().value is None
+    with pytest.raises(AttributeError):
+        Just(1).other = 2
+
+
+def test_just_and_nothing_are_hashable():
+    assert {Just(1), Just(1), Nothing("failed"), Nothing("failed"), Nothing()} == {
+        Just(1),
+        Nothing("failed"),
+        Nothing(),
+    }
+    assert {Just(1): 'a'}[Just(1)] == 'a'
+    assert len({Just(None), Nothing()}) == 2
+
+
+def test_pipeline_matches_bind_chain():
+    comments = [{'user': {'name': 'a'}}, {'user': {}}, {'user': None}, {}, [1]]
+    for comment in comments:
+        expected = Just(comment) >> lookup('user') >> lookup('name')
+        assert USER_NAME(comment) == expected
+
+
+def test_pipeline_runs_lazily_over_a_stream():
+    comments = iter([{'user': {'name': 'a'}}, {'user': {}}, {'user': {'name': 'b'}}])
+
+    names = USER_NAME.values(comments, default='-')
+
+    assert next(names) == 'a'
+    assert next(comments) == {'user': {}}
+    assert list(names) == ['b']
+    assert [str(name) for name in USER_NAME.map([{}, {'user': {'name': 'a'}}])] == [
+        "Nothing (Cannot find key 'user')",
+        "Just a",
+    ]
+
+
+def test_pipeline_names_the_step_returning_a_bare_nothing():
+    pipeline = MaybePipeline(lookup('user')) >> (lambda user: Nothing())
+    assert pipeline({'user': 'a'}).error == "step 1 (<lambda>) returned Nothing"
+    assert pipeline.then(lookup('name')).steps[-1].key == 'name'
@@ -0,0 +1,105 @@
+import pytest
+
+import altr.nlp
+from altr.nlp import (
+    compose,
+    prepare_data_for_ngram,
+    prepare_data_for_ngram_stream,
+    process_ngram,
+    process_ngram_stream,
+    write_token_shards,
+)
+
+DELIMITER = '_'
+
+
+def train_pair_model(tokenised_texts):
+    return 'pair model'
+
+
+def apply_pair_model(model, tokenised_texts):
+    # joins the first two tokens of every text
+    return [[DELIMITER.join(tokens[:2]), *tokens[2:]] if len(tokens) > 1 else tokens for tokens in tokenised_texts]
+
+
+def filter_only_ngram_tokens(tokenised_texts):
+    return [[token for token in tokens if DELIMITER in token] for tokens in tokenised_texts]
+
+
+def concat_ngram_tokens(tokenised_texts):
+    return [[token.replace(DELIMITER, '') for token in tokens] for tokens in tokenised_texts]
+
+
+process = process_ngram(train_pair_model, apply_pair_model, filter_only_ngram_tokens, concat_ngram_tokens)
+
+
+def test_process_ngram_adds_levels():
+    models, ngrams, ngrams_filtered = compose(prepare_data_for_ngram, process, process)([['a', 'b', 'c', 'd']])
+
+    assert list(models) == [1, 2, 3]
+    assert ngrams[2] == [['ab', 'c', 'd']]
+    assert ngrams[3] == [['abc', 'd']]
+    assert ngrams_filtered[3] == [['abc']]
+
+
+def test_process_ngram_shares_earlier_levels_without_mutating_them():
+    texts = [['a', 'b', 'c']]
+    unigram = prepare_data_for_ngram(texts)
+    bigram = process(unigram)
+    trigram = process(bigram)
+
+    assert list(unigram.models) == [1]
+    assert list(bigram.models) == [1, 2]
+    assert trigram.ngram_tokens[1] is texts
+    assert trigram.ngram_tokens[2] is bigram.ngram_tokens[2]
+    with pytest.raises(TypeError):
+        trigram.models[4] = None
+
+
+def test_process_ngram_accepts_plain_dictionaries():
+    models = {1: None}
+    state = process((models, {1: [['a', 'b']]}, {1: [['a', 'b']]}))
+
+    assert state.max_ngram == 2
+    assert models == {1: None}
+
+
+def test_streaming_pipeline_matches_in_memory_pipeline(tmp_path):
+    texts = [[f'{no}a', f'{no}b', f'{no}c', f'{no}d'] for no in range(25)] + [['x']]
+    trained_on = []
+
+    def train(corpus):
+        trained_on.append(list(corpus))
+        return train_pair_model(corpus)
+
+    process_stream = process_ngram_stream(
+        train,
+        apply_pair_model,
+        filter_only_ngram_tokens,
+        concat_ngram_tokens,
+        tmp_path / 'ngrams',
+        batch_size=4,
+        shard_size=10,
+    )
+    corpus = write_token_shards(iter(texts), tmp_path / 'corpus', shard_size=10)
+    models, ngrams, ngrams_filtered = compose(prepare_data_for_ngram_stream, process_stream, process_stream)(corpus)
+    expected = compose(prepare_data_for_ngram, process, process)(texts)
+
+    assert list(models) == [1, 2, 3]
+    assert trained_on == [texts, expected.ngram_tokens[2]]
+    assert len(ngrams[3].shards) == 3
+    assert list(ngrams[3]) == expected.ngram_tokens[3]
+    assert list(ngrams[3]) == list(ngrams[3])
+    assert list(ngrams_filtered[3]) == expected.ngram_tokens_filtered[3]
+
+
+def test_streaming_pipeline_rejects_one_shot_iterators():
+    with pytest.raises(TypeError):
+        prepare_data_for_ngram_stream(iter([['a']]))
+
+
+def test_star_import_only_exports_the_ngram_api():
+    from altr.nlp import ngram
+
+    assert set(ngram.__all__) <= set(dir(altr.nlp))
+    assert not {'MappingProxyType', 'NamedTuple', 'Mapping', 'Callable', 'TypeAlias'} & set(dir(altr.nlp))
@@ -0,0 +1,76 @@
+from functools import partial
+
+import pytest
+
+from altr.nlp import (
+    EncodedCorpus,
+    NgramLevels,
+    apply_phrases,
+    compose,
+    encode_corpus,
+    filter_encoded,
+    prepare_data_for_ngram,
+    process_ngram,
+    replace_encoded,
+    train_phrases,
+)
+
+TEXTS = [
+    ['i', 'live', 'in', 'new', 'york', 'city'],
+    ['new', 'york', 'city', 'is', 'big'],
+    ['york', 'new', 'york', 'new', 'york'],
+    [],
+] * 3
+
+train = partial(train_phrases, min_count=3, threshold=0.5)
+
+
+def is_ngram_token(token):
+    return '_' in token
+
+
+def concat_ngram_token(token):
+    return token.replace('_', '')
+
+
+def manual_pipeline(texts):
+    process = process_ngram(
+        train,
+        apply_phrases,
+        lambda corpus: [[token for token in tokens if is_ngram_token(token)] for tokens in corpus],
+        lambda corpus: [[concat_ngram_token(token) for token in tokens] for tokens in corpus],
+    )
+    return compose(prepare_data_for_ngram, process, process)(texts)
+
+
+@pytest.mark.parametrize('encode', [False, True])
+def test_levels_match_chained_process_ngram_and_stop_early(encode):
+    ngram_levels = NgramLevels(5, train, apply_phrases, is_ngram_token, concat_ngram_token)
+    texts = encode_corpus(TEXTS) if encode else TEXTS
+
+    models, ngrams, ngrams_filtered = compose(prepare_data_for_ngram, ngram_levels)(texts)
+    expected = manual_pipeline(TEXTS)
+
+    assert list(models) == [1, 2, 3]
+    for ngram in (2, 3):
+        assert list(ngrams[ngram]) == expected.ngram_tokens[ngram]
+        assert list(ngrams_filtered[ngram]) == expected.ngram_tokens_filtered[ngram]
+
+    assert [stats['ngram'] for stats in ngram_levels.stats] == [2, 3, 4]
+    assert [stats['new_phrases'] for stats in ngram_levels.stats] == [1, 1, 0]
+    assert ngram_levels.stats[0]['vocabulary_size'] == 8
+    assert all(stats['seconds'] >= stats['train_seconds'] >= 0 for stats in ngram_levels.stats)
+
+
+def test_levels_on_encoded_corpus_stay_encoded():
+    ngram_levels = NgramLevels(3, train, apply_phrases, is_ngram_token, concat_ngram_token)
+
+    state = compose(encode_corpus, prepare_data_for_ngram, ngram_levels)(TEXTS)
+
+    reference = process_ngram(
+        train, apply_phrases, filter_encoded(is_ngram_token), replace_encoded(concat_ngram_token)
+    )(prepare_data_for_ngram(encode_corpus(TEXTS)))
+    assert isinstance(state.ngram_tokens[2], EncodedCorpus)
+    assert isinstance(state.ngram_tokens_filtered[2], EncodedCorpus)
+    assert list(state.ngram_tokens[2]) == list(reference.ngram_tokens[2])
+    assert list(state.ngram_tokens_filtered[2]) == list(reference.ngram_tokens_filtered[2])
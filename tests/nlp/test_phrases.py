@@ -0,0 +1,105 @@
+import math
+from collections import Counter
+from functools import partial
+from itertools import pairwise
+
+import pytest
+
+from altr.nlp import (
+    apply_phrases,
+    compose,
+    encode_corpus,
+    filter_encoded,
+    prepare_data_for_ngram,
+    process_ngram,
+    replace_encoded,
+    train_phrases,
+)
+
+TEXTS = [
+    ['i', 'live', 'in', 'new', 'york', 'city'],
+    ['new', 'york', 'city', 'is', 'big'],
+    ['a', 'a', 'a', 'a', 'a'],
+    [],
+    ['new'],
+    ['york', 'new', 'york', 'new', 'york'],
+] * 3
+
+
+def reference_scores(texts, min_count, scoring):
+    word_counts = Counter(token for tokens in texts for token in tokens)
+    bigram_counts = Counter(pair for tokens in texts for pair in pairwise(tokens))
+    total, len_vocab = sum(word_counts.values()), len(word_counts) + len(bigram_counts)
+
+    scores = {}
+    for (a, b), count in bigram_counts.items():
+        if scoring == 'npmi':
+            pa, pb, pab = word_counts[a] / total, word_counts[b] / total, count / total
+            scores[f'{a}_{b}'] = math.log(pab / (pa * pb)) / -math.log(pab) if count >= min_count else -math.inf
+        else:
+            scores[f'{a}_{b}'] = (count - min_count) / word_counts[a] / word_counts[b] * len_vocab
+    return scores
+
+
+@pytest.mark.parametrize('scoring, threshold', [('default', 1.0), ('npmi', 0.2)])
+def test_scores_match_gensim_formulas(scoring, threshold):
+    model = train_phrases(TEXTS, min_count=2, threshold=threshold, scoring=scoring)
+
+    expected = {phrase: score for phrase, score in reference_scores(TEXTS, 2, scoring).items() if score > threshold}
+    assert model.export_phrases() == pytest.approx(expected)
+    assert len(model) == len(expected) > 0
+
+
+def test_vectorised_merge_matches_greedy_merge():
+    corpus = encode_corpus(TEXTS)
+    # every bigram seen more than once is a phrase
+    model = train_phrases(corpus, min_count=1, threshold=1e-9)
+
+    merged = apply_phrases(model, corpus)
+
+    assert merged.to_texts() == [model[tokens] for tokens in TEXTS]
+    assert model[['a', 'a', 'a', 'a', 'a']] == ['a_a', 'a_a', 'a']
+    assert apply_phrases(model, TEXTS) == merged.to_texts()
+
+
+def test_plugs_into_process_ngram():
+    process = process_ngram(
+        partial(train_phrases, min_count=3, threshold=0.5),
+        apply_phrases,
+        filter_encoded(lambda token: '_' in token),
+        replace_encoded(lambda token: token.replace('_', '')),
+    )
+
+    models, ngrams, ngrams_filtered = compose(encode_corpus, prepare_data_for_ngram, process, process)(TEXTS)
+
+    assert 'new_york' in models[2].export_phrases()
+    assert 'newyork_city' in models[3].export_phrases()
+    assert ngrams[3][0] == ['i', 'live', 'in', 'newyorkcity']
+    assert ngrams_filtered[3][0] == ['newyorkcity']
+
+
+@pytest.mark.parametrize('scoring, threshold', [('default', 1.0), ('npmi', 0.2)])
+def test_matches_gensim_phrases(scoring, threshold):
+    Phrases = pytest.importorskip('gensim.models').Phrases
+    reference = Phrases(TEXTS, min_count=2, threshold=threshold, scoring=scoring, delimiter='_')
+
+    model = train_phrases(TEXTS, min_count=2, threshold=threshold, scoring=scoring)
+
+    assert model.export_phrases() == pytest.approx(reference.export_phrases())
+    assert apply_phrases(model, TEXTS) == [reference[tokens] for tokens in TEXTS]
+
+
+@pytest.mark.parametrize(
+    'settings',
+    [
+        {'min_count': 0},
+        {'threshold': 0.0},
+        {'threshold': -1.0, 'scoring': 'original'},
+        {'threshold': 1.5, 'scoring': 'npmi'},
+        {'threshold': -1.5, 'scoring': 'npmi'},
+        {'scoring': 'pmi'},
+    ],
+)
+def test_rejects_settings_gensim_rejects(settings):
+    with pytest.raises(ValueError):
+        train_phrases(TEXTS, **settings)
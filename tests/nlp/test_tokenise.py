@@ -0,0 +1,50 @@
+import re
+from functools import partial
+
+import altr.nlp
+from altr.nlp import compose, exclude_by_regex, exclude_words, tokenise_corpus
+from altr.nlp.tokenise import RegexFilter, WordFilter, exclude_by_regex_from_corpus, exclude_words_from_corpus
+
+TOKENS = ['ผม', 'ชอบ', 'กิน', '555', ' ', 'ข้าว', 'ครับ', 'aa', 'ABC']
+
+
+def test_word_filter_matches_exclude_words():
+    stopwords = ['ผม', 'ครับ', 'ไม่มี']
+    word_filter = WordFilter(stopwords)
+
+    assert word_filter(TOKENS) == exclude_words(stopwords)(TOKENS)
+    assert exclude_words(word_filter)(TOKENS) == exclude_words(stopwords)(TOKENS)
+    assert exclude_words_from_corpus(stopwords)([TOKENS, ['ผม']]) == [word_filter(TOKENS), []]
+
+
+def test_regex_filter_matches_exclude_by_regex():
+    patterns = [r'^5', r'^\s+$', r'(a)\1', r'(?i)abc', re.compile('ข', re.IGNORECASE)]
+    regex_filter = RegexFilter(*patterns)
+
+    expected = [token for token in TOKENS if not any(re.match(pattern, token) for pattern in patterns)]
+    assert expected == ['ผม', 'ชอบ', 'กิน', 'ครับ']
+    assert regex_filter(TOKENS) == expected
+    assert exclude_by_regex(regex_filter)(TOKENS) == expected
+    assert exclude_by_regex_from_corpus(patterns)([TOKENS, TOKENS]) == [expected, expected]
+    assert exclude_by_regex_from_corpus(r'^5', [TOKENS]) == [exclude_by_regex(r'^5', TOKENS)]
+
+
+def test_tokenise_corpus_keeps_order_across_processes():
+    texts = [f'text {no % 7} of corpus' for no in range(40)]
+
+    tokens = tokenise_corpus(texts, processes=2, chunksize=2, tokenise_fn=str.split)
+
+    assert tokens == [text.split() for text in texts]
+    assert tokens[0] is not tokens[7]
+
+
+def test_tokenise_corpus_plugs_into_compose():
+    pipeline = compose(partial(tokenise_corpus, tokenise_fn=str.split, memoise=False), exclude_words_from_corpus(['b']))
+    assert pipeline(iter(['a b', 'b c'])) == [['a'], ['c']]
+
+
+def test_star_import_only_exports_the_tokenise_api():
+    from altr.nlp import tokenise
+
+    assert set(tokenise.__all__) <= set(dir(altr.nlp))
+    assert not {'multiprocessing', 'ProcessPoolExecutor', 'partial', 'Pattern', 're', 'curry'} & set(dir(altr.nlp))
@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from altr.nlp import (
+    EncodedCorpus,
+    Vocabulary,
+    compose,
+    encode_corpus,
+    filter_encoded,
+    map_encoded,
+    prepare_data_for_ngram,
+    process_ngram,
+    replace_encoded,
+)
+
+TEXTS = [['ผม', 'ชอบ', 'กิน', 'ข้าว'], [], ['ผม', 'กิน', 'ผม']]
+
+
+def test_vocabulary_interns_tokens():
+    vocabulary = Vocabulary()
+
+    ids = vocabulary.encode(['ผม', 'ชอบ', 'ผม'])
+
+    assert ids.dtype == np.int32
+    assert ids.tolist() == [0, 1, 0]
+    assert vocabulary.decode(np.array([1, 0])) == ['ชอบ', 'ผม']
+    assert len(vocabulary) == 2 and 'ผม' in vocabulary
+    with pytest.raises(KeyError):
+        vocabulary.id_of('ข้าว')
+
+
+def test_full_vocabulary_stays_consistent(monkeypatch):
+    from altr.nlp import vocabulary as vocabulary_module
+
+    monkeypatch.setattr(vocabulary_module, 'MAX_ID', 1)
+    vocabulary = Vocabulary(['ผม', 'ชอบ'])
+
+    with pytest.raises(OverflowError):
+        vocabulary.add('กิน')
+
+    assert 'กิน' not in vocabulary
+    assert vocabulary.tokens == ['ผม', 'ชอบ']
+    assert vocabulary.add('ชอบ') == 1
+
+
+def test_encoded_corpus_round_trips():
+    corpus = encode_corpus(iter(TEXTS))
+
+    assert corpus.to_texts() == TEXTS
+    assert list(corpus) == TEXTS
+    assert len(corpus) == 3 and corpus[-1] == TEXTS[-1]
+    assert corpus.offsets.tolist() == [0, 4, 4, 7]
+    assert corpus.row(2).tolist() == [0, 2, 0]
+    with pytest.raises(ValueError):
+        corpus.ids[0] = 1
+
+
+def test_filter_and_replace_work_on_ids():
+    corpus = encode_corpus(TEXTS)
+
+    filtered = filter_encoded(lambda token: token != 'ผม', corpus)
+    replaced = replace_encoded(lambda token: token[::-1], corpus)
+
+    assert filtered.to_texts() == [[token for token in tokens if token != 'ผม'] for tokens in TEXTS]
+    assert replaced.to_texts() == [[token[::-1] for token in tokens] for tokens in TEXTS]
+    assert replaced.offsets is corpus.offsets
+    assert isinstance(filtered, EncodedCorpus)
+
+
+def test_process_ngram_on_encoded_corpus():
+    def train(corpus):
+        # a model joining the first two tokens of every text, trained by reading the corpus
+        return {tuple(tokens[:2]) for tokens in corpus if len(tokens) > 1}
+
+    def apply_model(model, tokens):
+        return ['_'.join(tokens[:2]), *tokens[2:]] if tuple(tokens[:2]) in model else tokens
+
+    process = process_ngram(
+        train,
+        lambda model, corpus: map_encoded(lambda tokens: apply_model(model, tokens), corpus),
+        filter_encoded(lambda token: '_' in token),
+        replace_encoded(lambda token: token.replace('_', '')),
+    )
+
+    _, ngrams, ngrams_filtered = compose(encode_corpus, prepare_data_for_ngram, process, process)(TEXTS)
+
+    assert ngrams[1].to_texts() == TEXTS
+    assert ngrams[3].to_texts() == [['ผมชอบกิน', 'ข้าว'], [], ['ผมกินผม']]
+    assert ngrams_filtered[3].to_texts() == [['ผมชอบกิน'], [], ['ผมกินผม']]
+    assert ngrams[2].vocabulary is ngrams[1].vocabulary
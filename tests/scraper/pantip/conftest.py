@@ -0,0 +1,162 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from altr.scraper.pantip import comment, search, topic
+
+try:
+    from altr.scraper.pantip import async_scraper
+except ImportError:  # aiohttp is an optional dependency
+    async_scraper = None
+
+COMMENTS_PER_PAGE = 100
+
+TOPIC_PAGE = """<html><body>
+<div class="display-post-wrapper main-post type">
+  <h2 class="display-post-title">Topic {topic_id}</h2>
+  <div class="display-post-story">{story}</div>
+</div>
+<div class="display-post-wrapper section-comment">
+  <div class="display-post-story">Comment in page</div>
+</div>
+</body></html>"""
+
+
+class StandInPantip:
+    """State of the local stand-in Pantip server shared with the tests."""
+
+    def __init__(self):
+        self.max_comments = {}
+        self.search_total = 25
+        # stories of the topics, 'Story of topic {topic_id}' if not set, or None for a server error
+        self.stories = {}
+        # error message of searches answered with `success: false`, as with an expired token
+        self.search_error = None
+        self.connections = 0
+        self.requests = []
+        self.fail_next = []
+        # seconds each GET request takes, and the most GET requests served at the same time
+        self.delay = 0.0
+        self.max_in_flight = 0
+        self.in_flight = 0
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def serving(self):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            yield
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+    def record(self, path):
+        with self.lock:
+            self.requests.append(path)
+            if self.fail_next:
+                return self.fail_next.pop(0)
+        return None
+
+
+def make_handler(state):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def setup(self):
+            super().setup()
+            with state.lock:
+                state.connections += 1
+
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status, body, content_type='application/json'):
+            data = body.encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            with state.serving():
+                self._get()
+
+        def _get(self):
+            url = urlparse(self.path)
+            failure = state.record(url.path)
+            if failure is not None:
+                return self._send(failure, '{}')
+
+            if url.path.startswith('/topic/'):
+                topic_id = url.path.rsplit('/', 1)[-1]
+                story = state.stories.get(topic_id, f'Story of topic {topic_id}')
+                if story is None:
+                    return self._send(500, '{}')
+                return self._send(200, TOPIC_PAGE.format(topic_id=topic_id, story=story), 'text/html; charset=utf-8')
+
+            if url.path == '/forum/topic/render_comments':
+                query = parse_qs(url.query)
+                topic_id = query['tid'][0]
+                page = int(query['param'][0].removeprefix('page'))
+                max_comments = state.max_comments.get(topic_id, 0)
+                start = (page - 1) * COMMENTS_PER_PAGE
+                stop = min(start + COMMENTS_PER_PAGE, max_comments)
+                comments = [{'comment_no': no + 1, 'message': f'comment {no + 1}'} for no in range(start, stop)]
+                return self._send(200, json.dumps({'comments': comments, 'paging': {'max_comments': max_comments}}))
+
+            self._send(404, '{}')
+
+        def do_POST(self):
+            url = urlparse(self.path)
+            body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+            failure = state.record(url.path)
+            if failure is not None:
+                return self._send(failure, '{}')
+
+            if url.path == '/api/search-service/search/getresult':
+                if state.search_error is not None:
+                    return self._send(200, json.dumps({'success': False, 'error_message': state.search_error}))
+                page = body['page']
+                start = (page - 1) * 10
+                stop = min(start + 10, state.search_total)
+                topics = [{'id': str(40000000 + no), 'title': f'topic {no}'} for no in range(start, stop)]
+                total = f'พบ {state.search_total:,} กระทู้'
+                return self._send(200, json.dumps({'success': True, 'data': topics, 'total': total}))
+
+            self._send(404, '{}')
+
+    return Handler
+
+
+@pytest.fixture
+def pantip_server(monkeypatch):
+    """Run a local server that mimics the Pantip search, comment and topic endpoints."""
+    state = StandInPantip()
+    server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(state))
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    base_url = f'http://127.0.0.1:{server.server_address[1]}'
+    state.base_url = base_url
+    monkeypatch.setattr(search, 'SEARCH_API', f'{base_url}/api/search-service/search/getresult')
+    monkeypatch.setattr(topic, 'TOPIC_BASE_URL', f'{base_url}/topic/')
+    monkeypatch.setattr(comment, 'COMMENT_API', f'{base_url}/forum/topic/render_comments')
+    if async_scraper is not None:
+        monkeypatch.setattr(async_scraper, 'SEARCH_API', f'{base_url}/api/search-service/search/getresult')
+        monkeypatch.setattr(async_scraper, 'TOPIC_BASE_URL', f'{base_url}/topic/')
+        monkeypatch.setattr(async_scraper, 'COMMENT_API', f'{base_url}/forum/topic/render_comments')
+
+    yield state
+
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,42 @@
+import asyncio
+
+import pytest
+
+from altr.scraper.pantip.scraper import PantipScraper
+
+
+def test_get_all_comments_merges_pages_in_order(pantip_server):
+    pantip_server.max_comments['1'] = 2150
+
+    with PantipScraper() as scraper:
+        result = scraper.get_all_comments('1', max_workers=4)
+
+    assert result['error'] is None
+    assert result['page_count'] == 22
+    assert [comment['comment_no'] for comment in result['data']] == list(range(1, 2151))
+
+
+def test_get_all_comments_reports_failed_pages(pantip_server):
+    pantip_server.max_comments['1'] = 250
+
+    with PantipScraper() as scraper:
+        pantip_server.fail_next.extend([None, 500])
+        result = scraper.get_all_comments('1', max_workers=1)
+
+    assert result['page_count'] == 3
+    assert result['error'] == "Failed to fetch comment pages [2] of topic 1"
+    assert [comment['comment_no'] for comment in result['data']] == list(range(1, 101)) + list(range(201, 251))
+
+
+def test_async_get_all_comments(pantip_server):
+    async_scraper = pytest.importorskip('altr.scraper.pantip.async_scraper')
+    pantip_server.max_comments['1'] = 350
+
+    async def scrape():
+        async with async_scraper.AsyncPantipScraper() as scraper:
+            return await scraper.get_all_comments('1')
+
+    result = asyncio.run(scrape())
+
+    assert result['page_count'] == 4
+    assert len(result['data']) == 350
@@ -0,0 +1,166 @@
+import asyncio
+import socket
+import threading
+
+import pytest
+
+pytest.importorskip('aiohttp')
+
+from altr.scraper.pantip import async_scraper
+from altr.scraper.pantip.async_scraper import (
+    AsyncPantipScraper,
+    async_fetch_comments,
+    async_fetch_topic,
+    async_search_topics,
+)
+from altr.scraper.pantip.cache import ResponseCache
+from altr.scraper.pantip.retry import RetryPolicy
+from altr.scraper.pantip.scraper import PantipScraper
+from altr.scraper.pantip.topic import extract_topic_content, extract_topic_text
+from altr.scraper.pantip.utils import response_content_to_json, response_to_soup
+
+
+def test_async_fetchers_return_same_either_as_sync(pantip_server):
+    pantip_server.max_comments['1'] = 3
+
+    async def fetch():
+        topic = await async_fetch_topic('1')
+        comments = await async_fetch_comments('1', page=1)
+        search = await async_search_topics('keyword')
+        return topic, comments, search
+
+    topic, comments, search = asyncio.run(fetch())
+
+    assert (topic >> response_to_soup >> extract_topic_content >> extract_topic_text).value == 'Story of topic 1'
+    assert len((comments >> response_content_to_json).value['comments']) == 3
+    assert search.value.json()['total'] == 'พบ 25 กระทู้'
+
+
+def test_async_fetch_reports_bad_status_as_left(pantip_server):
+    pantip_server.fail_next.append(503)
+
+    response = asyncio.run(async_fetch_topic('1'))
+
+    assert response.is_left()
+    assert response.error == "Response code is not 200 (got 503)"
+
+
+def test_async_fetch_retries_refused_connections_by_default(monkeypatch):
+    with socket.socket() as listener:
+        listener.bind(('127.0.0.1', 0))
+        url = f'http://127.0.0.1:{listener.getsockname()[1]}/topic/'
+    # nothing listens on the port any more
+    monkeypatch.setattr(async_scraper, 'TOPIC_BASE_URL', url)
+
+    response = asyncio.run(async_fetch_topic('1', retry_policy=RetryPolicy(max_attempts=3, backoff_base=0)))
+
+    assert response.is_left()
+    assert response.error.startswith('ClientConnectorError')
+    assert response.error.attempts == 3
+
+
+def test_async_scraper_matches_sync_scraper(pantip_server):
+    pantip_server.max_comments['1'] = 150
+
+    async def scrape():
+        async with AsyncPantipScraper() as scraper:
+            return await asyncio.gather(
+                scraper.get_topic_detail('1'),
+                scraper.get_topic_comments('1', page=2),
+                scraper.search('keyword', page=3),
+            )
+
+    async_results = asyncio.run(scrape())
+
+    with PantipScraper() as scraper:
+        sync_results = [
+            scraper.get_topic_detail('1'),
+            scraper.get_topic_comments('1', page=2),
+            scraper.search('keyword', page=3),
+        ]
+
+    assert async_results == sync_results
+
+
+def test_async_scraper_runs_many_requests_concurrently(pantip_server):
+    async def scrape():
+        async with AsyncPantipScraper(pool_size=8) as scraper:
+            return await asyncio.gather(*(scraper.get_topic_detail(topic_id) for topic_id in range(50)))
+
+    details = asyncio.run(scrape())
+
+    assert details == [f'Story of topic {topic_id}' for topic_id in range(50)]
+    assert pantip_server.connections <= 8
+
+
+class ThreadRecordingCache(ResponseCache):
+    """Response cache recording the threads it is used from."""
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.threads = []
+
+    def get(self, key):
+        self.threads.append(threading.current_thread())
+        return super().get(key)
+
+    def put(self, key, response):
+        self.threads.append(threading.current_thread())
+        super().put(key, response)
+
+
+def test_async_fetch_uses_the_cache_off_the_event_loop(pantip_server):
+    cache = ThreadRecordingCache(':memory:')
+
+    async def fetch_twice():
+        return [await async_fetch_topic('1', cache=cache) for _ in range(2)], threading.current_thread()
+
+    (first, second), loop_thread = asyncio.run(fetch_twice())
+
+    assert second.value.from_cache and second.value.text == first.value.text
+    assert len(cache.threads) == 3
+    assert loop_thread not in cache.threads
+
+
+def test_async_scraper_parses_topics_off_the_event_loop(pantip_server):
+    threads = []
+
+    class RecordingScraper(AsyncPantipScraper):
+        def _parse_topic_detail(self, response):
+            threads.append(threading.current_thread())
+            return super()._parse_topic_detail(response)
+
+    async def scrape():
+        async with RecordingScraper() as scraper:
+            return await scraper.get_topic_detail('1'), threading.current_thread()
+
+    detail, loop_thread = asyncio.run(scrape())
+
+    assert detail == 'Story of topic 1'
+    assert len(threads) == 1 and threads[0] is not loop_thread
+
+
+class CountingScraper(AsyncPantipScraper):
+    """Stand-in scraper with 20 comment pages, counting the pages fetched at the same time."""
+
+    def __init__(self):
+        super().__init__()
+        self.in_flight = self.max_in_flight = 0
+
+    async def get_topic_comments(self, topic_id, page=1):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return {'data': [page], 'page_count': 20, 'max_comments': 20, 'error': None, 'attempts': 1}
+
+
+def test_async_get_all_comments_bounds_the_pages_in_flight():
+    scraper = CountingScraper()
+
+    result = asyncio.run(scraper.get_all_comments('1', max_workers=3))
+
+    assert result['data'] == list(range(1, 21))
+    assert scraper.max_in_flight == 3
+    with pytest.raises(ValueError):
+        asyncio.run(scraper.get_all_comments('1', max_workers=0))
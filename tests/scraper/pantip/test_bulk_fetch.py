@@ -0,0 +1,91 @@
+import threading
+import time
+
+from altr.scraper.pantip.scraper import PantipScraper, parse_topic_body
+from altr.scraper.pantip.utils import map_concurrently
+
+
+def test_get_topics_in_input_order(pantip_server):
+    topic_ids = [str(topic_id) for topic_id in range(20)]
+
+    with PantipScraper() as scraper:
+        results = list(scraper.get_topics(topic_ids, max_workers=4, ordered=True))
+
+    assert [topic_id for topic_id, _ in results] == topic_ids
+    assert [result.value for _, result in results] == [f'Story of topic {topic_id}' for topic_id in topic_ids]
+
+
+def test_get_topics_yields_left_for_failed_topic(pantip_server):
+    pantip_server.fail_next.append(500)
+
+    with PantipScraper() as scraper:
+        results = dict(scraper.get_topics(['1', '2', '3'], max_workers=1))
+
+    assert sorted(results) == ['1', '2', '3']
+    assert [result.is_left() for result in results.values()].count(True) == 1
+
+
+def test_get_topics_pipeline_parses_on_process_pool(pantip_server):
+    topic_ids = [str(topic_id) for topic_id in range(12)]
+    pantip_server.fail_next.append(500)
+
+    with PantipScraper() as scraper:
+        results = list(scraper.get_topics(topic_ids, max_workers=3, ordered=True, pipeline=True, parse_workers=2))
+
+    assert [topic_id for topic_id, _ in results] == topic_ids
+    assert [result.is_left() for _, result in results].count(True) == 1
+    assert [result.value for _, result in results if result.is_right()] == [
+        f'Story of topic {topic_id}' for topic_id, result in results if result.is_right()
+    ]
+
+
+def test_get_topics_pipeline_matches_threaded_parsing(pantip_server):
+    with PantipScraper(parser='stream') as scraper:
+        threaded = dict(scraper.get_topics(['1', '2'], clean=True))
+        pipelined = dict(scraper.get_topics(['1', '2'], clean=True, pipeline=True, parse_workers=1))
+
+    assert {topic_id: result.value for topic_id, result in pipelined.items()} == {
+        topic_id: result.value for topic_id, result in threaded.items()
+    }
+
+
+def test_parse_topic_body_cleans_text():
+    body = (
+        b'<div class="display-post-wrapper main-post type">'
+        b'<div class="display-post-story">Story &amp;lt;b&amp;gt; {{em}}</div></div>'
+    )
+
+    assert parse_topic_body('https://pantip.com/topic/1', body, 'utf-8').value == 'Story &lt;b&gt; {{em}}'
+    assert parse_topic_body('https://pantip.com/topic/1', body, 'utf-8', clean=True).value == 'Story'
+    assert parse_topic_body('https://pantip.com/topic/1', b'<html></html>', 'utf-8').is_left()
+
+
+def test_map_concurrently_limits_in_flight_calls():
+    running = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def work(item):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.01)
+        with lock:
+            running -= 1
+        return item * 2
+
+    results = dict(map_concurrently(work, iter(range(30)), max_workers=3))
+
+    assert results == {item: item * 2 for item in range(30)}
+    assert peak <= 3
+
+
+def test_map_concurrently_yields_as_completed():
+    def work(item):
+        time.sleep(item)
+        return item
+
+    results = [item for item, _ in map_concurrently(work, [0.2, 0.0], max_workers=2)]
+
+    assert results == [0.0, 0.2]
@@ -0,0 +1,93 @@
+import asyncio
+import time
+
+import pytest
+
+from altr.scraper.pantip import ResponseCache, fetch_comments, fetch_topic, get_attempts, search_topics
+from altr.scraper.pantip.scraper import PantipScraper
+from altr.scraper.pantip.utils import build_response
+
+
+def test_cached_fetches_skip_the_network(pantip_server, tmp_path):
+    pantip_server.max_comments['1'] = 5
+    cache = ResponseCache(tmp_path / 'cache.sqlite')
+
+    for _ in range(2):
+        topic = fetch_topic('1', cache=cache)
+        comments = fetch_comments('1', page=1, cache=cache)
+        search = search_topics('keyword', page=2, cache=cache)
+
+    assert len(pantip_server.requests) == 3
+    assert topic.value.from_cache and get_attempts(topic) == 0
+    assert comments.value.json()['paging']['max_comments'] == 5
+    assert search.value.json()['data'][0]['id'] == '40000010'
+
+
+def test_cache_keys_include_params_and_body():
+    assert ResponseCache.key('GET', 'http://x/c', params={'page': 1}) != ResponseCache.key(
+        'GET', 'http://x/c', params={'page': 2}
+    )
+    assert ResponseCache.key('POST', 'http://x/s', json_body={'a': 1, 'b': 2}) == ResponseCache.key(
+        'POST', 'http://x/s', json_body={'b': 2, 'a': 1}
+    )
+
+
+def test_failed_responses_are_not_cached(pantip_server):
+    cache = ResponseCache(':memory:')
+    pantip_server.fail_next.append(500)
+
+    assert fetch_topic('1', cache=cache).is_left()
+    assert fetch_topic('1', cache=cache).is_right()
+    assert len(cache) == 1
+
+
+def test_search_errors_are_not_cached(pantip_server):
+    cache = ResponseCache(':memory:')
+    pantip_server.search_error = 'Invalid token'
+
+    assert search_topics('keyword', cache=cache).error == 'Invalid token'
+    assert len(cache) == 0
+
+    pantip_server.search_error = None
+    assert search_topics('keyword', cache=cache).is_right()
+    assert search_topics('keyword', cache=cache).is_right()
+    assert len(cache) == 1
+    assert len(pantip_server.requests) == 2
+
+
+def test_cache_entries_expire():
+    cache = ResponseCache(':memory:', ttl_seconds=0.05)
+    cache.put('key', build_response('http://x', 200, b'body'))
+
+    assert cache.get('key').content == b'body'
+    time.sleep(0.1)
+    assert cache.get('key') is None
+
+
+def test_cache_evicts_least_recently_used():
+    cache = ResponseCache(':memory:', max_bytes=10)
+    cache.put('a', build_response('http://x/a', 200, b'aaaa'))
+    time.sleep(0.01)
+    cache.put('b', build_response('http://x/b', 200, b'bbbb'))
+    time.sleep(0.01)
+    cache.get('a')
+    cache.put('c', build_response('http://x/c', 200, b'cccc'))
+
+    assert cache.get('a') is not None
+    assert cache.get('b') is None
+    assert cache.get('c') is not None
+
+
+def test_scrapers_use_the_cache(pantip_server, tmp_path):
+    with ResponseCache(tmp_path / 'cache.sqlite') as cache:
+        with PantipScraper(cache=cache) as scraper:
+            first = scraper.get_topic_detail('1')
+
+        async_scraper = pytest.importorskip('altr.scraper.pantip.async_scraper')
+
+        async def scrape():
+            async with async_scraper.AsyncPantipScraper(cache=cache) as scraper:
+                return await scraper.get_topic_detail('1')
+
+        assert asyncio.run(scrape()) == first
+    assert len(pantip_server.requests) == 1
@@ -0,0 +1,69 @@
+import json
+
+import pytest
+
+from altr.scraper.pantip.cli import main, parse_args, resolve_room
+
+
+def read_jsonl(directory):
+    return [json.loads(line) for path in sorted(directory.glob('*.jsonl')) for line in path.read_text().splitlines()]
+
+
+def test_resolve_room_by_id_name_or_english_name():
+    assert resolve_room('31') == 'tvshow'
+    assert resolve_room('บางขุนพรหม') == 'tvshow'
+    assert resolve_room('TVShow') == 'tvshow'
+    with pytest.raises(ValueError):
+        resolve_room('nowhere')
+
+
+def test_parse_args_rejects_unknown_room():
+    with pytest.raises(SystemExit):
+        parse_args(['keyword', '-o', 'out', '--room', 'nowhere'])
+
+
+@pytest.mark.parametrize('option', ['--workers', '--attempts', '--max-records', '--max-pages'])
+def test_parse_args_rejects_counts_below_one(option, capsys):
+    with pytest.raises(SystemExit):
+        parse_args(['keyword', '-o', 'out', option, '0'])
+    assert f'{option}: must be at least 1 (got 0)' in capsys.readouterr().err
+
+
+def test_main_crawls_into_output_directory(pantip_server, tmp_path, capsys):
+    pantip_server.search_total = 12
+    pantip_server.max_comments['40000000'] = 120
+
+    status = main(['keyword', '-o', str(tmp_path), '--room', 'tvshow', '--workers', '2', '--rate-limit', '200'])
+
+    assert status == 0
+    assert len(read_jsonl(tmp_path / 'search')) == 12
+    topics = read_jsonl(tmp_path / 'topics')
+    assert topics[0] == {'topic_id': '40000000', 'content': 'Story of topic 40000000'}
+    assert len(read_jsonl(tmp_path / 'comments')) == 120
+    assert 'Crawled 12 topics (12 new) and 120 comments' in capsys.readouterr().err
+
+
+def test_main_with_index_only_writes_changes(pantip_server, tmp_path):
+    index = str(tmp_path / 'index.db')
+    pantip_server.search_total = 5
+    pantip_server.max_comments['40000000'] = 3
+
+    assert main(['keyword', '-o', str(tmp_path / 'out'), '--index', index]) == 0
+    pantip_server.max_comments['40000000'] = 4
+    assert main(['keyword', '-o', str(tmp_path / 'out'), '--index', index]) == 0
+
+    assert len(read_jsonl(tmp_path / 'out' / 'topics')) == 5
+    assert [comment['comment_no'] for comment in read_jsonl(tmp_path / 'out' / 'comments')] == [1, 2, 3, 4]
+
+
+def test_main_with_queue_does_not_repeat_finished_work(pantip_server, tmp_path, capsys):
+    queue = str(tmp_path / 'queue.db')
+    pantip_server.search_total = 5
+    args = ['keyword', '-o', str(tmp_path / 'out'), '--queue', queue, '--worker-id', 'w1']
+
+    assert main(args) == 0
+    assert 'Crawled 5 topics and 0 comments' in capsys.readouterr().err
+    assert main(args) == 0
+
+    assert len(read_jsonl(tmp_path / 'out' / 'topics')) == 5
+    assert sorted(path.name for path in (tmp_path / 'out' / 'topics').iterdir()) == ['w1-00000.jsonl']
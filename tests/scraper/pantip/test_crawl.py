@@ -0,0 +1,107 @@
+from itertools import islice
+
+import pytest
+
+from altr.scraper.pantip import search
+from altr.scraper.pantip.crawl import CrawlIndex, IncrementalCrawler
+from altr.scraper.pantip.scraper import PantipScraper
+
+TOPIC_IDS = [str(40000000 + no) for no in range(25)]
+
+
+@pytest.fixture
+def crawler(tmp_path):
+    with PantipScraper() as scraper, CrawlIndex(tmp_path / 'index.db') as index:
+        yield IncrementalCrawler(scraper, index, max_workers=2)
+
+
+def topic_requests(server):
+    return [path for path in server.requests if path.startswith('/topic/')]
+
+
+def test_first_crawl_fetches_every_topic(pantip_server, crawler):
+    pantip_server.max_comments[TOPIC_IDS[0]] = 150
+
+    updates = list(crawler.crawl('keyword'))
+
+    assert [update['topic_id'] for update in updates] == TOPIC_IDS
+    assert all(update['is_new'] and update['error'] is None for update in updates)
+    assert updates[0]['content'] == f'Story of topic {TOPIC_IDS[0]}'
+    assert len(updates[0]['comments']) == 150
+    assert len(crawler.index) == 25
+    assert crawler.index.get(TOPIC_IDS[0])['max_comments'] == 150
+
+
+def test_empty_topics_are_indexed_and_failed_topics_are_not(pantip_server, crawler):
+    pantip_server.search_total = 2
+    pantip_server.stories[TOPIC_IDS[0]] = ''
+    pantip_server.stories[TOPIC_IDS[1]] = None
+
+    updates = list(crawler.crawl('keyword'))
+
+    assert [(update['content'], update['error'] is None) for update in updates] == [('', True), ('', False)]
+    assert crawler.index.get(TOPIC_IDS[0]) is not None
+    assert crawler.index.get(TOPIC_IDS[1]) is None
+
+
+def test_crawl_sends_at_most_max_workers_requests_at_once(pantip_server, tmp_path):
+    pantip_server.search_total = 6
+    pantip_server.max_comments.update(dict.fromkeys(TOPIC_IDS[:6], 450))
+    pantip_server.delay = 0.02
+
+    with PantipScraper() as scraper, CrawlIndex(tmp_path / 'index.db') as index:
+        updates = list(IncrementalCrawler(scraper, index, max_workers=3).crawl('keyword'))
+
+    assert [len(update['comments']) for update in updates] == [450] * 6
+    assert pantip_server.max_in_flight <= 3
+
+
+def test_recrawl_fetches_only_new_comment_pages(pantip_server, crawler):
+    pantip_server.max_comments[TOPIC_IDS[0]] = 150
+    list(crawler.crawl('keyword'))
+    pantip_server.requests.clear()
+
+    assert list(crawler.crawl('keyword')) == []
+    assert topic_requests(pantip_server) == []
+    assert pantip_server.requests.count('/forum/topic/render_comments') == 25
+
+    pantip_server.max_comments[TOPIC_IDS[0]] = 230
+    pantip_server.requests.clear()
+
+    updates = list(crawler.crawl('keyword'))
+
+    assert len(updates) == 1
+    assert not updates[0]['is_new']
+    assert [comment['comment_no'] for comment in updates[0]['comments']] == list(range(151, 231))
+    # page 2 holds the last known comment, page 3 is new
+    assert pantip_server.requests.count('/forum/topic/render_comments') == 25 + 1
+    assert crawler.index.get(TOPIC_IDS[0])['max_comments'] == 230
+
+
+def test_crawl_resumes_from_checkpoint(pantip_server, crawler):
+    crawl = crawler.index.crawl_key('keyword')
+
+    # stop while the first topic of the second page is being consumed
+    updates = crawler.crawl('keyword')
+    assert [update['topic_id'] for update in islice(updates, 11)] == TOPIC_IDS[:11]
+    updates.close()
+
+    assert crawler.index.checkpoint(crawl) == 1
+    assert len(crawler.index) == 10
+
+    pantip_server.requests.clear()
+    resumed = list(crawler.crawl('keyword'))
+
+    assert [update['topic_id'] for update in resumed] == TOPIC_IDS[10:]
+    assert len(topic_requests(pantip_server)) == 15
+    assert crawler.index.checkpoint(crawl) == 0
+
+
+def test_failed_search_keeps_checkpoint(pantip_server, crawler, monkeypatch):
+    crawl = crawler.index.crawl_key('keyword')
+    crawler.index.save_checkpoint(crawl, 1)
+    # nothing listens on the discard port
+    monkeypatch.setattr(search, 'SEARCH_API', 'http://127.0.0.1:9/api/search-service/search/getresult')
+
+    assert list(crawler.crawl('keyword')) == []
+    assert crawler.index.checkpoint(crawl) == 1
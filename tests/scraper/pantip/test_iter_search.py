@@ -0,0 +1,73 @@
+import time
+from itertools import islice
+
+import pytest
+
+from altr.scraper.pantip.scraper import PantipScraper
+
+
+def test_iter_search_streams_every_page_in_order(pantip_server):
+    pantip_server.search_total = 25
+
+    with PantipScraper() as scraper:
+        topics = list(scraper.iter_search('keyword'))
+
+    assert [topic['id'] for topic in topics] == [str(40000000 + no) for no in range(25)]
+
+
+def test_iter_search_respects_max_pages(pantip_server):
+    with PantipScraper() as scraper:
+        topics = list(scraper.iter_search('keyword', max_pages=2))
+
+    assert len(topics) == 20
+
+
+def test_iter_search_without_pages_fetches_nothing(pantip_server):
+    with PantipScraper() as scraper:
+        assert list(scraper.iter_search('keyword', max_pages=0)) == []
+
+    assert pantip_server.requests == []
+
+
+def test_iter_search_prefetches_a_bounded_number_of_pages(pantip_server):
+    pantip_server.search_total = 1000
+
+    with PantipScraper() as scraper:
+        topics = list(islice(scraper.iter_search('keyword', prefetch=2), 15))
+
+    assert len(topics) == 15
+    # first page, the page being consumed and the two pages fetched ahead of it
+    assert len(pantip_server.requests) <= 1 + 1 + 2
+
+
+def test_iter_search_prefetches_while_the_first_page_is_consumed(pantip_server):
+    pantip_server.search_total = 1000
+
+    with PantipScraper() as scraper:
+        topics = scraper.iter_search('keyword', prefetch=2)
+        assert len(list(islice(topics, 10))) == 10
+        # pages 2 and 3 were submitted before the first topic was yielded
+        deadline = time.monotonic() + 5
+        while len(pantip_server.requests) < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert len(pantip_server.requests) == 3
+        topics.close()
+
+
+def test_iter_search_without_prefetch_fetches_sequentially(pantip_server):
+    pantip_server.search_total = 1000
+
+    with PantipScraper() as scraper:
+        topics = scraper.iter_search('keyword', prefetch=0)
+        assert len(list(islice(topics, 15))) == 15
+        assert len(pantip_server.requests) == 2
+
+        topics = list(scraper.iter_search('keyword', prefetch=0, max_pages=3))
+
+    assert [topic['id'] for topic in topics] == [str(40000000 + no) for no in range(30)]
+
+
+def test_iter_search_rejects_negative_prefetch(pantip_server):
+    with PantipScraper() as scraper, pytest.raises(ValueError):
+        next(scraper.iter_search('keyword', prefetch=-1))
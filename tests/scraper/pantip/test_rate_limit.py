@@ -0,0 +1,57 @@
+import time
+
+import pytest
+
+from altr.scraper.pantip import RateLimiter, fetch_topic
+from altr.scraper.pantip.scraper import PantipScraper
+
+
+def test_rate_limiter_allows_burst_then_paces_requests():
+    limiter = RateLimiter(requests_per_second=50, burst=5)
+
+    start = time.monotonic()
+    for _ in range(5):
+        limiter.acquire()
+    burst_elapsed = time.monotonic() - start
+    for _ in range(10):
+        limiter.acquire()
+    total_elapsed = time.monotonic() - start
+
+    assert burst_elapsed < 0.05
+    assert total_elapsed == pytest.approx(10 / 50, abs=0.05)
+
+
+def test_rate_limiter_backs_off_and_recovers():
+    limiter = RateLimiter(requests_per_second=10, min_requests_per_second=2, backoff_factor=0.5, recovery=0.1)
+
+    limiter.update(429)
+    assert limiter.rate == 5
+    limiter.update(503)
+    limiter.update(503)
+    assert limiter.rate == 2
+
+    limiter.update(200)
+    assert limiter.rate == pytest.approx(3)
+    for _ in range(20):
+        limiter.update(200)
+    assert limiter.rate == 10
+
+
+def test_fetchers_report_status_codes_to_rate_limiter(pantip_server):
+    limiter = RateLimiter(requests_per_second=100, burst=10)
+    pantip_server.fail_next.append(429)
+
+    assert fetch_topic('1', rate_limiter=limiter).is_left()
+    assert limiter.rate == 50
+
+
+def test_scraper_shares_rate_limiter_across_calls(pantip_server):
+    limiter = RateLimiter(requests_per_second=40, burst=1)
+
+    with PantipScraper(rate_limiter=limiter) as scraper:
+        start = time.monotonic()
+        results = list(scraper.get_topics(range(9), max_workers=4))
+        elapsed = time.monotonic() - start
+
+    assert all(result.is_right() for _, result in results)
+    assert elapsed >= 8 / 40 - 0.02
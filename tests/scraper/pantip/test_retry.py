@@ -0,0 +1,78 @@
+import pytest
+import requests
+
+from altr.scraper.pantip import RetryPolicy, fetch_comments, fetch_topic, get_attempts
+from altr.scraper.pantip.scraper import PantipScraper
+
+NO_WAIT = RetryPolicy(max_attempts=3, backoff_base=0)
+
+
+def test_backoff_grows_exponentially_and_is_capped():
+    policy = RetryPolicy(backoff_base=1, backoff_factor=2, max_backoff=5, jitter=0)
+
+    assert [policy.backoff(attempt) for attempt in range(1, 5)] == [1, 2, 4, 5]
+
+
+def test_backoff_jitter_stays_within_bounds():
+    policy = RetryPolicy(backoff_base=1, jitter=0.5)
+
+    assert all(0.5 <= policy.backoff(1) <= 1 for _ in range(100))
+
+
+def test_should_retry_by_exception_type_and_status_code():
+    policy = RetryPolicy(max_attempts=2, retry_status_codes={503})
+
+    assert policy.should_retry(1, error=requests.Timeout())
+    assert not policy.should_retry(1, error=ValueError())
+    assert policy.should_retry(1, status_code=503)
+    assert not policy.should_retry(1, status_code=404)
+    assert not policy.should_retry(2, status_code=503)
+
+
+def test_fetch_retries_transient_status_codes(pantip_server):
+    pantip_server.fail_next.extend([503, 429])
+
+    response = fetch_topic('1', retry_policy=NO_WAIT)
+
+    assert response.is_right()
+    assert get_attempts(response) == 3
+
+
+def test_fetch_gives_up_after_max_attempts(pantip_server):
+    pantip_server.fail_next.extend([503, 503, 503])
+
+    response = fetch_comments('1', page=1, retry_policy=NO_WAIT)
+
+    assert response.error == "Response code is not 200 (got 503)"
+    assert get_attempts(response) == 3
+
+
+def test_fetch_retries_connection_errors():
+    response = fetch_topic('1', retry_policy=NO_WAIT, session=_refusing_session())
+
+    assert response.is_left()
+    assert get_attempts(response) == 3
+
+
+def test_scraper_reports_attempts(pantip_server):
+    pantip_server.max_comments['1'] = 10
+    pantip_server.fail_next.append(500)
+
+    with PantipScraper(retry_policy=NO_WAIT) as scraper:
+        result = scraper.get_topic_comments('1')
+
+    assert result['error'] is None
+    assert result['attempts'] == 2
+
+
+def test_invalid_policy():
+    with pytest.raises(ValueError):
+        RetryPolicy(max_attempts=0)
+
+
+def _refusing_session():
+    class RefusingSession(requests.Session):
+        def request(self, *args, **kwargs):
+            raise requests.ConnectionError("connection refused")
+
+    return RefusingSession()
@@ -0,0 +1,34 @@
+from altr.scraper.pantip import create_session, fetch_comments, fetch_topic, search_topics
+from altr.scraper.pantip.scraper import PantipScraper
+
+
+def test_fetchers_reuse_session_connection(pantip_server):
+    pantip_server.max_comments['1'] = 5
+    session = create_session(pool_size=2)
+
+    assert fetch_topic('1', session=session).is_right()
+    assert fetch_comments('1', page=1, session=session).is_right()
+    assert search_topics('keyword', session=session).is_right()
+
+    assert pantip_server.connections == 1
+
+
+def test_fetchers_without_session_open_new_connections(pantip_server):
+    fetch_topic('1')
+    fetch_topic('2')
+
+    assert pantip_server.connections == 2
+
+
+def test_scraper_owns_pooled_session(pantip_server):
+    with PantipScraper(pool_size=4) as scraper:
+        assert scraper.get_topic_detail('1') == 'Story of topic 1'
+        assert scraper.get_topic_detail('2') == 'Story of topic 2'
+        assert scraper.search('keyword')['total_topics'] == 25
+
+    assert pantip_server.connections == 1
+
+
+def test_create_session_without_keep_alive():
+    session = create_session(keep_alive=False)
+    assert session.headers['Connection'] == 'close'
@@ -0,0 +1,175 @@
+import json
+
+import pytest
+
+from altr.scraper.pantip.sink import JsonlShardWriter, PantipSink, flatten_record
+
+COMMENT = {
+    'comment_no': 1,
+    'message': 'ข้อความ',
+    'user': {'name': 'someone', 'avatar': {'large': 'a.png'}},
+    'replies': [{'reply_no': 1}],
+}
+
+
+def read_jsonl(paths):
+    return [json.loads(line) for path in paths for line in path.read_text(encoding='utf-8').splitlines()]
+
+
+def test_flatten_record():
+    assert flatten_record(COMMENT) == {
+        'comment_no': 1,
+        'message': 'ข้อความ',
+        'user_name': 'someone',
+        'user_avatar_large': 'a.png',
+        'replies': '[{"reply_no": 1}]',
+    }
+
+
+def test_jsonl_writer_rotates_shards(tmp_path):
+    with JsonlShardWriter(tmp_path, max_records=4) as writer:
+        writer.write_many({'no': no} for no in range(10))
+
+    assert [path.name for path in writer.shards] == ['part-00000.jsonl', 'part-00001.jsonl', 'part-00002.jsonl']
+    assert read_jsonl(writer.shards) == [{'no': no} for no in range(10)]
+
+
+def test_jsonl_writer_appends_after_existing_shards(tmp_path):
+    with JsonlShardWriter(tmp_path, max_records=4) as writer:
+        writer.write_many({'no': no} for no in range(5))
+    with JsonlShardWriter(tmp_path, max_records=4) as writer:
+        writer.write({'no': 5})
+
+    assert [path.name for path in writer.shards] == ['part-00002.jsonl']
+    assert read_jsonl(sorted(tmp_path.glob('*.jsonl'))) == [{'no': no} for no in range(6)]
+
+    with pytest.raises(FileExistsError):
+        JsonlShardWriter(tmp_path, append=False)
+
+
+def test_jsonl_writer_flushes_each_write(tmp_path):
+    with JsonlShardWriter(tmp_path, max_records=4) as writer:
+        writer.write({'no': 0})
+        assert read_jsonl(writer.shards) == [{'no': 0}]
+        writer.write_many({'no': no} for no in range(1, 6))
+        assert read_jsonl(writer.shards) == [{'no': no} for no in range(6)]
+
+
+def test_pantip_sink_writes_flat_records(tmp_path):
+    with PantipSink(tmp_path) as sink:
+        sink.write_search_results([{'id': '1', 'title': 'topic 1', 'tags': ['a']}])
+        sink.write_topic(1, 'story')
+        sink.write_comments(1, [COMMENT])
+
+    assert read_jsonl(sink.search.shards) == [{'id': '1', 'title': 'topic 1', 'tags': '["a"]'}]
+    assert read_jsonl(sink.topics.shards) == [{'topic_id': '1', 'content': 'story'}]
+    assert read_jsonl(sink.comments.shards) == [{'topic_id': '1', **flatten_record(COMMENT)}]
+
+
+def test_pantip_sink_rejects_unknown_format(tmp_path):
+    with pytest.raises(ValueError):
+        PantipSink(tmp_path, format='csv')
+
+
+def test_parquet_writer_writes_row_groups(tmp_path):
+    pq = pytest.importorskip('pyarrow.parquet')
+    from altr.scraper.pantip.sink import ParquetShardWriter
+
+    with ParquetShardWriter(tmp_path, max_records=5, row_group_size=2) as writer:
+        writer.write_many({'no': no, 'message': f'comment {no}'} for no in range(7))
+
+    assert [path.name for path in writer.shards] == ['part-00000.parquet', 'part-00001.parquet']
+    assert pq.ParquetFile(writer.shards[0]).num_row_groups == 3
+    assert [row['no'] for path in writer.shards for row in pq.read_table(path).to_pylist()] == list(range(7))
+
+
+def read_parquet(paths):
+    pq = pytest.importorskip('pyarrow.parquet')
+    return [row for path in paths for row in pq.read_table(path).to_pylist()]
+
+
+def test_parquet_writer_widens_null_columns(tmp_path):
+    pytest.importorskip('pyarrow')
+    from altr.scraper.pantip.sink import ParquetShardWriter
+
+    with ParquetShardWriter(tmp_path, row_group_size=1) as writer:
+        writer.write_many([{'no': 1, 'x': None}, {'no': 2, 'x': 's'}])
+
+    assert str(writer.schema.field('x').type) == 'string'
+    assert read_parquet(writer.shards) == [{'no': 1, 'x': None}, {'no': 2, 'x': 's'}]
+
+
+def test_parquet_writer_promotes_mixed_numbers(tmp_path):
+    pytest.importorskip('pyarrow')
+    from altr.scraper.pantip.sink import ParquetShardWriter
+
+    with ParquetShardWriter(tmp_path, row_group_size=1) as writer:
+        writer.write_many([{'v': 1}, {'v': 1.5}])
+
+    assert read_parquet(writer.shards) == [{'v': 1.0}, {'v': 1.5}]
+
+
+def test_parquet_writer_keeps_late_columns(tmp_path):
+    pq = pytest.importorskip('pyarrow.parquet')
+    from altr.scraper.pantip.sink import ParquetShardWriter
+
+    with ParquetShardWriter(tmp_path, row_group_size=2) as writer:
+        writer.write_many([{'no': 1}, {'no': 2}, {'no': 3, 'late': 'a'}, {'no': 4}, {'no': 5, 'later': True}])
+
+    assert pq.ParquetFile(writer.shards[0]).num_row_groups == 3
+    assert read_parquet(writer.shards) == [
+        {'no': 1, 'late': None, 'later': None},
+        {'no': 2, 'late': None, 'later': None},
+        {'no': 3, 'late': 'a', 'later': None},
+        {'no': 4, 'late': None, 'later': None},
+        {'no': 5, 'late': None, 'later': True},
+    ]
+
+
+def test_parquet_writer_rejects_incompatible_types(tmp_path):
+    pytest.importorskip('pyarrow')
+    from altr.scraper.pantip.sink import ParquetShardWriter
+
+    with pytest.raises(TypeError), ParquetShardWriter(tmp_path, row_group_size=1) as writer:
+        writer.write_many([{'v': 1}, {'v': 'one'}])
+    with pytest.raises(TypeError), ParquetShardWriter(tmp_path, row_group_size=2) as writer:
+        writer.write_many([{'v': 1}, {'v': 'one'}])
+
+
+def test_parquet_writer_enforces_fixed_schema(tmp_path):
+    pa = pytest.importorskip('pyarrow')
+    from altr.scraper.pantip.sink import ParquetShardWriter
+
+    with ParquetShardWriter(tmp_path / 'ok', schema=[('no', 'int64'), ('x', 'string')]) as writer:
+        writer.write_many([{'no': 1}, {'no': 2, 'x': 's'}])
+    assert read_parquet(writer.shards) == [{'no': 1, 'x': None}, {'no': 2, 'x': 's'}]
+
+    with (
+        pytest.raises(ValueError, match='unknown'),
+        ParquetShardWriter(tmp_path / 'unknown', schema=[('no', 'int64')]) as writer,
+    ):
+        writer.write({'no': 1, 'unknown': 'a'})
+    with (
+        pytest.raises(pa.ArrowInvalid),
+        ParquetShardWriter(tmp_path / 'truncated', schema=[('v', 'int64')]) as writer,
+    ):
+        writer.write({'v': 1.5})
+
+
+def test_pantip_sink_writes_parquet(tmp_path):
+    pytest.importorskip('pyarrow')
+
+    with PantipSink(tmp_path, format='parquet') as sink:
+        sink.write_topic(1, 'story')
+        sink.write_comments(1, [COMMENT])
+
+    assert [field.name for field in sink.topics.schema] == ['topic_id', 'content']
+    assert read_parquet(sink.topics.shards) == [{'topic_id': '1', 'content': 'story'}]
+    assert read_parquet(sink.comments.shards) == [{'topic_id': '1', **flatten_record(COMMENT)}]
+
+
+def test_shard_writer_is_abstract(tmp_path):
+    from altr.scraper.pantip.sink import ShardWriter
+
+    with pytest.raises(TypeError):
+        ShardWriter(tmp_path)
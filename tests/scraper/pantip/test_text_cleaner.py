@@ -0,0 +1,73 @@
+import random
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from bs4 import BeautifulSoup
+
+from altr.scraper.pantip.text_cleaner import clean_pantip_text, clean_pantip_texts, remove_html_tags, strip_html_tags
+
+FIXTURES = Path(__file__).parent / 'fixtures'
+
+TEXTS = [
+    'ความเห็น <b>ที่ 1</b><br />แก้ไขข้อความเมื่อ &quot;วันนี้&quot; {{em}}',
+    '[Spoil] คลิกเพื่อดูข้อความที่ซ่อนไว้<span>ซ่อน</span>{{eem}}',
+    '&lt;b&gt;escaped tag&lt;/b&gt; &amp;amp; AT&T &#65;&#x42; &#xZZ; &foo;',
+    '<script>var x = "<b>";</script><style>p {}</style><template><p>hidden</p></template>shown',
+    '<pre>  </pre> <p>\n\n</p><!-- comment --><![CDATA[ cdata ]]><?pi?><!DOCTYPE html>',
+    'แก้ไข[Spoil] คลิกเพื่อดูข้อความที่ซ่อนไว้ข้อความเมื่อ {{e{{em}}m}}',
+    '<br></br>text<img src="x"><p>unclosed <b>tags',
+    '',
+    '   ',
+]
+
+PIECES = [
+    '<p>', '</p>', '<br>', '<br/>', '</br>', '<template>', '</template>', '<rt>', '</rt>', '<pre>', '</pre>',
+    '<!-- c -->', '<![CDATA[ x ]]>', '&amp;', '&amp', '&lt;b&gt;', '&#65;', '&#x;', '&#12ab;', '&foo;', '&', '<',
+    ' ', '\n', 'ข้อความ', '[Spoil] คลิกเพื่อดูข้อความที่ซ่อนไว้', 'แก้ไขข้อความเมื่อ', 'แก้ไข', 'ข้อความเมื่อ',
+    '{{em}}', '{{eem}}', '{{e', 'm}}',
+]  # fmt: skip
+
+
+@pytest.mark.parametrize('text', TEXTS)
+def test_strip_html_tags_matches_beautifulsoup(text):
+    assert strip_html_tags(text) == remove_html_tags(text)
+
+
+def test_clean_pantip_texts_matches_clean_pantip_text():
+    assert clean_pantip_texts(TEXTS) == [clean_pantip_text(text) for text in TEXTS]
+
+
+def test_clean_pantip_texts_matches_clean_pantip_text_on_random_markup():
+    rng = random.Random(0)
+    texts = [''.join(rng.choice(PIECES) for _ in range(rng.randint(0, 10))) for _ in range(2000)]
+
+    assert clean_pantip_texts(texts) == [clean_pantip_text(text) for text in texts]
+
+
+@pytest.mark.parametrize('path', sorted(FIXTURES.glob('*.html')), ids=lambda path: path.name)
+def test_clean_pantip_texts_matches_clean_pantip_text_on_fixtures(path):
+    page = path.read_text(encoding='utf-8')
+    # the whole page, the HTML of every story and comment, and every line of the page
+    stories = [story.decode_contents() for story in BeautifulSoup(page, 'html.parser').select('.display-post-story')]
+    texts = [page, *stories, *page.splitlines()]
+
+    assert len(stories) > 100
+    assert clean_pantip_texts(texts) == [clean_pantip_text(text) for text in texts]
+
+
+def test_clean_pantip_texts_keeps_series_index_and_name():
+    series = pd.Series(TEXTS, index=[f'c{no}' for no in range(len(TEXTS))], name='message')
+
+    cleaned = clean_pantip_texts(series)
+
+    assert isinstance(cleaned, pd.Series)
+    assert cleaned.name == 'message'
+    assert cleaned.index.equals(series.index)
+    assert cleaned.tolist() == [clean_pantip_text(text) for text in TEXTS]
+
+
+def test_clean_pantip_texts_with_processes():
+    texts = TEXTS * 20
+
+    assert clean_pantip_texts(texts, processes=2, chunksize=16) == clean_pantip_texts(texts)
@@ -0,0 +1,70 @@
+from pathlib import Path
+
+import pytest
+
+from altr.monad.extended_pymonad import Right
+from altr.scraper.pantip import extract_topic_content, extract_topic_text, stream_topic_text
+from altr.scraper.pantip.scraper import PantipScraper
+from altr.scraper.pantip.utils import build_response, response_to_soup
+
+FIXTURES = Path(__file__).parent / 'fixtures'
+
+EDGE_CASES = [
+    # unclosed and unmatched tags, comments, scripts and entities inside the story
+    (
+        '<div class="display-post-wrapper main-post type"><div class="a display-post-story">x<script>var a="<b>";</script>'
+        '<!--c--><br>y&amp;z<p>p1<p>p2</span></div>after</div><div class="display-post-story">no</div>'
+    ),
+    # the story is not the first element of the content section
+    (
+        '<div class="display-post-wrapper main-post type"><h2>title</h2><section><div class="display-post-story">'
+        '<span>nested <b>text</b></span></div></section></div>'
+    ),
+    # no story in the content section
+    '<div class="display-post-wrapper main-post type"><h2>title</h2></div><div class="display-post-story">no</div>',
+    # no content section
+    '<div class="display-post-story">comment</div>',
+]
+
+
+def soup_topic_text(response, parser='html.parser'):
+    return (
+        Right(response) >> (lambda r: response_to_soup(r, parser=parser)) >> extract_topic_content >> extract_topic_text
+    )
+
+
+@pytest.mark.parametrize('html', EDGE_CASES)
+def test_stream_topic_text_matches_soup_path(html):
+    response = build_response('http://pantip/topic/1', 200, f'<html><body>{html}</body></html>'.encode())
+
+    expected = soup_topic_text(response)
+    result = stream_topic_text(response)
+
+    assert result.is_right() == expected.is_right()
+    assert (result.value, result.error) == (expected.value, expected.error)
+
+
+def test_stream_topic_text_matches_soup_path_on_fixture_page():
+    content = (FIXTURES / 'topic_page.html').read_bytes()
+    response = build_response('http://pantip/topic/1', 200, content, headers={'Content-Type': 'text/html'})
+
+    assert stream_topic_text(response, chunk_size=1000).value == soup_topic_text(response).value
+
+
+def test_scraper_parser_backends_agree(pantip_server):
+    pytest.importorskip('lxml')
+    details = set()
+    for parser in ['html.parser', 'lxml', 'stream']:
+        with PantipScraper(parser=parser) as scraper:
+            details.add(scraper.get_topic_detail('1'))
+
+    assert details == {'Story of topic 1'}
+
+
+def test_missing_parser_is_a_left():
+    response = build_response('http://pantip/topic/1', 200, b'<html></html>')
+
+    result = response_to_soup(response, parser='no-such-parser')
+
+    assert result.is_left()
+    assert "parser 'no-such-parser' is not installed" in result.error
@@ -0,0 +1,246 @@
+import json
+import multiprocessing
+import time
+
+import pytest
+
+from altr.monad.extended_pymonad import Right
+from altr.scraper.pantip import comment, search, topic
+from altr.scraper.pantip.scraper import PantipScraper
+from altr.scraper.pantip.sink import PantipSink
+from altr.scraper.pantip.work_queue import QueueWorker, WorkQueue
+
+
+def run_worker(queue_path, output, base_url, worker):
+    """Crawl the stand-in server from a separate process."""
+    search.SEARCH_API = f'{base_url}/api/search-service/search/getresult'
+    topic.TOPIC_BASE_URL = f'{base_url}/topic/'
+    comment.COMMENT_API = f'{base_url}/forum/topic/render_comments'
+
+    with (
+        WorkQueue(queue_path) as queue,
+        PantipScraper() as scraper,
+        PantipSink(output, prefix=worker) as sink,
+    ):
+        QueueWorker(queue, scraper, sink, worker=worker, max_workers=2, poll_seconds=0.05).run()
+
+
+def read_jsonl(directory):
+    return [json.loads(line) for path in sorted(directory.glob('*.jsonl')) for line in path.read_text().splitlines()]
+
+
+def test_claim_hands_each_task_to_one_worker(tmp_path):
+    with WorkQueue(tmp_path / 'queue.db') as queue:
+        assert queue.enqueue_topics(range(25)) == 25
+        assert queue.enqueue_topics(range(20, 30)) == 5
+
+        first = queue.claim('a', limit=10)
+        second = queue.claim('b', limit=30, kind='topics')
+
+        assert [task['payload'] for task in first + second] == [str(no) for no in range(30)]
+        assert queue.claim('c') == []
+        assert queue.counts() == {'pending': 0, 'leased': 30, 'done': 0, 'failed': 0}
+
+
+def test_search_pages_are_unique_whatever_their_max_pages(tmp_path):
+    with WorkQueue(tmp_path / 'queue.db') as queue:
+        assert queue.enqueue_search('keyword', max_pages=2) == 1
+        assert queue.enqueue_search('keyword', max_pages=5) == 0
+
+        assert queue.claim('a', kind='topics') == []
+        (task,) = queue.claim('a', kind='search')
+        assert task['payload'] == {'keyword': 'keyword', 'rooms': None, 'sort_by_time': True, 'page': 1}
+        assert task['options'] == {'max_pages': 2}
+
+
+def test_expired_lease_is_claimed_again(tmp_path):
+    with WorkQueue(tmp_path / 'queue.db', lease_seconds=0.05, max_attempts=2) as queue:
+        queue.enqueue_topics(['1'])
+        (task,) = queue.claim('a')
+        time.sleep(0.1)
+
+        (reclaimed,) = queue.claim('b')
+
+        assert reclaimed['id'] == task['id']
+        assert reclaimed['attempts'] == 2
+        assert not queue.complete(task, 'a')
+        time.sleep(0.1)
+        assert queue.claim('c') == []
+        assert queue.counts()['failed'] == 1
+
+
+def test_failed_task_is_retried_until_max_attempts(tmp_path):
+    with WorkQueue(tmp_path / 'queue.db', max_attempts=2) as queue:
+        queue.enqueue_topics(['1'])
+
+        assert queue.fail(queue.claim('a')[0], 'a', 'boom')
+        assert queue.counts()['pending'] == 1
+        assert queue.fail(queue.claim('a')[0], 'a', 'boom')
+        assert queue.counts()['failed'] == 1
+        assert queue.is_drained()
+
+
+class SlowScraper:
+    """Stand-in scraper whose topics take `delay` seconds to fetch."""
+
+    def __init__(self, delay):
+        self.delay = delay
+
+    def search(self, keyword, rooms=None, page=1, sort_by_time=True):
+        time.sleep(self.delay)
+        return {'data': [{'id': '1'}], 'topic_ids': ['1'], 'total_topics': 1, 'error': None}
+
+    def fetch_topic_detail(self, topic_id):
+        time.sleep(self.delay)
+        return Right(f'story {topic_id}')
+
+    def get_all_comments(self, topic_id, max_workers=None):
+        if topic_id == '2':
+            return {'data': [], 'max_comments': 0, 'error': 'comments unavailable'}
+        return {'data': [{'message': 'comment'}], 'max_comments': 1, 'error': None}
+
+
+def test_worker_fails_topics_one_by_one(tmp_path):
+    with WorkQueue(tmp_path / 'queue.db', max_attempts=1) as queue, PantipSink(tmp_path / 'out') as sink:
+        queue.enqueue_topics(['1', '2', '3'])
+        stats = QueueWorker(queue, SlowScraper(0), sink, worker='a', max_workers=1, clean=False).run()
+
+        assert stats == {'done': 2, 'failed': 1, 'lost': 0, 'topics': 2, 'comments': 2}
+        assert queue.counts() == {'pending': 0, 'leased': 0, 'done': 2, 'failed': 1}
+
+    assert sorted(record['topic_id'] for record in read_jsonl(tmp_path / 'out' / 'topics')) == ['1', '3']
+
+
+class RivalScraper(SlowScraper):
+    """Stand-in scraper that lets another worker try to claim the tasks after each slow request."""
+
+    def __init__(self, delay, queue_path):
+        super().__init__(delay)
+        self.queue_path = queue_path
+        self.claimed = []
+
+    def claim(self):
+        with WorkQueue(self.queue_path) as queue:
+            self.claimed += queue.claim('b', limit=10)
+
+    def search(self, *args, **kwargs):
+        result = super().search(*args, **kwargs)
+        self.claim()
+        return result
+
+    def fetch_topic_detail(self, topic_id):
+        result = super().fetch_topic_detail(topic_id)
+        self.claim()
+        return result
+
+
+def test_worker_renews_leases_of_a_batch(tmp_path):
+    queue_path = tmp_path / 'queue.db'
+    scraper = RivalScraper(0.12, queue_path)
+    with WorkQueue(queue_path, lease_seconds=0.3) as queue, PantipSink(tmp_path / 'out') as sink:
+        queue.enqueue_topics(['1', '3', '4', '5'])
+        # the batch takes longer than a lease, but every lease is renewed before it expires
+        stats = QueueWorker(queue, scraper, sink, worker='a', max_workers=1, clean=False).run(max_tasks=4)
+
+    assert scraper.claimed == []
+    assert stats['done'] == 4
+    assert stats['lost'] == 0
+
+
+@pytest.mark.parametrize('kind', ['search', 'topics'])
+def test_worker_renews_the_lease_of_a_slow_task(tmp_path, kind):
+    queue_path = tmp_path / 'queue.db'
+    scraper = RivalScraper(0.5, queue_path)
+    with WorkQueue(queue_path, lease_seconds=0.2) as queue, PantipSink(tmp_path / 'out') as sink:
+        if kind == 'search':
+            queue.enqueue_search('keyword')
+        else:
+            queue.enqueue_topics(['1'])
+        # a single request lasts longer than the lease
+        stats = QueueWorker(queue, scraper, sink, worker='a', clean=False).run(max_tasks=1)
+
+    assert scraper.claimed == []
+    assert stats['done'] == 1
+    assert stats['lost'] == 0
+
+
+class CrashingSink(PantipSink):
+    """Sink whose worker dies while writing a topic."""
+
+    def write_topic(self, topic_id, content):
+        super().write_topic(topic_id, content)
+        raise SystemExit('worker died')
+
+
+def test_tasks_are_completed_after_their_records_are_written(tmp_path):
+    with WorkQueue(tmp_path / 'queue.db', lease_seconds=0.05) as queue:
+        queue.enqueue_topics(['1'])
+        with CrashingSink(tmp_path / 'out', prefix='a') as sink, pytest.raises(SystemExit):
+            QueueWorker(queue, SlowScraper(0), sink, worker='a', clean=False).run()
+        assert queue.counts()['leased'] == 1
+
+        # the task is claimed again once its lease expires, and its topic written again
+        time.sleep(0.1)
+        with PantipSink(tmp_path / 'out', prefix='b') as sink:
+            stats = QueueWorker(queue, SlowScraper(0), sink, worker='b', clean=False).run()
+
+    assert stats['done'] == 1
+    assert [record['topic_id'] for record in read_jsonl(tmp_path / 'out' / 'topics')] == ['1', '1']
+
+
+def test_worker_skips_records_of_lost_tasks(tmp_path):
+    with WorkQueue(tmp_path / 'queue.db', lease_seconds=0.05) as queue, PantipSink(tmp_path / 'out') as sink:
+        queue.enqueue_topics(['1'])
+        (task,) = queue.claim('a')
+        time.sleep(0.1)
+        assert queue.claim('b') != []
+
+        stats = {'done': 0, 'failed': 0, 'lost': 0, 'topics': 0, 'comments': 0}
+        QueueWorker(queue, SlowScraper(0), sink, worker='a', clean=False).process([task], stats)
+
+        assert stats == {'done': 0, 'failed': 0, 'lost': 1, 'topics': 0, 'comments': 0}
+    assert read_jsonl(tmp_path / 'out' / 'topics') == []
+
+
+def test_worker_sends_at_most_max_workers_requests_at_once(pantip_server, tmp_path):
+    topic_ids = [str(40000000 + no) for no in range(6)]
+    pantip_server.max_comments.update(dict.fromkeys(topic_ids, 450))
+    pantip_server.delay = 0.02
+
+    with (
+        WorkQueue(tmp_path / 'queue.db') as queue,
+        PantipScraper() as scraper,
+        PantipSink(tmp_path / 'out') as sink,
+    ):
+        queue.enqueue_topics(topic_ids)
+        stats = QueueWorker(queue, scraper, sink, worker='a', max_workers=3, clean=False).run()
+
+    assert stats['done'] == 6 and stats['comments'] == 6 * 450
+    assert pantip_server.max_in_flight <= 3
+
+
+def test_local_processes_share_a_crawl(pantip_server, tmp_path):
+    pantip_server.search_total = 45
+    pantip_server.max_comments['40000001'] = 130
+    queue_path = str(tmp_path / 'queue.db')
+    with WorkQueue(queue_path) as queue:
+        queue.enqueue_search('keyword')
+
+    context = multiprocessing.get_context('spawn')
+    workers = [
+        context.Process(target=run_worker, args=(queue_path, str(tmp_path / 'out'), pantip_server.base_url, f'w{no}'))
+        for no in range(3)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=60)
+
+    assert [worker.exitcode for worker in workers] == [0, 0, 0]
+    with WorkQueue(queue_path) as queue:
+        assert queue.counts() == {'pending': 0, 'leased': 0, 'done': 5 + 45, 'failed': 0}
+
+    topics = read_jsonl(tmp_path / 'out' / 'topics')
+    assert sorted(record['topic_id'] for record in topics) == [str(40000000 + no) for no in range(45)]
+    assert len(read_jsonl(tmp_path / 'out' / 'search')) == 45
+    assert len(read_jsonl(tmp_path / 'out' / 'comments')) == 130